@@ -0,0 +1,187 @@
+import os
+import json
+import pickle
+import struct
+import numpy as np
+from nicefitbro.precision import PrecisionPolicy
+from nicefitbro.models.export.compiled import compile_model
+
+FORMAT_VERSION = 1
+MAGIC = b"NFBARTIF"
+# magic, then the offset and length of the JSON header written at the end
+_PREFIX = struct.Struct("<8sQQ")
+# array buffers start on cache line boundaries, so memory-mapped views are aligned
+ALIGNMENT = 64
+
+
+def _align(f):
+    padding = -f.tell() % ALIGNMENT
+    f.write(b"\0" * padding)
+
+
+def _write_segment(f, obj):
+    # pickle protocol 5 hands large contiguous buffers, such as numpy arrays,
+    # to buffer_callback instead of copying them into the pickle stream
+    buffers = []
+    payload = pickle.dumps(obj, protocol=5, buffer_callback=buffers.append)
+    _align(f)
+    segment = {"offset": f.tell(), "length": len(payload), "buffers": []}
+    f.write(payload)
+    for buffer in buffers:
+        raw = buffer.raw()
+        _align(f)
+        segment["buffers"].append([f.tell(), raw.nbytes])
+        f.write(raw)
+    return segment
+
+
+def save_artifact(
+    path,
+    steps,
+    feature_names,
+    target,
+    models,
+    selected_model=None,
+    precision="float64",
+    metadata=None,
+    compiled=True,
+    originals=False,
+):
+    """Writes fitted preprocessing steps, the feature list and trained models into one versioned file"""
+    header = {
+        "version": FORMAT_VERSION,
+        "target": target,
+        "feature_names": list(feature_names),
+        "selected_model": selected_model,
+        "precision": precision,
+        "metadata": metadata or {},
+        "segments": {},
+        "models": {},
+    }
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "wb") as f:
+        f.write(_PREFIX.pack(MAGIC, 0, 0))
+        header["segments"]["steps"] = _write_segment(f, list(steps))
+        for name, model in models.items():
+            form = "original"
+            if compiled:
+                try:
+                    # compiled models predict from plain arrays, which load memory-mapped
+                    stored = compile_model(model, feature_names)
+                    form = "compiled"
+                except ValueError:
+                    stored = model
+            else:
+                stored = model
+            header["models"][name] = form
+            header["segments"][f"model/{name}"] = _write_segment(f, stored)
+            if originals and form == "compiled":
+                header["segments"][f"original/{name}"] = _write_segment(f, model)
+        _align(f)
+        header_offset = f.tell()
+        encoded = json.dumps(header, default=str).encode()
+        f.write(encoded)
+        f.seek(0)
+        f.write(_PREFIX.pack(MAGIC, header_offset, len(encoded)))
+    os.replace(tmp_path, path)
+    return header
+
+
+class Artifact:
+    """
+    Class for scoring new data with a pipeline and models saved by save_artifact.
+
+    An artifact is one file holding a JSON header, the fitted preprocessing and feature engineering steps, and one
+    segment per trained model. Models with a compiled form (linear, poly and tree models, see compile_model) are
+    stored compiled, the others pickled as they are, and the original of a compiled model can be stored next to it.
+    Segments are pickled with protocol 5 and every large array buffer is written separately, aligned to 64 bytes.
+    Loading memory-maps the file and only parses the header; a segment is unpickled the first time it is needed,
+    with its arrays rebuilt as read-only views of the map, so nothing is copied or read from disk until a
+    prediction touches it and processes loading the same artifact share its pages.
+
+    Attributes:
+        path (str): Path of the artifact file.
+        header (dict): Format version, target, feature names, selected model, precision, metadata and the offsets
+            of every segment.
+        feature_names (list): Columns the models were trained on, in order.
+        selected_model (str): Name of the model predict uses by default.
+
+    Methods:
+        load(path):
+            Opens an artifact.
+            Returns: Artifact.
+        steps:
+            The fitted preprocessing and feature engineering steps, in order.
+        model(name=None, original=False):
+            Returns a stored model, the selected one by default.
+        prepare(data):
+            Runs the steps' transform on new data and keeps the feature columns.
+            Returns: pandas DataFrame of features.
+        predict(data, model_name=None):
+            Returns the predictions of a model for new data.
+    """
+
+    def __init__(self, path, header, buffer):
+        self.path = path
+        self.header = header
+        self.feature_names = header["feature_names"]
+        self.selected_model = header["selected_model"]
+        self.policy = PrecisionPolicy(header["precision"])
+        self._buffer = buffer
+        self._loaded = {}
+
+    @classmethod
+    def load(cls, path):
+        buffer = np.memmap(path, dtype=np.uint8, mode="r")
+        magic, header_offset, header_length = _PREFIX.unpack_from(buffer)
+        if magic != MAGIC:
+            raise ValueError(
+                f"Invalid artifact {path}. Choose a file written by save_artifact."
+            )
+        header = json.loads(
+            bytes(buffer[header_offset : header_offset + header_length])
+        )
+        if header["version"] != FORMAT_VERSION:
+            raise ValueError(f"Unsupported artifact version in {path}.")
+        return cls(path, header, buffer)
+
+    def _segment(self, key):
+        if key not in self._loaded:
+            segment = self.header["segments"][key]
+            start = segment["offset"]
+            buffers = [
+                self._buffer[offset : offset + length]
+                for offset, length in segment["buffers"]
+            ]
+            self._loaded[key] = pickle.loads(
+                self._buffer[start : start + segment["length"]], buffers=buffers
+            )
+        return self._loaded[key]
+
+    @property
+    def steps(self):
+        return self._segment("steps")
+
+    def model(self, name=None, original=False):
+        name = name or self.selected_model
+        if name not in self.header["models"]:
+            raise ValueError(
+                f"Invalid model: {name}. Choose one of {list(self.header['models'])}."
+            )
+        if original and self.header["models"][name] == "compiled":
+            return self._segment(f"original/{name}")
+        return self._segment(f"model/{name}")
+
+    def prepare(self, data):
+        data = self.policy.cast(data)
+        for step in self.steps:
+            data = step.transform(data)
+        return data[self.feature_names]
+
+    def predict(self, data, model_name=None):
+        return np.asarray(self.model(model_name).predict(self.prepare(data)))
+
+
+def load_artifact(path):
+    """Opens an artifact written by save_artifact"""
+    return Artifact.load(path)
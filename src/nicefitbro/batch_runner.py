@@ -0,0 +1,143 @@
+from collections import Counter
+from dataclasses import replace
+from concurrent.futures import ProcessPoolExecutor
+from nicefitbro.nicefitbro import NiceFitBro
+from nicefitbro.precision import PrecisionPolicy
+from nicefitbro.resources import ResourceBudget, limit_threads
+
+
+def _step_key(kind, step, target):
+    key = (kind, type(step).__name__, repr(sorted(vars(step).items())))
+    if kind == "engineer":
+        key += (target,)
+    return key
+
+
+def _apply_step(data, kind, step, run_config):
+    if kind == "ingest":
+        policy = PrecisionPolicy(run_config.precision)
+        return policy.cast(step.ingest_data(run_config.file_path))
+    elif kind == "preprocess":
+        return step.preprocess_data(data)
+    return step.engineer_features(data, run_config.target)
+
+
+def _run_tail(data, steps, run_config, fold_steps):
+    for kind, step in steps:
+        data = _apply_step(data, kind, step, run_config)
+    nice_fit_bro = NiceFitBro(run_config)
+    # in_fold steps are fitted inside the models, on each fold's training rows
+    nice_fit_bro.fold_steps = fold_steps
+    return nice_fit_bro.autofit(data)
+
+
+class BatchRunner:
+    """
+    Class for running many RunConfigs while sharing their common preparation steps.
+
+    Every RunConfig is compiled into its chain of steps (ingest, preprocessing, feature engineering, then fitting),
+    and the chains are merged into a prefix tree keyed on each step's class and settings. Steps on a prefix shared by
+    more than one config run once in the calling process. The remaining steps and the model fitting for each config
+    are then fanned out across a process pool. With in_fold, a config's chain ends at its last row filter, and the
+    steps after it are handed to the models to fit in each fold, as sendit() does, so they are never shared. Results come back in config order and match calling sendit() on each
+    config separately. Each worker gets an even share of n_cores, which its config's own budget splits further (see
+    ResourceBudget), so workers running side by side do not each size their thread pools to the whole machine.
+
+    Attributes:
+        run_configs (list): RunConfig objects to run.
+        n_jobs (int): Number of worker processes. 1 runs every config in the calling process.
+        n_cores (int): Cores shared by the workers. Defaults to the cores available.
+        resources (ResourceBudget): Workers and cores per worker.
+        step_counts (dict): Number of preparation steps planned and actually run.
+        fold_steps (list): Per config, the (kind, step) pairs fitted inside the models, empty without in_fold.
+
+    Methods:
+        run():
+            Runs every config.
+            Returns: list of (trained_models, performance) tuples, one per config.
+    """
+
+    def __init__(self, run_configs, n_jobs=None, n_cores=None):
+        self.run_configs = run_configs
+        self.n_jobs = n_jobs
+        self.n_cores = n_cores
+        self.resources = ResourceBudget(
+            n_cores, outer=min(n_jobs or len(run_configs), len(run_configs) or 1)
+        )
+        self.fold_steps = []
+        self.plans = [self._plan(run_config) for run_config in run_configs]
+        self.step_counts = {"planned": sum(len(plan) for plan in self.plans), "run": 0}
+
+    def _plan(self, run_config):
+        nice_fit_bro = NiceFitBro(run_config)
+        steps = [("ingest", nice_fit_bro.ingestor)] + nice_fit_bro.plan_steps()
+        self.fold_steps.append(nice_fit_bro.fold_steps)
+        keys = [("ingest", run_config.file_path, run_config.precision)] + [
+            _step_key(kind, step, run_config.target) for kind, step in steps[1:]
+        ]
+        return [
+            (tuple(keys[: i + 1]), kind, step) for i, (kind, step) in enumerate(steps)
+        ]
+
+    def _shared_depth(self, plan, path_counts):
+        depth = 0
+        for path, _, _ in plan:
+            if path_counts[path] < 2:
+                break
+            depth += 1
+        return depth
+
+    def _prepare_prefix(self, plan, depth, run_config, outputs):
+        data = None
+        for i, (path, kind, step) in enumerate(plan[:depth]):
+            if path not in outputs:
+                # shared outputs feed several branches, so never hand one out to be mutated
+                parent = data.copy() if data is not None else None
+                outputs[path] = _apply_step(parent, kind, step, run_config)
+                self.step_counts["run"] += 1
+            data = outputs[path]
+        return data
+
+    def run(self):
+        path_counts = Counter(path for plan in self.plans for path, _, _ in plan)
+        outputs = {}
+        tails = []
+        for run_config, plan in zip(self.run_configs, self.plans):
+            depth = self._shared_depth(plan, path_counts)
+            data = self._prepare_prefix(plan, depth, run_config, outputs)
+            tails.append((data, [(kind, step) for _, kind, step in plan[depth:]]))
+            self.step_counts["run"] += len(plan) - depth
+
+        if self.n_jobs == 1:
+            return [
+                _run_tail(
+                    data.copy() if data is not None else None,
+                    steps,
+                    run_config,
+                    fold_steps,
+                )
+                for (data, steps), run_config, fold_steps in zip(
+                    tails, self.run_configs, self.fold_steps
+                )
+            ]
+
+        share = self.resources.share()
+        with ProcessPoolExecutor(
+            max_workers=self.resources.outer,
+            initializer=limit_threads,
+            initargs=(share,),
+        ) as executor:
+            futures = [
+                executor.submit(
+                    _run_tail,
+                    data,
+                    steps,
+                    replace(run_config, n_cores=share),
+                    fold_steps,
+                )
+                for (data, steps), run_config, fold_steps in zip(
+                    tails, self.run_configs, self.fold_steps
+                )
+            ]
+            del outputs, tails
+            return [future.result() for future in futures]
@@ -0,0 +1,101 @@
+import os
+import sys
+import json
+import pickle
+import tempfile
+import subprocess
+from sklearn.ensemble import RandomForestRegressor
+import xgboost as xgb
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.artifact import save_artifact
+
+# each cold start is a fresh interpreter: imports, load, then a one row prediction
+_PICKLE_START = """
+import time
+start = time.perf_counter()
+import pickle
+import numpy as np
+import pandas as pd
+with open({path!r}, "rb") as f:
+    model = pickle.load(f)
+loaded = time.perf_counter()
+row = pd.DataFrame(np.zeros((1, {n_features})), columns={columns!r})
+model.predict(row)
+done = time.perf_counter()
+"""
+_ARTIFACT_START = """
+import time
+start = time.perf_counter()
+import numpy as np
+import pandas as pd
+from nicefitbro.artifact import load_artifact
+artifact = load_artifact({path!r})
+loaded = time.perf_counter()
+row = pd.DataFrame(np.zeros((1, {n_features})), columns={columns!r})
+artifact.predict(row)
+done = time.perf_counter()
+"""
+# private memory (RssAnon) is separate from mapped page cache (RssFile), which
+# processes serving the same artifact share (Linux only)
+_REPORT = """
+import json
+memory = {}
+with open("/proc/self/status") as f:
+    for line in f:
+        if line.startswith(("RssAnon:", "RssFile:")):
+            memory[line.split(":")[0]] = int(line.split()[1]) / 1024
+print(json.dumps({
+    "load_seconds": loaded - start,
+    "first_predict_seconds": done - loaded,
+    "cold_start_seconds": done - start,
+    "private_mb": memory.get("RssAnon"),
+    "mapped_mb": memory.get("RssFile"),
+}))
+"""
+
+
+def _cold_start(code):
+    output = subprocess.run(
+        [sys.executable, "-c", code + _REPORT],
+        check=True,
+        capture_output=True,
+        text=True,
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def run(n_rows=50_000, n_features=20, n_estimators=200):
+    """Compares the cold start of a pickled model with a memory-mapped artifact"""
+    data = make_regression_frame(n_rows, n_features, missing_frac=0.0)
+    columns = [col for col in data.columns if col != "target"]
+    X, y = data[columns], data["target"]
+    models = {
+        "rfr": RandomForestRegressor(n_estimators=n_estimators, n_jobs=-1),
+        "xgb": xgb.XGBRegressor(n_estimators=n_estimators, max_depth=8),
+    }
+    results = {"rows": n_rows, "features": n_features}
+    with tempfile.TemporaryDirectory() as tmp:
+        for name, model in models.items():
+            model.fit(X, y)
+            pickle_path = os.path.join(tmp, f"{name}.pkl")
+            with open(pickle_path, "wb") as f:
+                pickle.dump(model, f)
+            artifact_path = os.path.join(tmp, f"{name}.nfb")
+            save_artifact(artifact_path, [], columns, "target", {name: model}, name)
+            # the files were just written, so both runs read from the page cache
+            args = {"n_features": n_features, "columns": columns}
+            results[name] = {
+                "pickle": {
+                    "bytes": os.path.getsize(pickle_path),
+                    **_cold_start(_PICKLE_START.format(path=pickle_path, **args)),
+                },
+                "artifact": {
+                    "bytes": os.path.getsize(artifact_path),
+                    **_cold_start(_ARTIFACT_START.format(path=artifact_path, **args)),
+                },
+            }
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
@@ -0,0 +1,62 @@
+import time
+from nicefitbro.benchmarks.local_s3 import LocalS3Client
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.ingestors.async_s3_ingestor import AsyncS3Ingestor
+from nicefitbro.ingestors.s3_ingestor import S3Ingestor
+
+
+def _make_client(n_objects, rows_per_object, n_features, latency):
+    client = LocalS3Client(latency=latency, page_size=100)
+    for i in range(n_objects):
+        client.put_object(
+            Bucket="bench",
+            Key=f"runs/part-{i:04d}.csv",
+            Body=make_regression_frame(rows_per_object, n_features, seed=i).to_csv(
+                index=False
+            ),
+        )
+    return client
+
+
+def run(
+    n_objects=200,
+    rows_per_object=500,
+    n_features=10,
+    latency=0.05,
+    concurrency=(1, 4, 16, 64),
+):
+    """Measures objects per second of the async S3 ingestor at several concurrency levels"""
+    client = _make_client(n_objects, rows_per_object, n_features, latency)
+    results = {"objects": n_objects, "latency": latency, "runs": []}
+
+    start = time.perf_counter()
+    for i in range(n_objects):
+        S3Ingestor().ingest_data(client, "bench", f"runs/part-{i:04d}.csv")
+    seconds = time.perf_counter() - start
+    results["runs"].append(
+        {
+            "ingestor": "S3Ingestor",
+            "seconds": seconds,
+            "objects_per_second": n_objects / seconds,
+        }
+    )
+
+    for max_concurrency in concurrency:
+        ingestor = AsyncS3Ingestor(max_concurrency=max_concurrency)
+        start = time.perf_counter()
+        data = ingestor.ingest_data(client, "bench", "runs/")
+        seconds = time.perf_counter() - start
+        results["runs"].append(
+            {
+                "ingestor": "AsyncS3Ingestor",
+                "max_concurrency": max_concurrency,
+                "seconds": seconds,
+                "objects_per_second": n_objects / seconds,
+                "rows": len(data),
+            }
+        )
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
@@ -0,0 +1,109 @@
+import os
+import time
+import tempfile
+import multiprocessing
+import numpy as np
+import pandas as pd
+from sklearn.ensemble import RandomForestRegressor
+from nicefitbro.artifact import load_artifact, save_artifact
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.feature_engineering.feature_scaling import FeatureScaler
+from nicefitbro.ingestors.column_store_ingestor import ColumnStoreIngestor
+from nicefitbro.preprocess.missing_value_processor import MissingValuePreprocessor
+from nicefitbro.scoring import BatchScorer
+
+
+def _peak_mb():
+    # high water mark of resident memory, which starts afresh in a spawned process (Linux only)
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM"):
+                return int(line.split()[1]) / 1024
+
+
+def _whole_file(artifact_path, source, output):
+    # what scoring looks like without BatchScorer: one frame, one predict call
+    predictions = load_artifact(artifact_path).predict(pd.read_csv(source))
+    ColumnStoreIngestor().write(pd.DataFrame({"prediction": predictions}), output)
+    return {"rows": len(predictions)}
+
+
+def _score(mode, artifact_path, source, output, options, queue):
+    before = _peak_mb()
+    start = time.perf_counter()
+    if mode == "whole_file":
+        report = _whole_file(artifact_path, source, output)
+    else:
+        report = BatchScorer(artifact_path, **options).score(source, output)
+    seconds = time.perf_counter() - start
+    queue.put(
+        {
+            "seconds": seconds,
+            "rows_per_second": report["rows"] / seconds,
+            "peak_mb": _peak_mb() - before,
+        }
+    )
+
+
+def _artifact(path, n_features):
+    data = make_regression_frame(20_000, n_features)
+    X, y = data.drop(columns=["target"]), data["target"]
+    steps = [MissingValuePreprocessor(method="mean"), FeatureScaler(method="standard")]
+    X = steps[1].engineer_features(steps[0].preprocess_data(X))
+    model = RandomForestRegressor(n_estimators=30, max_depth=8, random_state=0)
+    save_artifact(
+        path,
+        steps,
+        list(X.columns),
+        "target",
+        {"rfr": model.fit(X, y)},
+        selected_model="rfr",
+    )
+
+
+def run(n_rows=1_000_000, n_features=20, chunk_rows=100_000, n_jobs=None):
+    """Compares loading a whole CSV and predicting at once with chunked scoring in and across processes"""
+    context = multiprocessing.get_context("spawn")
+    results = {"rows": n_rows, "features": n_features, "chunk_rows": chunk_rows}
+    with tempfile.TemporaryDirectory() as tmp:
+        artifact_path = os.path.join(tmp, "model.nfb")
+        source = os.path.join(tmp, "score.csv")
+        _artifact(artifact_path, n_features)
+        make_regression_frame(n_rows, n_features, seed=1).drop(
+            columns=["target"]
+        ).to_csv(source, index=False)
+        results["file_mb"] = os.path.getsize(source) / 2**20
+        runs = (
+            ("whole_file", {}),
+            ("chunked", {"chunk_rows": chunk_rows, "n_jobs": 1}),
+            ("chunked_pool", {"chunk_rows": chunk_rows, "n_jobs": n_jobs}),
+        )
+        outputs = {}
+        for name, options in runs:
+            # a fresh process per run, so each starts from the same memory
+            outputs[name] = os.path.join(tmp, name)
+            queue = context.Queue()
+            process = context.Process(
+                target=_score,
+                args=(name, artifact_path, source, outputs[name], options, queue),
+            )
+            process.start()
+            results[name] = queue.get()
+            process.join()
+        expected = ColumnStoreIngestor().ingest_data(outputs["whole_file"])
+        results["max_abs_diff"] = max(
+            float(
+                np.max(
+                    np.abs(
+                        ColumnStoreIngestor().ingest_data(outputs[name])["prediction"]
+                        - expected["prediction"]
+                    )
+                )
+            )
+            for name in ("chunked", "chunked_pool")
+        )
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
@@ -0,0 +1,42 @@
+import time
+import numpy as np
+from sklearn.metrics import mean_squared_error, r2_score
+from nicefitbro.models.evaluate.metrics import MetricsEngine
+
+
+def run(n_rows=100_000, n_models=13, n_resamples=1000, seed=0):
+    """Times bootstrap confidence intervals for many models on cached predictions"""
+    rng = np.random.default_rng(seed)
+    y = rng.normal(10, 3, n_rows)
+    predictions = {
+        f"model_{i}": y + rng.normal(0, 1 + 0.05 * i, n_rows) for i in range(n_models)
+    }
+    results = {"rows": n_rows, "models": n_models, "resamples": n_resamples}
+
+    start = time.perf_counter()
+    engine = MetricsEngine(y, predictions)
+    engine.metrics()
+    results["metrics_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    intervals = engine.bootstrap(n_resamples=n_resamples)
+    results["bootstrap_seconds"] = time.perf_counter() - start
+    results["model_0_R2_interval"] = intervals["model_0"]["R2"]
+    results["model_0_best_share"] = intervals["model_0"]["best_share"]
+
+    # the same R2 and RMSE with sklearn on row resamples, for a few resamples
+    n_loop = 10
+    start = time.perf_counter()
+    for _ in range(n_loop):
+        rows = rng.integers(n_rows, size=n_rows)
+        for prediction in predictions.values():
+            r2_score(y[rows], prediction[rows])
+            mean_squared_error(y[rows], prediction[rows])
+    results["sklearn_loop_seconds_estimate"] = (
+        (time.perf_counter() - start) / n_loop * n_resamples
+    )
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
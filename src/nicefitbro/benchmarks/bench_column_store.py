@@ -0,0 +1,67 @@
+import os
+import time
+import tempfile
+import multiprocessing
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.ingestors.local_ingestor import LocalFileIngestor
+from nicefitbro.ingestors.column_store_ingestor import ColumnStoreIngestor
+
+
+def _rss_mb():
+    # private (anonymous) and file backed resident memory, Linux only
+    rss = {}
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith(("RssAnon", "RssFile")):
+                name, kb, _ = line.split()
+                rss[name.rstrip(":")] = int(kb) / 1024
+    return rss
+
+
+def _load(ingestor_name, source, queue):
+    ingestor = {"csv": LocalFileIngestor, "column_store": ColumnStoreIngestor}[
+        ingestor_name
+    ]()
+    before = _rss_mb()
+    start = time.perf_counter()
+    data = ingestor.ingest_data(source)
+    load_seconds = time.perf_counter() - start
+    # read every value so both loaders have the whole dataset resident
+    data.sum()
+    after = _rss_mb()
+    queue.put(
+        {
+            "load_seconds": load_seconds,
+            "total_seconds": time.perf_counter() - start,
+            **{f"{name}_mb": after[name] - before[name] for name in after},
+        }
+    )
+
+
+def run(n_rows=500_000, n_features=20):
+    """Compares load time and resident memory of CSV ingestion and the memory mapped column store"""
+    data = make_regression_frame(n_rows, n_features)
+    results = {"rows": n_rows, "features": n_features}
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        csv_path = os.path.join(tmp, "data.csv")
+        store_path = os.path.join(tmp, "store")
+        data.to_csv(csv_path, index=False)
+        start = time.perf_counter()
+        ColumnStoreIngestor().write(
+            LocalFileIngestor().ingest_data(csv_path), store_path
+        )
+        results["convert_seconds"] = time.perf_counter() - start
+
+        for name, source in (("csv", csv_path), ("column_store", store_path)):
+            # a fresh process per loader, so neither sees the other's memory
+            queue = context.Queue()
+            process = context.Process(target=_load, args=(name, source, queue))
+            process.start()
+            results[name] = queue.get()
+            process.join()
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
@@ -0,0 +1,51 @@
+import time
+import numpy as np
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.models.factory.model_factory import ModelFactory
+from nicefitbro.models.export.compiled import compile_model, check_equivalence
+
+
+def _latency(predict, X, n_single=200, n_batches=10):
+    single = []
+    for row in range(n_single):
+        x = X.iloc[[row % len(X)]]
+        start = time.perf_counter_ns()
+        predict(x)
+        single.append(time.perf_counter_ns() - start)
+    batch = []
+    for _ in range(n_batches):
+        start = time.perf_counter_ns()
+        predict(X)
+        batch.append(time.perf_counter_ns() - start)
+    return {
+        "single_p50_ms": np.percentile(single, 50) / 1e6,
+        "single_p99_ms": np.percentile(single, 99) / 1e6,
+        "rows_per_second": len(X) / (np.percentile(batch, 50) / 1e9),
+    }
+
+
+def run(
+    n_rows=20_000,
+    n_features=10,
+    batch_size=10_000,
+    model_types=("lr", "ridge", "poly", "dtr", "rfr", "gbr", "xgb"),
+):
+    """Measures predict latency and throughput of each model type before and after compiling"""
+    data = make_regression_frame(n_rows, n_features, missing_frac=0.0)
+    X, y = data.drop(columns="target"), data["target"]
+    X_batch = X.iloc[:batch_size]
+    model_factory = ModelFactory(model_types=list(model_types))
+    results = {"rows": n_rows, "batch_size": batch_size, "models": {}}
+    for model_type, model in model_factory.models.items():
+        model.fit(X, y)
+        compiled = compile_model(model, list(X.columns))
+        results["models"][model_type] = {
+            "original": _latency(model.predict, X_batch),
+            "compiled": _latency(compiled.predict, X_batch),
+            **check_equivalence(model, compiled, X_batch),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
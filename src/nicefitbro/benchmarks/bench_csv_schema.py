@@ -0,0 +1,67 @@
+import os
+import time
+import tempfile
+import multiprocessing
+import numpy as np
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.ingestors.local_ingestor import LocalFileIngestor
+
+
+def _peak_mb():
+    # high water mark of resident memory, which starts afresh in a spawned process (Linux only)
+    with open("/proc/self/status") as f:
+        for line in f:
+            if line.startswith("VmHWM"):
+                return int(line.split()[1]) / 1024
+
+
+def _load(options, path, drop_cols, queue):
+    ingestor = LocalFileIngestor(**options)
+    before = _peak_mb()
+    start = time.perf_counter()
+    data = ingestor.ingest_data(path, drop_cols=drop_cols)
+    queue.put(
+        {
+            "parse_seconds": time.perf_counter() - start,
+            "peak_mb": _peak_mb() - before,
+            "frame_mb": data.memory_usage(deep=True).sum() / 2**20,
+            "columns": data.shape[1],
+        }
+    )
+
+
+def run(n_rows=50_000, n_features=300, n_categorical=20, n_unused=100):
+    """Compares parse time and memory of inferred CSV ingestion with reads through the schema sidecar"""
+    rng = np.random.default_rng(0)
+    data = make_regression_frame(n_rows, n_features, missing_frac=0.0)
+    for i in range(n_categorical):
+        data[f"cat{i}"] = rng.choice(["red", "green", "blue", "amber"], n_rows)
+    # columns the run never uses, such as ids and free text
+    unused = [f"unused{i}" for i in range(n_unused)]
+    for col in unused:
+        data[col] = rng.integers(0, 10**9, n_rows).astype(str)
+    results = {"rows": n_rows, "columns": data.shape[1], "skipped": n_unused}
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "wide.csv")
+        data.to_csv(path, index=False)
+        results["file_mb"] = os.path.getsize(path) / 2**20
+        # the first schema read infers and saves the sidecar; the later ones use it
+        runs = (
+            ("inferred", {"schema": False}),
+            ("schema_first_read", {"schema": True}),
+            ("schema", {"schema": True}),
+            ("schema_float32", {"schema": True, "float_dtype": "float32"}),
+        )
+        for name, options in runs:
+            # a fresh process per read, so each starts from the same memory
+            queue = context.Queue()
+            process = context.Process(target=_load, args=(options, path, unused, queue))
+            process.start()
+            results[name] = queue.get()
+            process.join()
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
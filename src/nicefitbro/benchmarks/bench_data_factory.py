@@ -0,0 +1,48 @@
+import time
+import tracemalloc
+from sklearn.model_selection import train_test_split
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.models.factory.data_factory import DataFactory
+
+
+def _copying_split(data, target):
+    # the split DataFactory used to make: drop the target, then copy into four frames
+    X = data.drop(columns=[target], axis=1)
+    y = data[target]
+    return X, y, train_test_split(X, y, test_size=0.33, random_state=42)
+
+
+def _measure(func):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func()
+    seconds = time.perf_counter() - start
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, current, peak
+
+
+def run(n_rows=500_000, n_features=20):
+    """Compares the memory held by the old copying split with the view-based DataFactory"""
+    data = make_regression_frame(n_rows, n_features, missing_frac=0)
+    results = {
+        "rows": n_rows,
+        "features": n_features,
+        "feature_mb": data.drop(columns=["target"]).memory_usage().sum() / 2**20,
+    }
+    for name, func in (
+        ("copying_split", lambda: _copying_split(data, "target")),
+        ("data_factory", lambda: DataFactory(data, "target")),
+    ):
+        result, seconds, current, peak = _measure(func)
+        results[name] = {
+            "seconds": seconds,
+            "held_mb": current / 2**20,
+            "peak_mb": peak / 2**20,
+        }
+        del result
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
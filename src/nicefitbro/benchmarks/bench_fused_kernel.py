@@ -0,0 +1,47 @@
+import time
+import tracemalloc
+import numpy as np
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.preprocess.missing_value_processor import MissingValuePreprocessor
+from nicefitbro.preprocess.outlier_detector import OutlierDetector
+from nicefitbro.feature_engineering.feature_scaling import FeatureScaler
+from nicefitbro.pipeliners.fused_kernel import fuse_steps, run_steps
+
+
+def _measure(func, data):
+    data = data.copy()
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = func(data)
+    seconds = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, seconds, peak
+
+
+def run(n_rows=500_000, n_features=20, outlier_method="iqr", scaler_method="standard"):
+    """Compares the unfused impute -> outliers -> scale chain with the fused kernel"""
+    data = make_regression_frame(n_rows, n_features)
+    steps = [
+        ("preprocess", MissingValuePreprocessor(method="mean")),
+        ("preprocess", OutlierDetector(method=outlier_method)),
+        ("engineer", FeatureScaler(method=scaler_method)),
+    ]
+    unfused, unfused_seconds, unfused_peak = _measure(
+        lambda d: run_steps(d, steps, "target"), data
+    )
+    fused, fused_seconds, fused_peak = _measure(
+        lambda d: run_steps(d, fuse_steps(steps), "target"), data
+    )
+    results = {
+        "rows": n_rows,
+        "features": n_features,
+        "seconds": {"unfused": unfused_seconds, "fused": fused_seconds},
+        "peak_mb": {"unfused": unfused_peak / 2**20, "fused": fused_peak / 2**20},
+        "max_abs_diff": float(np.max(np.abs(unfused.values - fused.values))),
+    }
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
@@ -0,0 +1,56 @@
+import time
+from sklearn.base import clone
+from sklearn.metrics import r2_score
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.models.factory.model_factory import ModelFactory
+from nicefitbro.models.factory.guardrails import scalable_substitutes
+
+
+def _fit_and_score(model, X_train, y_train, X_val, y_val):
+    start = time.perf_counter()
+    model.fit(X_train, y_train)
+    fit_seconds = time.perf_counter() - start
+    start = time.perf_counter()
+    r2 = r2_score(y_val, model.predict(X_val))
+    return {
+        "fit_seconds": fit_seconds,
+        "predict_seconds": time.perf_counter() - start,
+        "R2": r2,
+    }
+
+
+def run(n_rows=6_000, n_features=20, model_types=("gpr", "knn", "poly")):
+    """Compares fit time and accuracy of the exact models with their scalable substitutes"""
+    data = make_regression_frame(n_rows, n_features, missing_frac=0.0)
+    X, y = data.drop(columns="target"), data["target"]
+    n_train = int(0.8 * n_rows)
+    X_train, X_val, y_train, y_val = X[:n_train], X[n_train:], y[:n_train], y[n_train:]
+
+    model_factory = ModelFactory(model_types=list(model_types))
+    # low thresholds force every substitute
+    substitutes = scalable_substitutes(
+        model_types,
+        n_train,
+        n_features,
+        thresholds={
+            "gpr_max_rows": 0,
+            "knn_max_rows": n_rows // 10,
+            "poly_max_terms": 100,
+        },
+    )
+    results = {"rows": n_rows, "features": n_features, "models": {}}
+    for model_type in model_types:
+        results["models"][model_type] = {
+            "exact": _fit_and_score(
+                clone(model_factory.models[model_type]), X_train, y_train, X_val, y_val
+            ),
+            "approximation": _fit_and_score(
+                substitutes[model_type]["model"], X_train, y_train, X_val, y_val
+            ),
+            **substitutes[model_type]["report"],
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
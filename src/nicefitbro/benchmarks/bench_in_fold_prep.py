@@ -0,0 +1,82 @@
+import time
+import tempfile
+import numpy as np
+from joblib import Memory
+from sklearn.model_selection import GridSearchCV, KFold
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.models.factory.data_factory import DataFactory
+from nicefitbro.models.factory.model_factory import ModelFactory
+from nicefitbro.preprocess.missing_value_processor import MissingValuePreprocessor
+from nicefitbro.feature_engineering.feature_scaling import FeatureScaler
+from nicefitbro.feature_engineering.feature_selection import FeatureSelection
+from nicefitbro.pipeliners.in_fold import compose
+
+
+def _search(model_factory, X, y, X_val, y_val):
+    cv = KFold(5)
+    scores = {}
+    for model_type, model in model_factory.models.items():
+        search = GridSearchCV(model, model_factory.hyperparameters[model_type], cv=cv)
+        search.fit(X, y)
+        scores[model_type] = {
+            "cv_score": float(search.best_score_),
+            "holdout_score": float(search.score(X_val, y_val)),
+        }
+    return scores
+
+
+def run(n_rows=300, n_features=5, n_noise=1_000, k=20, model_types=("ridge", "knn")):
+    """Compares prep fitted on all training rows with prep fitted in each fold, with and without cached fits"""
+    data = make_regression_frame(n_rows, n_features + n_noise, missing_frac=0.01)
+    # only the first n_features carry signal, so selecting on every row picks noise that
+    # happens to correlate with the target, including in the rows later scored
+    rng = np.random.default_rng(1)
+    data["target"] = (
+        data[[f"x{i}" for i in range(n_features)]].fillna(0).sum(axis=1)
+        + rng.standard_normal(n_rows) * 3
+    )
+    data_factory = DataFactory(data, "target")
+    X, y = data_factory.X_train, data_factory.y_train
+    X_val, y_val = data_factory.X_val, data_factory.y_val
+    steps = [
+        ("preprocess", MissingValuePreprocessor(method="mean")),
+        ("engineer", FeatureSelection(k=k)),
+        ("engineer", FeatureScaler(method="standard")),
+    ]
+    results = {"rows": n_rows, "features": n_features + n_noise, "k": k}
+
+    # what DataPrepper does: steps fitted once on every training row, then searched on
+    prep = compose("passthrough", steps, "target").fit(X, y)
+    start = time.perf_counter()
+    results["full_data"] = _search(
+        ModelFactory(list(model_types)),
+        prep.transform(X),
+        y,
+        prep.transform(X_val),
+        y_val,
+    )
+    results["full_data"]["seconds"] = time.perf_counter() - start
+
+    for name, cached in (("in_fold", False), ("in_fold_cached", True)):
+        with tempfile.TemporaryDirectory() as tmp:
+            model_factory = ModelFactory(list(model_types))
+            model_factory.compose_steps(
+                steps, "target", memory=Memory(tmp, verbose=0) if cached else None
+            )
+            start = time.perf_counter()
+            results[name] = _search(model_factory, X, y, X_val, y_val)
+            results[name]["seconds"] = time.perf_counter() - start
+    # a leak shows as a cross validation score above the holdout score
+    results["optimism"] = {
+        name: {
+            model_type: results[name][model_type]["cv_score"]
+            - results[name][model_type]["holdout_score"]
+            for model_type in model_types
+        }
+        for name in ("full_data", "in_fold")
+    }
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
@@ -0,0 +1,69 @@
+import os
+import time
+import tempfile
+from sklearn.metrics import r2_score
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.config.run_config import RunConfig
+from nicefitbro.incremental import IncrementalRefresher
+
+
+def _score(refresher, holdout, target):
+    artifact = refresher.load()
+    features = holdout.drop(columns=[target])
+    # the target goes through the fitted steps too, as it did in training
+    y = artifact.policy.cast(holdout)
+    for step in artifact.steps:
+        y = step.transform(y)
+    return {
+        name: r2_score(y[target], artifact.predict(features, name))
+        for name in artifact.header["models"]
+    }
+
+
+def run(n_rows=10_000, n_features=10, n_appends=3, append_frac=0.05):
+    """Compares refreshing a run on appended rows with rerunning it on the whole file"""
+    chunk = int(n_rows * append_frac)
+    data = make_regression_frame(
+        n_rows + n_appends * chunk + 2_000, n_features, missing_frac=0.01
+    )
+    holdout = data.iloc[-2_000:]
+    results = {"rows": n_rows, "append_rows": chunk, "refreshes": []}
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "data.csv")
+        data.iloc[:n_rows].to_csv(path, index=False)
+
+        def run_config(name):
+            return RunConfig(
+                target="target",
+                file_path=path,
+                missing_value_method="mean",
+                feature_scaler_method="standard",
+                model_types=["sgd", "xgb", "rfr"],
+                refresh_dir=os.path.join(tmp, name),
+            )
+
+        incremental = IncrementalRefresher(run_config("incremental"))
+        results["initial"] = incremental.refresh()
+        for i in range(n_appends):
+            start = n_rows + i * chunk
+            with open(path, "a") as f:
+                f.write(
+                    data.iloc[start : start + chunk].to_csv(index=False, header=False)
+                )
+            results["refreshes"].append(incremental.refresh())
+
+        # the same grown file, run from row zero
+        full = IncrementalRefresher(run_config("full"))
+        started = time.perf_counter()
+        full.refresh()
+        results["full_rerun_seconds"] = time.perf_counter() - started
+        results["refresh_seconds"] = [r["seconds"] for r in results["refreshes"]]
+        results["holdout_r2"] = {
+            "incremental": _score(incremental, holdout, "target"),
+            "full_rerun": _score(full, holdout, "target"),
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
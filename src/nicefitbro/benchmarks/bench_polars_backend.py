@@ -0,0 +1,106 @@
+import copy
+import time
+import numpy as np
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.preprocess.missing_value_processor import MissingValuePreprocessor
+from nicefitbro.preprocess.outlier_detector import OutlierDetector
+from nicefitbro.feature_engineering.feature_scaling import FeatureScaler
+from nicefitbro.feature_engineering.feature_selection import FeatureSelection
+from nicefitbro.feature_engineering.feature_transformations import FeatureTransformer
+from nicefitbro.pipeliners.fused_kernel import fuse_steps, run_steps
+from nicefitbro.pipeliners.polars_kernel import PolarsKernel
+
+# the fitted parameters each step keeps, compared between the backends
+FITTED = ("fill_values", "offsets", "scales", "lambdas", "selected_features")
+
+
+def _time(func, data):
+    data = data.copy()
+    start = time.perf_counter()
+    result = func(data)
+    return result.reset_index(drop=True), time.perf_counter() - start
+
+
+def _params_match(pandas_steps, polars_steps):
+    for (_, pandas_step), (_, polars_step) in zip(pandas_steps, polars_steps):
+        for name in FITTED:
+            expected = getattr(pandas_step, name, None)
+            actual = getattr(polars_step, name, None)
+            if isinstance(expected, dict):
+                expected, actual = list(expected.values()), list(actual.values())
+            if expected is None or name == "selected_features":
+                same = expected == actual
+            else:
+                same = np.allclose(expected, actual, equal_nan=True)
+            if not same:
+                return False
+    return True
+
+
+def _compare(data, steps, target="target"):
+    pandas_steps, polars_steps = copy.deepcopy(steps), copy.deepcopy(steps)
+    kernel = PolarsKernel(polars_steps)
+    expected, pandas_seconds = _time(lambda d: run_steps(d, pandas_steps, target), data)
+    result, polars_seconds = _time(lambda d: kernel.run(d, target), data)
+    same_shape = expected.shape == result.shape
+    return {
+        "pandas_seconds": pandas_seconds,
+        "polars_seconds": polars_seconds,
+        "speedup": pandas_seconds / polars_seconds,
+        "same_shape": same_shape,
+        "max_abs_diff": (
+            float(np.nanmax(np.abs(expected.values - result.values)))
+            if same_shape and expected.size
+            else None
+        ),
+        "params_match": _params_match(pandas_steps, polars_steps),
+        "collects": kernel.collects,
+    }
+
+
+def run(n_rows=500_000, n_features=20, missing_frac=0.01):
+    """Compares every step with a Polars form, and the impute -> outliers -> scale chain, on pandas and Polars"""
+    data = make_regression_frame(n_rows, n_features, missing_frac=missing_frac)
+    # outlier filters, transforms and selection get complete data, as they do after imputation
+    complete = data.fillna(data.mean())
+    positive = complete.abs() + 1
+    features = [col for col in data.columns if col != "target"][:5]
+    cases = {
+        "missing_mean": (data, [("preprocess", MissingValuePreprocessor("mean"))]),
+        "missing_median": (
+            data,
+            [("preprocess", MissingValuePreprocessor("median"))],
+        ),
+        "missing_fill": (data, [("preprocess", MissingValuePreprocessor("fill"))]),
+        "missing_drop": (data, [("preprocess", MissingValuePreprocessor("drop"))]),
+        "outlier_zscore": (complete, [("preprocess", OutlierDetector("zscore"))]),
+        "outlier_iqr": (complete, [("preprocess", OutlierDetector("iqr"))]),
+        "scaler_standard": (data, [("engineer", FeatureScaler("standard"))]),
+        "scaler_minmax": (data, [("engineer", FeatureScaler("minmax"))]),
+        "transform_log": (
+            positive,
+            [("engineer", FeatureTransformer(features, method="log"))],
+        ),
+        "transform_box_cox": (
+            positive,
+            [("engineer", FeatureTransformer(features, method="box_cox"))],
+        ),
+        "select_k_best": (complete, [("engineer", FeatureSelection(k=10))]),
+    }
+    results = {"rows": n_rows, "features": n_features}
+    for name, (frame, steps) in cases.items():
+        results[name] = _compare(frame, steps)
+    chain = [
+        ("preprocess", MissingValuePreprocessor(method="mean")),
+        ("preprocess", OutlierDetector(method="zscore")),
+        ("engineer", FeatureScaler(method="standard")),
+    ]
+    results["chain"] = _compare(data, chain)
+    _, results["chain"]["fused_seconds"] = _time(
+        lambda d: run_steps(d, fuse_steps(copy.deepcopy(chain)), "target"), data
+    )
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
@@ -0,0 +1,38 @@
+import time
+from sklearn.metrics import r2_score
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.models.factory.data_factory import DataFactory
+from nicefitbro.models.factory.model_factory import ModelFactory
+
+
+def run(n_rows=50_000, n_features=20, model_types=("lr", "ridge", "dtr", "xgb")):
+    """Compares feature memory, fit time and validation R2 in float64 and float32"""
+    data = make_regression_frame(n_rows, n_features, missing_frac=0).fillna(0)
+    results = {"rows": n_rows, "features": n_features}
+    scores = {}
+    for precision in ("float64", "float32"):
+        data_factory = DataFactory(data, "target", precision=precision)
+        models = ModelFactory(list(model_types)).models
+        fit_seconds = {}
+        scores[precision] = {}
+        for model_type, model in models.items():
+            start = time.perf_counter()
+            model.fit(data_factory.X_train, data_factory.y_train)
+            fit_seconds[model_type] = time.perf_counter() - start
+            scores[precision][model_type] = r2_score(
+                data_factory.y_val, model.predict(data_factory.X_val)
+            )
+        results[precision] = {
+            "X_mb": data_factory.block.nbytes / 2**20,
+            "fit_seconds": fit_seconds,
+            "R2": scores[precision],
+        }
+    results["R2_diff"] = {
+        model_type: scores["float32"][model_type] - scores["float64"][model_type]
+        for model_type in model_types
+    }
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
@@ -0,0 +1,37 @@
+import time
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.models.auto_model import AutoModel
+
+
+def run(
+    n_rows=20_000,
+    n_features=10,
+    model_types=("lr", "ridge", "lasso", "knn", "dtr", "gbr"),
+    top_k=2,
+):
+    """Compares quick-rank mode with tuning every model on the full training data"""
+    data = make_regression_frame(n_rows, n_features, missing_frac=0.0)
+    results = {"rows": n_rows, "models": list(model_types)}
+
+    start = time.perf_counter()
+    _, full = AutoModel(data, list(model_types), "target").auto_model()
+    results["exhaustive_seconds"] = time.perf_counter() - start
+
+    start = time.perf_counter()
+    auto_model = AutoModel(
+        data, list(model_types), "target", quick_rank=True, quick_rank_top_k=top_k
+    )
+    _, quick = auto_model.auto_model()
+    results["quick_rank_seconds"] = time.perf_counter() - start
+
+    report = auto_model.quick_rank_report
+    results["estimated_exhaustive_seconds"] = report["estimated_exhaustive_seconds"]
+    results["stability"] = report["stability"]
+    results["finalists"] = report["finalists"]
+    results["exhaustive_best"] = max(full, key=lambda name: full[name]["R2"])
+    results["quick_rank_best"] = max(quick, key=lambda name: quick[name]["R2"])
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
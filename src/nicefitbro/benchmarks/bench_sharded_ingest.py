@@ -0,0 +1,63 @@
+import os
+import time
+import tempfile
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.ingestors.local_ingestor import LocalFileIngestor
+
+
+def _write_shards(directory, n_shards, rows_per_shard, n_features):
+    for i in range(n_shards):
+        shard_dir = os.path.join(directory, f"date=2023-01-{i + 1:02d}")
+        os.makedirs(shard_dir)
+        make_regression_frame(rows_per_shard, n_features, seed=i).to_csv(
+            os.path.join(shard_dir, "part-0.csv"), index=False
+        )
+
+
+def run(shard_counts=(4, 16), rows_per_shard=25_000, n_features=20, jobs=(1, 2, 4)):
+    """Measures sharded CSV ingestion throughput across shard counts and process counts"""
+    results = {"cores": os.cpu_count(), "rows_per_shard": rows_per_shard, "runs": []}
+    ingestor = LocalFileIngestor()
+    for n_shards in shard_counts:
+        with tempfile.TemporaryDirectory() as tmp:
+            _write_shards(tmp, n_shards, rows_per_shard, n_features)
+            size_mb = (
+                sum(
+                    os.path.getsize(os.path.join(root, name))
+                    for root, _, names in os.walk(tmp)
+                    for name in names
+                )
+                / 2**20
+            )
+            for n_jobs in jobs:
+                start = time.perf_counter()
+                data = ingestor.ingest_data(tmp, n_jobs=n_jobs)
+                seconds = time.perf_counter() - start
+                results["runs"].append(
+                    {
+                        "shards": n_shards,
+                        "n_jobs": n_jobs,
+                        "seconds": seconds,
+                        "rows_per_second": len(data) / seconds,
+                        "mb_per_second": size_mb / seconds,
+                    }
+                )
+            # pruning to the first week only parses those shards
+            start = time.perf_counter()
+            ingestor.ingest_data(
+                tmp,
+                filters={"date": lambda d: d <= "2023-01-07"},
+                n_jobs=max(jobs),
+            )
+            results["runs"].append(
+                {
+                    "shards": n_shards,
+                    "pruned_to": min(n_shards, 7),
+                    "seconds": time.perf_counter() - start,
+                }
+            )
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
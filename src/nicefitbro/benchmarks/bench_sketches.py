@@ -0,0 +1,47 @@
+import time
+import numpy as np
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.preprocess.outlier_detector import OutlierDetector
+from nicefitbro.preprocess.sketches import normalized_rank_error
+
+
+def run(n_rows=1_000_000, n_features=10, n_chunks=20, k=200):
+    """Compares sketched IQR bounds fitted over chunks with exact in-memory quartiles"""
+    data = make_regression_frame(n_rows, n_features, missing_frac=0.0)
+    results = {"rows": n_rows, "chunks": n_chunks, "k": k}
+
+    start = time.perf_counter()
+    exact = data.quantile([0.25, 0.75])
+    results["exact_seconds"] = time.perf_counter() - start
+
+    detector = OutlierDetector(method="iqr")
+    start = time.perf_counter()
+    for chunk in np.array_split(np.arange(n_rows), n_chunks):
+        detector.partial_fit(data.iloc[chunk], k=k)
+    results["sketch_seconds"] = time.perf_counter() - start
+
+    # rank error of the sketched quartiles against the sorted columns
+    errors = []
+    for column in data.columns:
+        values = np.sort(data[column].to_numpy())
+        for q in (0.25, 0.75):
+            estimate = detector.sketch.quantiles[column].quantile(q)
+            errors.append(abs(np.searchsorted(values, estimate) / n_rows - q))
+    results["max_rank_error"] = max(errors)
+    results["documented_rank_error"] = normalized_rank_error(k, pair=True)
+    results["max_quartile_difference"] = float(
+        np.max(np.abs(detector.sketch.quantile(0.25) - exact.loc[0.25]))
+    )
+    results["sketch_items"] = sum(
+        sum(len(items) for items in sketch.levels)
+        for sketch in detector.sketch.quantiles.values()
+    )
+    results["rows_kept_exact"] = len(
+        OutlierDetector(method="iqr").preprocess_data(data)
+    )
+    results["rows_kept_sketch"] = len(detector.preprocess_data(data))
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
@@ -0,0 +1,62 @@
+import time
+from joblib import Parallel, cpu_count, delayed, parallel_config
+from threadpoolctl import threadpool_limits
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import cross_val_score
+import xgboost as xgb
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.resources import ResourceBudget, limit_threads
+
+
+def _models(threads):
+    return {
+        "xgb": xgb.XGBRegressor(n_estimators=100, max_depth=6, n_jobs=threads),
+        "rfr": RandomForestRegressor(n_estimators=30, max_depth=10, n_jobs=threads),
+        "ridge": Ridge(solver="cholesky"),
+    }
+
+
+def _trial(name, X, y, cv_jobs, threads, capped):
+    model = _models(threads)[name]
+    if not capped:
+        return cross_val_score(model, X, y, cv=5, n_jobs=cv_jobs).mean()
+    # what ResourceBudget does in a tuning worker: cap this process and the fold workers it starts
+    limit_threads(threads)
+    with parallel_config(backend="loky", inner_max_num_threads=threads):
+        return cross_val_score(model, X, y, cv=5, n_jobs=cv_jobs).mean()
+
+
+def _run(X, y, outer, cv_jobs, threads, capped=True):
+    # the three models are tuned side by side, as TPESearch runs trials in parallel
+    start = time.perf_counter()
+    Parallel(n_jobs=outer)(
+        delayed(_trial)(name, X, y, cv_jobs, threads, capped) for name in _models(1)
+    )
+    return time.perf_counter() - start
+
+
+def run(n_rows=10_000, n_features=50, n_cores=None):
+    """Times parallel tuning with every level sized to the machine against a ResourceBudget"""
+    data = make_regression_frame(n_rows, n_features, missing_frac=0.0)
+    X, y = data.drop(columns=["target"]), data["target"]
+    cores = n_cores or cpu_count()
+    budget = ResourceBudget(cores, outer=3, cv=5)
+    results = {"rows": n_rows, "features": n_features, "budget": budget.report}
+    with threadpool_limits(limits=1):
+        results["serial_seconds"] = _run(X, y, outer=1, cv_jobs=1, threads=1)
+    # three trials, each sizing its fold workers and native pools to every core,
+    # which is what each library does when left alone
+    results["unmanaged_seconds"] = _run(
+        X, y, outer=3, cv_jobs=cores, threads=cores, capped=False
+    )
+    with budget.limits():
+        results["budgeted_seconds"] = _run(
+            X, y, outer=budget.outer, cv_jobs=budget.cv_jobs, threads=budget.threads
+        )
+    results["oversubscribed_threads"] = 3 * cores * cores
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
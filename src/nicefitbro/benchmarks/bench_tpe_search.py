@@ -0,0 +1,82 @@
+import time
+import numpy as np
+import pandas as pd
+from sklearn.datasets import make_friedman1
+from sklearn.model_selection import GridSearchCV, KFold
+from nicefitbro.models.factory.data_factory import DataFactory
+from nicefitbro.models.factory.model_factory import ModelFactory
+from nicefitbro.models.tune.tpe import TPESearch
+
+
+def _friedman_frame(n_rows, n_features, seed=0):
+    # non linear target, so the tree hyperparameters matter
+    X, y = make_friedman1(n_rows, n_features, noise=1.0, random_state=seed)
+    data = pd.DataFrame(X, columns=[f"x{i}" for i in range(n_features)])
+    data["target"] = y
+    return data
+
+
+def _best_so_far(scores, fits):
+    # best cross validation score reached after each fit spent
+    curve, best, spent = [], -np.inf, 0
+    for score, n in zip(scores, fits):
+        spent += n
+        best = max(best, score)
+        curve.append((spent, float(best)))
+    return curve
+
+
+def run(n_rows=3_000, n_features=10, model_types=("gbr", "xgb"), n_trials=20):
+    """Compares the CV score reached per fit spent by grid search and pruned TPE search"""
+    data_factory = DataFactory(_friedman_frame(n_rows, n_features), "target")
+    model_factory = ModelFactory(list(model_types))
+    X, y = data_factory.X_train, data_factory.y_train
+    cv = KFold(5)
+    results = {"rows": n_rows}
+
+    for model_type in model_types:
+        model = model_factory.models[model_type]
+        grid = model_factory.hyperparameters[model_type]
+        start = time.perf_counter()
+        grid_search = GridSearchCV(model, grid, cv=cv).fit(X, y)
+        grid_seconds = time.perf_counter() - start
+        n_candidates = len(grid_search.cv_results_["params"])
+        grid_scores = grid_search.cv_results_["mean_test_score"]
+
+        single = ModelFactory([model_type])
+        start = time.perf_counter()
+        search = TPESearch(data_factory, single, n_trials=n_trials)
+        search.tune_hyperparameters()
+        tpe_seconds = time.perf_counter() - start
+        report = search.search_report[model_type]
+        trials = search.trials[model_type]
+        tpe_curve = _best_so_far(
+            [trial["score"] for trial in trials],
+            [len(trial["scores"]) for trial in trials],
+        )
+        # best TPE score reached within the fits the grid spent
+        grid_fits = n_candidates * cv.get_n_splits() + 1
+        within = [score for spent, score in tpe_curve if spent <= grid_fits - 1]
+
+        results[model_type] = {
+            "grid": {
+                "fits": grid_fits,
+                "best_score": float(grid_search.best_score_),
+                "seconds": grid_seconds,
+                "curve": _best_so_far(grid_scores, [5] * n_candidates),
+            },
+            "tpe": {
+                "fits": report["fits"],
+                "trials": report["trials"],
+                "pruned": report["pruned"],
+                "best_score": report["best_score"],
+                "best_at_grid_fits": within[-1] if within else None,
+                "seconds": tpe_seconds,
+                "curve": tpe_curve,
+            },
+        }
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
@@ -0,0 +1,62 @@
+import time
+import tempfile
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.models.auto_model import AutoModel
+from nicefitbro.tracking import ExperimentTracker
+
+
+def _autofit(data, model_types, tracker=None):
+    start = time.perf_counter()
+    AutoModel(data, list(model_types), "target", tracker=tracker).auto_model()
+    return time.perf_counter() - start
+
+
+def run(
+    n_rows=5_000,
+    n_features=10,
+    model_types=("lr", "ridge", "lasso", "elastic", "knn", "dtr"),
+    n_events=100_000,
+):
+    """Measures the cost of tracking on the tuning hot path"""
+    data = make_regression_frame(n_rows, n_features, missing_frac=0.0)
+    results = {"untracked_seconds": _autofit(data, model_types)}
+
+    with tempfile.TemporaryDirectory() as tmp:
+        tracking_uri = f"sqlite:///{tmp}/mlruns.db"
+        tracker = ExperimentTracker(tracking_uri=tracking_uri)
+        results["tracked_seconds"] = _autofit(data, model_types, tracker)
+        report = tracker.close()
+        results["events"] = report["events"]
+        results["hot_path_seconds"] = report["hot_path_seconds"]
+        results["hot_path_fraction"] = (
+            report["hot_path_seconds"] / results["tracked_seconds"]
+        )
+
+        # a burst of events, against logging each one synchronously
+        tracker = ExperimentTracker(tracking_uri=tracking_uri)
+        start = time.perf_counter()
+        for step in range(n_events):
+            tracker.log_metric("burst", step, step=step)
+        results["queued_us_per_event"] = (time.perf_counter() - start) / n_events * 1e6
+        start = time.perf_counter()
+        report = tracker.close()
+        results["drain_seconds"] = time.perf_counter() - start
+        results["burst_flushes"] = report["flushes"]
+        results["burst_dropped"] = report["dropped"]
+
+        from mlflow.tracking import MlflowClient
+
+        client = MlflowClient(tracking_uri=tracking_uri)
+        run_id = client.create_run(
+            client.get_experiment_by_name("nicefitbro").experiment_id
+        ).info.run_id
+        n_sync = min(n_events, 1_000)
+        start = time.perf_counter()
+        for step in range(n_sync):
+            client.log_metric(run_id, "burst", step, step=step)
+        results["sync_us_per_event"] = (time.perf_counter() - start) / n_sync * 1e6
+    return results
+
+
+if __name__ == "__main__":
+    print(run())
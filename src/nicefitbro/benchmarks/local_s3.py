@@ -0,0 +1,62 @@
+import time
+from io import BytesIO
+
+
+class LocalS3Client:
+    """
+    In-process stand-in for the subset of the boto3 S3 client used by the S3 ingestors.
+
+    Objects are held in memory as bytes per bucket. Every request sleeps for latency seconds before returning, to
+    mimic the round trip to S3, and listing is paginated like list_objects_v2.
+
+    Attributes:
+        buckets (dict): Bucket name to a dict of key to object bytes.
+        latency (float): Seconds each request takes.
+        page_size (int): Maximum number of keys returned per listing page.
+        requests (int): Number of requests served.
+
+    Methods:
+        put_object(Bucket, Key, Body):
+            Stores Body under Key.
+        get_object(Bucket, Key):
+            Returns a dict whose Body has a read method.
+        list_objects_v2(Bucket, Prefix, ContinuationToken):
+            Returns one page of keys under Prefix.
+    """
+
+    def __init__(self, latency=0.0, page_size=1000):
+        self.buckets = {}
+        self.latency = latency
+        self.page_size = page_size
+        self.requests = 0
+
+    def _request(self):
+        self.requests += 1
+        if self.latency:
+            time.sleep(self.latency)
+
+    def put_object(self, Bucket, Key, Body):
+        if isinstance(Body, str):
+            Body = Body.encode()
+        self.buckets.setdefault(Bucket, {})[Key] = bytes(Body)
+        return {}
+
+    def get_object(self, Bucket, Key):
+        self._request()
+        return {"Body": BytesIO(self.buckets[Bucket][Key])}
+
+    def list_objects_v2(self, Bucket, Prefix="", ContinuationToken=None, **kwargs):
+        self._request()
+        keys = sorted(k for k in self.buckets.get(Bucket, {}) if k.startswith(Prefix))
+        start = int(ContinuationToken or 0)
+        page = keys[start : start + self.page_size]
+        response = {
+            "Contents": [
+                {"Key": key, "Size": len(self.buckets[Bucket][key])} for key in page
+            ],
+            "KeyCount": len(page),
+            "IsTruncated": start + self.page_size < len(keys),
+        }
+        if response["IsTruncated"]:
+            response["NextContinuationToken"] = str(start + self.page_size)
+        return response
@@ -0,0 +1,16 @@
+import numpy as np
+import pandas as pd
+
+
+def make_regression_frame(
+    n_rows=100_000, n_features=20, missing_frac=0.01, target="target", seed=0
+):
+    """Builds a numeric regression frame with a linear target, heavy tailed noise and missing feature values"""
+    rng = np.random.default_rng(seed)
+    X = rng.standard_normal((n_rows, n_features))
+    coef = rng.uniform(-2, 2, n_features)
+    y = X @ coef + rng.standard_t(3, n_rows)
+    X[rng.random((n_rows, n_features)) < missing_frac] = np.nan
+    data = pd.DataFrame(X, columns=[f"x{i}" for i in range(n_features)])
+    data[target] = y
+    return data
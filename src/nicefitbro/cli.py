@@ -0,0 +1,295 @@
+"""
+Command line entry point: ``nicefitbro run|profile|score|bench``.
+
+Each subcommand imports only what it needs, so ``nicefitbro bench --list`` or ``nicefitbro --help`` never load
+scikit-learn, xgboost or mlflow.
+"""
+
+import os
+import sys
+import json
+import inspect
+import argparse
+from nicefitbro import __version__
+
+BENCH_PREFIX = "bench_"
+
+
+def _jsonable(value):
+    # NumPy scalars and arrays, and anything else json cannot write
+    if hasattr(value, "tolist"):
+        return value.tolist()
+    return str(value)
+
+
+def _print_json(obj):
+    print(json.dumps(obj, indent=2, default=_jsonable))
+
+
+def _parse_value(text):
+    """Parses a --set value as JSON, e.g. 3, true or ["lr"], or keeps it as a string"""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _overrides(pairs):
+    overrides = {}
+    for pair in pairs or []:
+        key, sep, value = pair.partition("=")
+        if not sep:
+            raise ValueError(f"Invalid --set {pair!r}. Choose key=value.")
+        overrides[key] = _parse_value(value)
+    return overrides
+
+
+def load_config(path):
+    """Reads a RunConfig mapping from a YAML or JSON file"""
+    with open(path) as f:
+        if os.path.splitext(path)[1].lower() in (".yaml", ".yml"):
+            # PyYAML is only needed for YAML configs
+            import yaml
+
+            try:
+                config = yaml.safe_load(f)
+            except yaml.YAMLError as e:
+                raise ValueError(f"Invalid config {path}. Choose valid YAML: {e}")
+        else:
+            config = json.load(f)
+    if not isinstance(config, dict):
+        raise ValueError(
+            f"Invalid config {path}. Choose a mapping of RunConfig fields."
+        )
+    return config
+
+
+def build_run_config(path, overrides=None):
+    """Builds a RunConfig from a config file and key=value overrides"""
+    from dataclasses import fields
+    from nicefitbro.config.run_config import RunConfig
+
+    config = {**load_config(path), **(overrides or {})}
+    names = [field.name for field in fields(RunConfig)]
+    unknown = sorted(set(config) - set(names))
+    if unknown:
+        raise ValueError(
+            f"Invalid RunConfig fields {unknown}. Choose from {', '.join(names)}."
+        )
+    # YAML and JSON only have lists
+    if "quick_rank_fractions" in config:
+        config["quick_rank_fractions"] = tuple(config["quick_rank_fractions"])
+    return RunConfig(**config)
+
+
+def _summary(nice_fit_bro):
+    return {
+        "selected_model": nice_fit_bro.selected_model,
+        "performance": nice_fit_bro.performance,
+        "substitutions": nice_fit_bro.substitutions,
+        "search": nice_fit_bro.search_report,
+        "resources": nice_fit_bro.resource_report,
+        "prep": nice_fit_bro.prep_report,
+    }
+
+
+def _fit(run_config, save=None):
+    from nicefitbro.nicefitbro import NiceFitBro
+
+    nice_fit_bro = NiceFitBro(run_config)
+    nice_fit_bro.sendit()
+    if save:
+        nice_fit_bro.save(save)
+    return nice_fit_bro
+
+
+def cmd_run(args):
+    run_config = build_run_config(args.config, _overrides(args.set))
+    return lambda: _print_json(_summary(_fit(run_config, save=args.save)))
+
+
+def cmd_profile(args):
+    from nicefitbro.profiling import profile_call
+
+    # imported up front, so the profile shows the run rather than the imports
+    import nicefitbro.nicefitbro  # noqa: F401
+
+    run_config = build_run_config(args.config, _overrides(args.set))
+    output = args.output or (
+        "nicefitbro.collapsed" if args.profiler == "sample" else "nicefitbro.prof"
+    )
+
+    def profile():
+        nice_fit_bro, table = profile_call(
+            lambda: _fit(run_config, save=args.save), output, profiler=args.profiler
+        )
+        print(f"{'stage':<10} {'seconds':>10} {'share':>7}")
+        for row in table:
+            print(f"{row['stage']:<10} {row['seconds']:>10.3f} {row['share']:>7.1%}")
+        print(f"profile written to {output}")
+        if args.json:
+            _print_json({**_summary(nice_fit_bro), "stages": table})
+
+    return profile
+
+
+def cmd_score(args):
+    from nicefitbro.scoring import BatchScorer
+
+    scorer = BatchScorer(
+        args.artifact,
+        model_name=args.model,
+        chunk_rows=args.chunk_rows,
+        n_jobs=args.n_jobs,
+        n_cores=args.n_cores,
+    )
+    return lambda: _print_json(scorer.score(args.source, args.output))
+
+
+def list_benchmarks():
+    """Returns the names of the benchmarks in nicefitbro.benchmarks, without the bench_ prefix"""
+    import pkgutil
+    import nicefitbro.benchmarks
+
+    return sorted(
+        module.name[len(BENCH_PREFIX) :]
+        for module in pkgutil.iter_modules(nicefitbro.benchmarks.__path__)
+        if module.name.startswith(BENCH_PREFIX)
+    )
+
+
+def cmd_bench(args):
+    import importlib
+
+    available = list_benchmarks()
+    names = available if args.all else args.names
+    if args.list or not names:
+        print("\n".join(available))
+        return
+    unknown = [name for name in names if name not in available]
+    if unknown:
+        raise ValueError(
+            f"Invalid benchmarks {unknown}. Choose from {', '.join(available)}."
+        )
+    params = _overrides(args.set)
+    modules = {
+        name: importlib.import_module(f"nicefitbro.benchmarks.{BENCH_PREFIX}{name}")
+        for name in names
+    }
+    # checked up front, so a typo does not fail after the earlier benchmarks ran
+    for name, module in modules.items():
+        accepted = list(inspect.signature(module.run).parameters)
+        unknown = sorted(set(params) - set(accepted))
+        if unknown:
+            raise ValueError(
+                f"Invalid --set {unknown} for {name}. Choose from {', '.join(accepted)}."
+            )
+
+    def bench():
+        for name, module in modules.items():
+            _print_json({"benchmark": name, "results": module.run(**params)})
+
+    return bench
+
+
+def parse_args(args):
+    parser = argparse.ArgumentParser(
+        prog="nicefitbro", description="Fit, profile and benchmark nicefitbro runs."
+    )
+    parser.add_argument(
+        "--version", action="version", version=f"nicefitbro {__version__}"
+    )
+    subparsers = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = subparsers.add_parser("run", help="Run a RunConfig.")
+    profile_parser = subparsers.add_parser(
+        "profile",
+        help="Run a RunConfig under a profiler, with a per-stage timing table.",
+    )
+    for subparser in (run_parser, profile_parser):
+        subparser.add_argument("config", help="RunConfig as a YAML or JSON file.")
+        subparser.add_argument(
+            "--set",
+            action="append",
+            metavar="KEY=VALUE",
+            help="Override a RunConfig field; the value is read as JSON when it parses.",
+        )
+        subparser.add_argument("--save", help="Save the fitted run as an artifact.")
+    run_parser.set_defaults(func=cmd_run)
+
+    profile_parser.add_argument(
+        "--profiler",
+        choices=("sample", "cprofile"),
+        default="sample",
+        help="'sample' writes collapsed stacks for flamegraph.pl or speedscope; "
+        "'cprofile' writes pstats for snakeviz or flameprof.",
+    )
+    profile_parser.add_argument("--output", help="Profile path.")
+    profile_parser.add_argument(
+        "--json", action="store_true", help="Also print the run summary as JSON."
+    )
+    profile_parser.set_defaults(func=cmd_profile)
+
+    score_parser = subparsers.add_parser(
+        "score", help="Score a CSV file or column store with a saved artifact."
+    )
+    score_parser.add_argument("artifact", help="Artifact written by --save.")
+    score_parser.add_argument("source", help="CSV file or column store directory.")
+    score_parser.add_argument(
+        "output", help="Column store directory the predictions are written to."
+    )
+    score_parser.add_argument(
+        "--model", help="Model to score with; defaults to the selected one."
+    )
+    score_parser.add_argument(
+        "--chunk-rows", type=int, default=100_000, help="Rows per chunk."
+    )
+    score_parser.add_argument(
+        "--n-jobs", type=int, help="Worker processes; defaults to one per core."
+    )
+    score_parser.add_argument(
+        "--n-cores", type=int, help="Cores shared by the workers."
+    )
+    score_parser.set_defaults(func=cmd_score)
+
+    bench_parser = subparsers.add_parser(
+        "bench", help="Run the synthetic workload benchmarks."
+    )
+    bench_parser.add_argument(
+        "names", nargs="*", help="Benchmarks to run, e.g. fused_kernel."
+    )
+    bench_parser.add_argument("--all", action="store_true", help="Run every benchmark.")
+    bench_parser.add_argument(
+        "--list", action="store_true", help="List the benchmarks and exit."
+    )
+    bench_parser.add_argument(
+        "--set",
+        action="append",
+        metavar="KEY=VALUE",
+        help="Argument passed to each benchmark's run(), e.g. n_rows=10000.",
+    )
+    bench_parser.set_defaults(func=cmd_bench)
+    return parser.parse_args(args)
+
+
+def main(args):
+    args = parse_args(args)
+    # each command checks its input and returns the work left to do, so only bad input is reported here:
+    # invalid values, a missing or unreadable file, wrong argument types. Errors during the run propagate.
+    try:
+        work = args.func(args)
+    except (ValueError, OSError, TypeError) as e:
+        print(f"nicefitbro: error: {e}", file=sys.stderr)
+        return 2
+    if work is not None:
+        work()
+    return 0
+
+
+def run():
+    """Calls main with the command line arguments, the console script entry point"""
+    sys.exit(main(sys.argv[1:]))
+
+
+if __name__ == "__main__":
+    run()
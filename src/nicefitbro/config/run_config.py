@@ -1,5 +1,5 @@
 from dataclasses import dataclass
-from typing import Optional, List
+from typing import Optional, List, Tuple, Dict
 
 
 @dataclass
@@ -14,3 +14,28 @@ class RunConfig:
     feature_selector_k: Optional[int] = None
     feature_scaler_method: Optional[str] = None
     model_types: Optional[List[str]] = None
+    time_budget: Optional[float] = None
+    checkpoint_dir: Optional[str] = None
+    fused: bool = False
+    backend: str = "pandas"
+    in_fold: bool = False
+    precision: str = "float64"
+    test_size: float = 0.33
+    random_state: int = 42
+    quick_rank: bool = False
+    quick_rank_fractions: Tuple[float, ...] = (0.01, 0.1)
+    quick_rank_top_k: int = 3
+    scalability_thresholds: Optional[Dict[str, Optional[int]]] = None
+    measure_latency: bool = False
+    max_latency_ms: Optional[float] = None
+    max_size_bytes: Optional[int] = None
+    tracking_uri: Optional[str] = None
+    experiment_name: str = "nicefitbro"
+    n_bootstrap: int = 0
+    search: str = "grid"
+    n_trials: int = 30
+    n_parallel_trials: int = 1
+    refresh_dir: Optional[str] = None
+    drift_threshold: float = 0.25
+    schema: bool = True
+    n_cores: Optional[int] = None
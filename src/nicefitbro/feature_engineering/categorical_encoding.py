@@ -29,8 +29,13 @@ class CategoricalEncoder(FeatureEngineering):
         self.columns = columns
 
     def engineer_features(self, data, target=None):
-        # ensure features are of type object
-        cat_cols = [col for col in data.columns if data[col].dtype == "object"]
+        # ensure features are of type object, or parsed as categoricals by a CSV schema
+        cat_cols = [
+            col
+            for col in data.columns
+            if data[col].dtype == "object"
+            or isinstance(data[col].dtype, pd.CategoricalDtype)
+        ]
 
         if self.method == "ordinal":
             encoder = OrdinalEncoder()
@@ -15,22 +15,44 @@ class FeatureScaler(FeatureEngineering):
         method (str): String indicating the method to use for scaling the features.
             'standard': Scale features to have zero mean and unit variance using StandardScaler.
             'minmax': Scale features to have a minimum value of 0 and a maximum value of 1 using MinMaxScaler.
+        offsets (pandas Series): Value subtracted from each column, once engineer_features has run.
+        scales (pandas Series): Value each column is then divided by.
 
     Methods:
         engineer_features(data):
             Scales the features in the data.
             - data: pandas DataFrame containing the data.
             Returns: pandas DataFrame with scaled features.
+        transform(data):
+            Scales the columns of new data with the offsets and scales fitted by engineer_features.
+            - data: pandas DataFrame containing the new data, with or without the target.
+            Returns: pandas DataFrame with scaled features.
     """
 
     def __init__(self, method="standard"):
         self.method = method
+        self.offsets = None
+        self.scales = None
 
     def engineer_features(self, data, target=None):
         if self.method == "standard":
             scaler = StandardScaler()
             data_scaled = scaler.fit_transform(data)
+            self.offsets = pd.Series(scaler.mean_, index=data.columns)
+            self.scales = pd.Series(scaler.scale_, index=data.columns)
         elif self.method == "minmax":
             scaler = MinMaxScaler()
             data_scaled = scaler.fit_transform(data)
+            self.offsets = pd.Series(scaler.data_min_, index=data.columns)
+            self.scales = pd.Series(1 / scaler.scale_, index=data.columns)
         return pd.DataFrame(data_scaled, columns=data.columns)
+
+    def transform(self, data):
+        if self.offsets is None:
+            raise ValueError(
+                "Invalid FeatureScaler for transform. Choose one that has run engineer_features."
+            )
+        columns = [col for col in data.columns if col in self.offsets.index]
+        data = data.copy()
+        data[columns] = (data[columns] - self.offsets[columns]) / self.scales[columns]
+        return data
@@ -25,6 +25,7 @@ class FeatureSelection(FeatureEngineering):
             'rfe': Use Recursive Feature Elimination (RFE) algorithm.
             'lasso': Use Lasso Regression algorithm.
             'manual': Manually select the columns given a list
+        selected_features (list): Columns kept, once engineer_features has run.
 
     Methods:
         engineer_features(data, target):
@@ -32,12 +33,17 @@ class FeatureSelection(FeatureEngineering):
             - data: pandas DataFrame containing the data.
             - target: pandas Series containing the target variable.
             Returns: pandas DataFrame with the selected features.
+        transform(data):
+            Keeps the selected_features of new data.
+            - data: pandas DataFrame containing the new data.
+            Returns: pandas DataFrame with the selected features.
     """
 
     def __init__(self, k=15, threshold=0.5, method="select_k_best"):
         self.k = k
         self.threshold = threshold
         self.method = method
+        self.selected_features = None
 
     def manual_selection(self, data, features, target):
         """Preforms manual feature selection on the input dataframe
@@ -59,7 +65,8 @@ class FeatureSelection(FeatureEngineering):
         if target not in data.columns:
             raise Exception
 
-        return data[[target] + features]
+        self.selected_features = [target] + features
+        return data[self.selected_features]
 
     def select_features_select_k_best(self, data, target):
         feature_df = data.drop(columns=[target])
@@ -68,6 +75,7 @@ class FeatureSelection(FeatureEngineering):
         selector.fit(feature_df, target_df)
         mask = selector.get_support()
         selected_features = feature_df.columns[mask]
+        self.selected_features = list(selected_features)
         return data[selected_features]
 
     def select_features_rfe(self, data, target):
@@ -81,6 +89,7 @@ class FeatureSelection(FeatureEngineering):
         selector.fit(feature_df, target_df)
         mask = selector.support_
         selected_features = feature_df.columns[mask]
+        self.selected_features = list(selected_features)
         return data[selected_features]
 
     def select_features_lasso(self, data, target):
@@ -90,6 +99,7 @@ class FeatureSelection(FeatureEngineering):
         selector.fit(feature_df, target_df)
         mask = selector.coef_ != 0
         selected_features = feature_df.columns[mask]
+        self.selected_features = list(selected_features)
         return data[selected_features]
 
     def engineer_features(self, data, target, features=None):
@@ -105,3 +115,10 @@ class FeatureSelection(FeatureEngineering):
             raise ValueError(
                 "Invalid method for feature selection. Choose 'select_k_best', 'rfe', 'lasso', or 'manual'."
             )
+
+    def transform(self, data):
+        if self.selected_features is None:
+            raise ValueError(
+                "Invalid FeatureSelection for transform. Choose one that has run engineer_features."
+            )
+        return data[[col for col in self.selected_features if col in data.columns]]
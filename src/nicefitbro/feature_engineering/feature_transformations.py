@@ -23,18 +23,24 @@ class FeatureTransformer(FeatureEngineering):
             'log': Use log transformation.
             'box_cox': Use Box Cox transformation.
         feature (str or list of str): Feature(s) to apply the transformation to.
+        lambdas (dict): Box Cox lambda fitted per feature, once engineer_features has run.
 
     Methods:
         engineer_features(data):
             Transforms the specified feature(s) of the data using the specified feature transformation technique.
             - data: pandas DataFrame containing the data.
             Returns: pandas DataFrame with the transformed features.
+        transform(data):
+            Transforms new data the same way, reusing the fitted Box Cox lambdas.
+            - data: pandas DataFrame containing the new data.
+            Returns: pandas DataFrame with the transformed features.
     """
 
     def __init__(self, features, degree=2, method="polynomial"):
         self.features = features
         self.degree = degree
         self.method = method
+        self.lambdas = {}
 
     def transform_features_polynomial(self, data, features):
         if len(features) == 1:
@@ -69,7 +75,7 @@ class FeatureTransformer(FeatureEngineering):
 
     def transform_features_box_cox(self, data, features):
         for col in features:
-            data[col] = stats.boxcox(data[col])[0]
+            data[col], self.lambdas[col] = stats.boxcox(data[col])
         return data
 
     def engineer_features(self, data, target=None):
@@ -81,3 +87,11 @@ class FeatureTransformer(FeatureEngineering):
             return self.transform_features_log(data, self.features)
         elif self.method == "box_cox":
             return self.transform_features_box_cox(data, self.features)
+
+    def transform(self, data):
+        if self.method != "box_cox":
+            return self.engineer_features(data.copy())
+        data = data.copy()
+        for col in self.features:
+            data[col] = stats.boxcox(data[col], lmbda=self.lambdas[col])
+        return data
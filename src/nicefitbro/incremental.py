@@ -0,0 +1,273 @@
+import os
+import copy
+import time
+import numpy as np
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import SGDRegressor
+import xgboost as xgb
+from nicefitbro.ingestors.ingestor_abc import DataIngestor
+from nicefitbro.ingestors.local_ingestor import LocalFileIngestor
+from nicefitbro.preprocess.outlier_detector import OutlierDetector
+from nicefitbro.preprocess.sketches import ColumnSketch, MomentSketch
+from nicefitbro.precision import PrecisionPolicy
+from nicefitbro.artifact import save_artifact, load_artifact
+from nicefitbro.nicefitbro import NiceFitBro
+
+STATE_FILE = "refresh_state.nfb"
+# xgboost's eta when learning_rate is left unset
+XGB_LEARNING_RATE = 0.3
+
+
+class _FrameIngestor(DataIngestor):
+    # hands rows already read by ingest_appended to DataPrepper
+    def __init__(self, data):
+        self.data = data
+
+    def ingest_data(self, source):
+        return self.data
+
+
+def column_drift(fit_moments, new_moments):
+    """Returns per column drift of new data: the larger of the mean shift in fitted standard deviations and the absolute log ratio of the standard deviations"""
+    fit_std, new_std = fit_moments.std(), new_moments.std()
+    with np.errstate(divide="ignore", invalid="ignore"):
+        shift = np.abs(new_moments.mean - fit_moments.mean) / fit_std
+        spread = np.abs(np.log(new_std / fit_std))
+    # constant columns only drift when their value changes
+    shift = np.where(fit_std > 0, shift, np.where(shift == 0, 0.0, np.inf))
+    return np.nan_to_num(np.maximum(shift, np.nan_to_num(spread)), nan=0.0)
+
+
+def warm_start(model, X, y, extra_trees=0.1, share=1.0):
+    """Updates a fitted sgd, xgb or rfr model with new rows, or returns None for other models"""
+    if isinstance(model, SGDRegressor):
+        model.partial_fit(X, y)
+        return model
+    if isinstance(model, xgb.XGBRegressor):
+        # continued boosting: new rounds fit the residuals of the current trees on
+        # the new rows, with steps shrunk by the share of all rows those make up so
+        # a small chunk cannot pull the ensemble towards its own noise
+        params = model.get_params()
+        rounds = max(1, int(model.get_booster().num_boosted_rounds() * extra_trees))
+        learning_rate = (params["learning_rate"] or XGB_LEARNING_RATE) * share
+        updated = xgb.XGBRegressor(
+            **{**params, "n_estimators": rounds, "learning_rate": learning_rate}
+        )
+        updated.fit(X, y, xgb_model=model.get_booster())
+        return updated
+    if isinstance(model, RandomForestRegressor):
+        # extra trees grown on the new rows join the forest
+        extra = max(1, int(len(model.estimators_) * extra_trees))
+        model.set_params(warm_start=True, n_estimators=len(model.estimators_) + extra)
+        model.fit(X, y)
+        return model
+    return None
+
+
+class IncrementalRefresher:
+    """
+    Class for refreshing a fitted run when its source data is appended to.
+
+    The first refresh runs the RunConfig in full and saves its state to refresh_dir: the fitted steps and trained
+    models (as an artifact, see save_artifact), a high-water mark per source file, and mergeable statistics of the
+    raw numeric columns. Every later refresh reads only the rows appended since the watermarks and compares their
+    statistics, accumulated over every row appended since the last full refit, with those the run was fitted on.
+    Below drift_threshold the new rows go through the fitted steps, with zscore/iqr outlier bounds taken from the
+    statistics merged over all rows seen, and the models that support it are warm started on them: sgd with
+    partial_fit, xgb with extra boosting rounds, their learning rate shrunk by the share of all rows the new ones
+    make up, and rfr with extra trees. Other models keep their fit. The steps keep the parameters the models were
+    fitted with, so warm started models see inputs scaled the same way as before. A full refit, which also re-tunes,
+    runs when the drift passes the threshold or a source was rewritten rather than appended to.
+
+    Attributes:
+        run_config (RunConfig): Run to refresh; file_path is the appended source.
+        refresh_dir (str): Directory of the saved state.
+        drift_threshold (float): Largest column drift, in fitted standard deviations, refreshed without a full refit.
+        min_drift_rows (int): Rows appended since the last full refit before drift is judged; the mean of fewer
+            rows is too noisy to compare.
+        extra_trees (float): Rounds or trees added per warm start, as a fraction of the current ones.
+        report (dict): Action taken, rows read, drift and seconds of the last refresh.
+
+    Methods:
+        refresh():
+            Brings the state up to date with the source.
+            Returns: dict, the report.
+        load():
+            Returns: Artifact of the current state.
+    """
+
+    def __init__(
+        self,
+        run_config,
+        refresh_dir=None,
+        drift_threshold=None,
+        min_drift_rows=100,
+        extra_trees=0.1,
+    ):
+        self.run_config = run_config
+        self.refresh_dir = refresh_dir or run_config.refresh_dir
+        if self.refresh_dir is None:
+            raise ValueError(
+                "Invalid refresh directory. Choose a refresh_dir for the saved state."
+            )
+        self.drift_threshold = (
+            drift_threshold
+            if drift_threshold is not None
+            else run_config.drift_threshold
+        )
+        self.min_drift_rows = min_drift_rows
+        self.extra_trees = extra_trees
+        self.ingestor = LocalFileIngestor()
+        self.policy = PrecisionPolicy(run_config.precision)
+        self.report = {}
+
+    @property
+    def state_path(self):
+        return os.path.join(self.refresh_dir, STATE_FILE)
+
+    def load(self):
+        return load_artifact(self.state_path)
+
+    @staticmethod
+    def _numeric(data):
+        return data.select_dtypes("number")
+
+    def _save(self, steps, models, feature_names, selected_model, refresh_state):
+        os.makedirs(self.refresh_dir, exist_ok=True)
+        save_artifact(
+            self.state_path,
+            steps,
+            feature_names,
+            self.run_config.target,
+            models,
+            selected_model=selected_model,
+            precision=self.run_config.precision,
+            metadata={"refresh": refresh_state},
+            compiled=False,
+        )
+
+    def _full_refit(self, data, watermarks):
+        # before the run, whose steps fill missing values in place
+        numeric = self._numeric(data)
+        sketch = ColumnSketch(numeric.columns).update(numeric)
+        nfb = NiceFitBro(self.run_config)
+        nfb.ingestor = _FrameIngestor(data)
+        nfb.sendit()
+        self._save(
+            nfb.fitted_steps(),
+            nfb.trained_models,
+            nfb.feature_names,
+            nfb.selected_model,
+            {
+                "watermarks": watermarks,
+                "sketch": sketch.to_dict(),
+                # statistics the models were fitted on, the baseline for drift
+                "fit_moments": sketch.moments.to_dict(),
+                "new_moments": MomentSketch(len(sketch.columns)).to_dict(),
+                "rows_fitted": len(data),
+            },
+        )
+        return {"models": {name: "refit" for name in nfb.trained_models}}
+
+    def _prepare(self, steps, data, sketch):
+        data = self.policy.cast(data)
+        for step in steps:
+            if isinstance(step, OutlierDetector) and step.method in ("zscore", "iqr"):
+                # bounds over every row seen so far, not only the new ones
+                step.sketch = sketch
+                data = step.preprocess_data(data)
+            elif isinstance(step, OutlierDetector):
+                data = step.preprocess_data(data)
+            else:
+                data = step.transform(data)
+        return data
+
+    def refresh(self):
+        start = time.perf_counter()
+        if not os.path.exists(self.state_path):
+            data, watermarks, _ = self.ingestor.ingest_appended(
+                self.run_config.file_path
+            )
+            report = {"action": "full_refit", "reason": "no saved state"}
+            report.update(self._full_refit(data, watermarks))
+            report["rows_read"] = len(data)
+            report["seconds"] = time.perf_counter() - start
+            self.report = report
+            return report
+
+        artifact = self.load()
+        state = artifact.header["metadata"]["refresh"]
+        new_rows, watermarks, rewritten = self.ingestor.ingest_appended(
+            self.run_config.file_path, state["watermarks"]
+        )
+        report = {"rows_read": len(new_rows)}
+        if rewritten:
+            report.update(action="full_refit", reason=f"rewritten: {rewritten}")
+        elif new_rows.empty:
+            report.update(action="none", reason="no new rows")
+        else:
+            sketch = ColumnSketch.from_dict(state["sketch"])
+            numeric = self._numeric(new_rows)[sketch.columns]
+            new_moments = MomentSketch.from_dict(state["new_moments"])
+            new_moments.update(numeric.to_numpy())
+            drift = np.zeros(len(sketch.columns))
+            if new_moments.count.max() >= self.min_drift_rows:
+                drift = column_drift(
+                    MomentSketch.from_dict(state["fit_moments"]), new_moments
+                )
+            worst = int(np.argmax(drift))
+            report["drift"] = {
+                "max": float(drift[worst]),
+                "column": sketch.columns[worst],
+                "rows": int(new_moments.count.max()),
+                "threshold": self.drift_threshold,
+            }
+            if drift[worst] > self.drift_threshold:
+                report.update(action="full_refit", reason="drift over threshold")
+            else:
+                report["action"] = "warm_start"
+                sketch.update(numeric)
+                state = {**state, "new_moments": new_moments.to_dict()}
+                report.update(
+                    self._warm_start(artifact, state, new_rows, sketch, watermarks)
+                )
+
+        if report["action"] == "full_refit":
+            # the full rerun reads every row again
+            data, watermarks, _ = self.ingestor.ingest_appended(
+                self.run_config.file_path
+            )
+            report.update(self._full_refit(data, watermarks))
+        report["seconds"] = time.perf_counter() - start
+        self.report = report
+        return report
+
+    def _warm_start(self, artifact, state, new_rows, sketch, watermarks):
+        steps = artifact.steps
+        data = self._prepare(steps, new_rows, sketch)
+        X = data[artifact.feature_names]
+        y = data[self.run_config.target]
+        share = len(data) / (state["rows_fitted"] + len(data))
+        models, actions = {}, {}
+        for name in artifact.header["models"]:
+            # loaded arrays are read-only views of the saved state
+            model = copy.deepcopy(artifact.model(name))
+            # outlier removal can leave nothing of a small chunk to train on
+            updated = (
+                warm_start(model, X, y, self.extra_trees, share) if len(X) else None
+            )
+            models[name] = updated if updated is not None else model
+            actions[name] = "warm_start" if updated is not None else "kept"
+        self._save(
+            steps,
+            models,
+            artifact.feature_names,
+            artifact.selected_model,
+            {
+                **state,
+                "watermarks": watermarks,
+                "sketch": sketch.to_dict(),
+                "rows_fitted": state["rows_fitted"] + len(new_rows),
+            },
+        )
+        return {"models": actions, "rows_trained": len(data)}
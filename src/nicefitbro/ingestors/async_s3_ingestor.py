@@ -0,0 +1,126 @@
+import asyncio
+from io import BytesIO
+from concurrent.futures import ThreadPoolExecutor
+import pandas as pd
+from nicefitbro.ingestors.ingestor_abc import DataIngestor
+
+
+def _list_keys(client, bucket_name, prefix):
+    keys = []
+    kwargs = {"Bucket": bucket_name, "Prefix": prefix}
+    while True:
+        response = client.list_objects_v2(**kwargs)
+        # zero-byte objects are markers, e.g. _SUCCESS or directory placeholders, not data
+        keys += [
+            obj["Key"] for obj in response.get("Contents", []) if obj.get("Size") != 0
+        ]
+        if not response.get("IsTruncated"):
+            return keys
+        kwargs["ContinuationToken"] = response["NextContinuationToken"]
+
+
+def _download(client, bucket_name, key):
+    return client.get_object(Bucket=bucket_name, Key=key)["Body"].read()
+
+
+def _parse(body, drop_cols, on_chunk):
+    df = pd.read_csv(BytesIO(body), usecols=lambda col: col not in drop_cols)
+    return on_chunk(df) if on_chunk else df
+
+
+def _run(coro):
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # already inside an event loop (e.g. a notebook), so run on a thread of our own
+    with ThreadPoolExecutor(max_workers=1) as executor:
+        return executor.submit(asyncio.run, coro).result()
+
+
+class AsyncS3Ingestor(DataIngestor):
+    """
+    Concrete implementation of the DataIngestor abstract class for importing every object under an S3 prefix.
+
+    This class lists the prefix and downloads the objects concurrently through the caller supplied client, with at
+    most max_concurrency requests in flight. Each object is parsed on a separate pool as soon as its download
+    finishes, so parsing overlaps with the remaining downloads. Zero-byte objects, such as _SUCCESS markers and
+    directory placeholders, are skipped. Any client exposing list_objects_v2 and get_object, such as a boto3 client
+    or an in-process stand-in, can be used.
+
+    Attributes:
+        max_concurrency (int): Maximum number of downloads in flight.
+        parse_workers (int): Number of threads parsing downloaded objects.
+
+    Methods:
+        iter_chunks(client, bucket_name, prefix):
+            Async generator of (key, DataFrame) pairs in the order the objects arrive.
+            - on_chunk: optional function applied to each parsed chunk, e.g. a row-wise cleaning step.
+        ingest_data(client, bucket_name, prefix):
+            Imports all objects under the prefix.
+            Returns: pandas DataFrame of the objects concatenated in key order.
+    """
+
+    def __init__(self, max_concurrency=16, parse_workers=None):
+        self.max_concurrency = max_concurrency
+        self.parse_workers = parse_workers
+
+    async def iter_chunks(
+        self,
+        client,
+        bucket_name,
+        prefix,
+        drop_cols=["Unnamed: 0", "api"],
+        on_chunk=None,
+    ):
+        loop = asyncio.get_running_loop()
+        drop_cols = set(drop_cols or [])
+        semaphore = asyncio.Semaphore(self.max_concurrency)
+
+        with ThreadPoolExecutor(self.max_concurrency) as downloads, ThreadPoolExecutor(
+            self.parse_workers
+        ) as parsers:
+            keys = await loop.run_in_executor(
+                downloads, _list_keys, client, bucket_name, prefix
+            )
+
+            async def fetch(key):
+                async with semaphore:
+                    body = await loop.run_in_executor(
+                        downloads, _download, client, bucket_name, key
+                    )
+                # parse outside the semaphore so the next download can start
+                df = await loop.run_in_executor(
+                    parsers, _parse, body, drop_cols, on_chunk
+                )
+                return key, df
+
+            tasks = [asyncio.ensure_future(fetch(key)) for key in keys]
+            try:
+                for task in asyncio.as_completed(tasks):
+                    yield await task
+            finally:
+                for task in tasks:
+                    task.cancel()
+
+    async def _collect(self, client, bucket_name, prefix, drop_cols, on_chunk):
+        chunks = {}
+        async for key, df in self.iter_chunks(
+            client, bucket_name, prefix, drop_cols, on_chunk
+        ):
+            chunks[key] = df
+        if not chunks:
+            raise ValueError(f"No objects found under s3://{bucket_name}/{prefix}.")
+        return pd.concat(
+            [chunks[key] for key in sorted(chunks)], ignore_index=True, copy=False
+        )
+
+    def ingest_data(
+        self,
+        client,
+        bucket_name,
+        prefix,
+        drop_cols=["Unnamed: 0", "api"],
+        on_chunk=None,
+    ):
+        return _run(self._collect(client, bucket_name, prefix, drop_cols, on_chunk))
@@ -0,0 +1,137 @@
+import os
+import json
+import numpy as np
+import pandas as pd
+from nicefitbro.ingestors.ingestor_abc import DataIngestor
+
+SCHEMA_FILE = "schema.json"
+SCHEMA_VERSION = 1
+# NumPy dtype kinds stored as they are: bool, integers, floats, complex, datetimes and timedeltas
+STORED_KINDS = "biufcmM"
+
+
+def is_column_store(source):
+    return os.path.isfile(os.path.join(str(source), SCHEMA_FILE))
+
+
+class ColumnStoreIngestor(DataIngestor):
+    """
+    Concrete implementation of the DataIngestor abstract class for importing data from an on-disk column store.
+
+    A column store is a directory holding one .npy file per dtype and a schema.json. Each .npy file is a 2D array
+    with one row per column, so every column is contiguous on disk. String columns are stored as integer codes with
+    their categories kept in the schema. Ingesting memory maps the arrays copy-on-write and builds the DataFrame from
+    one array per column without copying, so opening a store takes near constant time, and processes reading the
+    same store share its pages through the OS page cache until they write to them. NumPy numeric, bool, datetime and
+    timedelta columns, string columns and categoricals of strings round-trip; other dtypes, e.g. nullable integers
+    or timezone aware datetimes, are rejected by write.
+
+    Attributes:
+        None
+
+    Methods:
+        write(data, path):
+            Converts a DataFrame into a column store.
+            - data: pandas DataFrame to store. The index is not stored.
+            - path: string indicating the directory to write the store to.
+        ingest_data(path):
+            Opens a column store.
+            - path: string indicating the directory of the store.
+            Returns: pandas DataFrame backed by the memory mapped arrays.
+    """
+
+    @staticmethod
+    def _is_strings(values):
+        return pd.api.types.infer_dtype(values, skipna=True) in ("string", "empty")
+
+    def _check(self, data):
+        duplicated = data.columns[data.columns.duplicated()].tolist()
+        if duplicated:
+            raise ValueError(
+                f"Invalid columns {duplicated} for a column store. Choose unique column names."
+            )
+        for name in data.columns:
+            dtype = data[name].dtype
+            if isinstance(dtype, pd.CategoricalDtype):
+                supported = self._is_strings(dtype.categories)
+            elif dtype == object:
+                supported = self._is_strings(data[name])
+            else:
+                supported = isinstance(dtype, np.dtype) and dtype.kind in STORED_KINDS
+            if not supported:
+                raise ValueError(
+                    f"Invalid column {name} of dtype {dtype} for a column store. Choose numeric, bool, "
+                    "datetime, string or string category columns."
+                )
+
+    def write(self, data, path):
+        # every column is checked before anything is written
+        self._check(data)
+        os.makedirs(path, exist_ok=True)
+        groups = {}
+        columns = []
+        for name in data.columns:
+            series = data[name]
+            categories = None
+            if isinstance(series.dtype, np.dtype) and series.dtype.kind in STORED_KINDS:
+                values = series.to_numpy()
+            elif isinstance(series.dtype, pd.CategoricalDtype):
+                # a categorical's own codes, so the order of its categories is kept
+                values = series.cat.codes.to_numpy().astype(np.int32)
+                categories = [str(category) for category in series.cat.categories]
+            else:
+                codes, uniques = pd.factorize(series)
+                values = codes.astype(np.int32)
+                categories = [str(category) for category in uniques]
+            group = values.dtype.name if categories is None else "codes"
+            groups.setdefault(group, []).append(values)
+            columns.append(
+                {
+                    "name": str(name),
+                    "dtype": series.dtype.name,
+                    "group": group,
+                    "position": len(groups[group]) - 1,
+                    "categories": categories,
+                    "ordered": bool(getattr(series.dtype, "ordered", False)),
+                }
+            )
+
+        for group, arrays in groups.items():
+            np.save(os.path.join(path, f"{group}.npy"), np.stack(arrays))
+
+        schema = {"version": SCHEMA_VERSION, "n_rows": len(data), "columns": columns}
+        with open(os.path.join(path, SCHEMA_FILE), "w") as f:
+            json.dump(schema, f, indent=2)
+
+    def _load_schema(self, path):
+        with open(os.path.join(path, SCHEMA_FILE)) as f:
+            schema = json.load(f)
+        if schema.get("version") != SCHEMA_VERSION:
+            raise ValueError(f"Unsupported column store version in {path}.")
+        return schema
+
+    def ingest_data(self, path):
+        schema = self._load_schema(path)
+        arrays = {}
+        for group in {col["group"] for col in schema["columns"]}:
+            arrays[group] = np.load(os.path.join(path, f"{group}.npy"), mmap_mode="c")
+
+        # one memory mapped row per column; pandas keeps each as its own block, uncopied
+        columns = {}
+        for col in schema["columns"]:
+            values = arrays[col["group"]][col["position"]]
+            if col["group"] == "codes":
+                values = pd.Categorical.from_codes(
+                    values,
+                    categories=col["categories"],
+                    ordered=col.get("ordered", False),
+                )
+                if col["dtype"] != "category":
+                    values = np.asarray(values, dtype=object)
+            columns[col["name"]] = values
+        return pd.DataFrame(
+            columns,
+            index=pd.RangeIndex(schema["n_rows"]),
+            columns=[col["name"] for col in schema["columns"]],
+            copy=False,
+        )
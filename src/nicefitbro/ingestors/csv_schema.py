@@ -0,0 +1,84 @@
+import os
+import csv
+import glob
+import json
+
+# 2: dtypes of every column; drop_cols no longer saved as skip
+SCHEMA_VERSION = 2
+# sidecar of a single file: data.csv -> data.csv.schema.json
+SCHEMA_SUFFIX = ".schema.json"
+# sidecar of a directory of shards, which find_shards does not pick up as a shard
+SHARDS_SCHEMA_FILE = "_csv_schema.json"
+# string columns with at most this share of distinct values are parsed as categoricals
+CATEGORY_RATIO = 0.5
+
+
+def schema_path(source):
+    """Returns the sidecar path of a CSV file or a directory of shards, or None for a glob pattern"""
+    source = os.fspath(source)
+    if os.path.isdir(source):
+        return os.path.join(source, SHARDS_SCHEMA_FILE)
+    if glob.has_magic(source):
+        return None
+    return source + SCHEMA_SUFFIX
+
+
+def read_header(path):
+    """Returns the column names in the first line of a CSV file"""
+    with open(path, newline="") as f:
+        return next(csv.reader(f), [])
+
+
+def infer_schema(data, skip=(), category_ratio=CATEGORY_RATIO):
+    """Builds a schema from a DataFrame parsed with pandas' own type inference; skip lists columns it never reads"""
+    dtypes, categorical = {}, []
+    for col in data.columns:
+        series = data[col]
+        dtype = series.dtype.name
+        if dtype == "object" and series.nunique() <= category_ratio * len(series):
+            dtype = "category"
+            categorical.append(col)
+        dtypes[col] = dtype
+    return {
+        "version": SCHEMA_VERSION,
+        # every column of the file, skipped ones included, to detect a changed header
+        "columns": list(data.columns) + [col for col in skip if col not in dtypes],
+        "dtypes": dtypes,
+        "categorical": categorical,
+        "skip": [col for col in skip if col not in dtypes],
+    }
+
+
+def save_schema(schema, path):
+    """Writes a schema sidecar, or returns False when the directory is not writable"""
+    try:
+        with open(path + ".tmp", "w") as f:
+            json.dump(schema, f, indent=2)
+        os.replace(path + ".tmp", path)
+    except OSError:
+        return False
+    return True
+
+
+def load_schema(path, header=None):
+    """Reads a schema sidecar, or returns None when it is missing, stale or of another version"""
+    if path is None or not os.path.isfile(path):
+        return None
+    with open(path) as f:
+        schema = json.load(f)
+    if schema.get("version") != SCHEMA_VERSION:
+        return None
+    if header is not None and sorted(header) != sorted(schema["columns"]):
+        return None
+    return schema
+
+
+def read_options(schema, drop_cols=(), float_dtype=None):
+    """Turns a schema into read_csv usecols and dtype arguments, leaving out skipped and dropped columns"""
+    skip = set(schema["skip"]) | set(drop_cols or [])
+    dtypes = {
+        col: float_dtype if float_dtype and dtype == "float64" else dtype
+        for col, dtype in schema["dtypes"].items()
+        if col not in skip
+    }
+    return {"usecols": list(dtypes), "dtype": dtypes}
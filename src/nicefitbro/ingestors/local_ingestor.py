@@ -1,5 +1,105 @@
+import io
+import os
+import glob
+import hashlib
+from concurrent.futures import ProcessPoolExecutor
 import pandas as pd
 from nicefitbro.ingestors.ingestor_abc import DataIngestor
+from nicefitbro.ingestors.csv_schema import (
+    schema_path,
+    read_header,
+    infer_schema,
+    save_schema,
+    load_schema,
+    read_options,
+)
+
+
+def partition_keys(path):
+    """Parses hive style key=value directory names in path into a dict"""
+    keys = {}
+    for part in os.path.normpath(os.path.dirname(path)).split(os.sep):
+        if "=" in part:
+            key, value = part.split("=", 1)
+            keys[key] = value
+    return keys
+
+
+def _matches(keys, filters):
+    for key, allowed in filters.items():
+        value = keys.get(key)
+        if callable(allowed):
+            if not allowed(value):
+                return False
+        elif isinstance(allowed, (list, tuple, set)):
+            if value not in allowed:
+                return False
+        elif value != allowed:
+            return False
+    return True
+
+
+# bytes hashed at the start of a file to tell an append from a rewrite
+HEAD_BYTES = 65536
+
+
+def _head_hash(f, length):
+    f.seek(0)
+    return hashlib.sha256(f.read(min(length, HEAD_BYTES))).hexdigest()
+
+
+def _read_appended(path, watermark, drop_cols=()):
+    # reads the complete lines written since the watermark; a trailing partial
+    # line is left for the next call
+    with open(path, "rb") as f:
+        rewritten = False
+        if watermark is not None:
+            size = os.fstat(f.fileno()).st_size
+            if size < watermark["offset"] or (
+                _head_hash(f, watermark["offset"]) != watermark["head_hash"]
+            ):
+                watermark, rewritten = None, True
+        offset = watermark["offset"] if watermark else 0
+        f.seek(offset)
+        chunk = f.read()
+        complete = chunk[: chunk.rfind(b"\n") + 1]
+        end = offset + len(complete)
+        if watermark is None and not complete:
+            # an empty file, or one whose header line is still being written: nothing to
+            # read yet, and no watermark, so the next call reads it from the start
+            return pd.DataFrame(), None, rewritten
+        if watermark is None:
+            columns, rows = read_header(path), 0
+            df = pd.read_csv(
+                io.BytesIO(complete), usecols=lambda col: col not in drop_cols
+            )
+        else:
+            columns, rows = watermark["columns"], watermark["rows"]
+            if complete:
+                df = pd.read_csv(
+                    io.BytesIO(complete),
+                    header=None,
+                    names=columns,
+                    usecols=lambda col: col not in drop_cols,
+                )
+            else:
+                df = pd.DataFrame(columns=[c for c in columns if c not in drop_cols])
+        new_watermark = {
+            "offset": end,
+            "rows": rows + len(df),
+            "columns": columns,
+            "head_hash": _head_hash(f, end),
+        }
+    return df, new_watermark, rewritten
+
+
+def _read_shard(path, drop_cols, partition_columns, options=None):
+    # dropped columns are never parsed, and never sent back to the parent process
+    df = pd.read_csv(path, **(options or {"usecols": lambda col: col not in drop_cols}))
+    if partition_columns:
+        for key, value in partition_keys(path).items():
+            df[key] = value
+    return df
 
 
 class LocalFileIngestor(DataIngestor):
@@ -7,22 +107,147 @@ class LocalFileIngestor(DataIngestor):
     Concrete implementation of the DataIngestor abstract class for importing data from a local file.
 
     This class implements the ingest_data method for importing data from a local file using the pandas read_csv function.
+    A directory or glob pattern is read as a sharded dataset: every matching CSV shard is parsed in a process pool
+    and the shards are concatenated once, in path order. Shards under hive style key=value directories can be pruned
+    with filters before anything is read.
+
+    The first read of a file or directory infers a schema, the dtype of every column and the string columns parsed
+    as categoricals, and saves it next to the data (see csv_schema). Later reads hand the schema to read_csv as
+    usecols and dtype, so dropped columns are never materialized and no type inference runs. drop_cols belong to
+    each read rather than to the schema, so the same file can be read with other drop_cols.
+    A schema whose columns no longer match the file's header, or whose dtypes no longer parse the data, such as an
+    integer column that has since gained a missing value, is inferred again and rewritten. Reads with filters only
+    see some of the shards, so they never save a schema.
 
     Attributes:
-        None
+        schema (bool): Read through a schema sidecar, inferring and saving one on the first read.
+        float_dtype (str): dtype float columns are parsed as with a schema, such as 'float32'. None keeps float64.
 
     Methods:
         ingest_data(file_path):
             Imports data from a local file.
-            - file_path: string indicating the path to the local file.
+            - file_path: string or path-like of the local file, a directory of CSV shards or a glob pattern.
+            - drop_cols: columns that are never read.
+            - filters: dict of partition key to an allowed value, a list of allowed values or a predicate.
+            - n_jobs: number of processes used to parse shards. Defaults to the number of cores.
+            - partition_columns: add the partition keys of each shard as columns.
             Returns: pandas DataFrame containing the imported data.
+        get_schema(file_path, paths):
+            Loads the schema sidecar of a source, or None when it is missing or stale.
+        ingest_appended(file_path, watermarks=None):
+            Imports only the rows appended to a file, or to the shards of a directory or glob, since the watermarks.
+            A watermark records the byte offset and row count read so far per path, with a hash of the start of the
+            file, so a file that was rewritten rather than appended to is read again from the start. A file without
+            a complete line yet, such as a new empty shard, gives no rows and a None watermark.
+            - file_path: string or path-like of the local file, a directory of CSV shards or a glob pattern.
+            - watermarks: dict of path to watermark returned by the previous call, or None to read everything.
+            Returns: pandas DataFrame of the new rows, the updated watermarks and the list of rewritten paths.
     """
 
-    def ingest_data(self, file_path, drop_cols=["Unnamed: 0", "api"]):
-        df = pd.read_csv(file_path)
+    def __init__(self, schema=True, float_dtype=None):
+        self.schema = schema
+        self.float_dtype = float_dtype
+
+    def find_shards(self, file_path, filters=None):
+        if os.path.isdir(file_path):
+            paths = glob.glob(os.path.join(file_path, "**", "*.csv"), recursive=True)
+        else:
+            paths = glob.glob(file_path, recursive=True)
+        if filters:
+            paths = [path for path in paths if _matches(partition_keys(path), filters)]
+        return sorted(paths)
+
+    def ingest_shards(
+        self, paths, drop_cols=None, n_jobs=None, partition_columns=False, options=None
+    ):
+        drop_cols = set(drop_cols or [])
+        if not paths:
+            raise ValueError("No CSV shards matched the source and filters.")
+        if n_jobs == 1 or len(paths) == 1:
+            shards = [
+                _read_shard(path, drop_cols, partition_columns, options)
+                for path in paths
+            ]
+        else:
+            with ProcessPoolExecutor(max_workers=n_jobs) as executor:
+                shards = list(
+                    executor.map(
+                        _read_shard,
+                        paths,
+                        [drop_cols] * len(paths),
+                        [partition_columns] * len(paths),
+                        [options] * len(paths),
+                    )
+                )
+        # a single concatenation, so each shard is copied exactly once into the result
+        return pd.concat(shards, ignore_index=True, copy=False)
+
+    def get_schema(self, file_path, paths):
+        return load_schema(schema_path(file_path), read_header(paths[0]))
+
+    def ingest_data(
+        self,
+        file_path,
+        drop_cols=["Unnamed: 0", "api"],
+        filters=None,
+        n_jobs=None,
+        partition_columns=False,
+    ):
+        # a pathlib.Path is read like its string
+        file_path = os.fspath(file_path)
+        if os.path.isdir(file_path) or glob.has_magic(file_path):
+            paths = self.find_shards(file_path, filters)
+        else:
+            paths = [file_path]
+        read = dict(
+            drop_cols=drop_cols, n_jobs=n_jobs, partition_columns=partition_columns
+        )
+        if not self.schema or not paths:
+            return self.ingest_shards(paths, **read)
+
+        schema = self.get_schema(file_path, paths)
+        if schema is not None:
+            options = read_options(schema, drop_cols, self.float_dtype)
+            try:
+                df = self.ingest_shards(paths, options=options, **read)
+            except (ValueError, TypeError):
+                # rows added since the schema was saved no longer parse with its
+                # dtypes, e.g. a missing value in an integer column
+                schema = None
+            else:
+                # shards with different categories concatenate to object columns
+                return df.astype(
+                    {col: "category" for col in schema["categorical"] if col in df}
+                )
+
+        # first or stale read: pandas infers the dtypes once, the schema records them;
+        # every column is read, so a later read with other drop_cols finds its dtype
+        df = self.ingest_shards(paths, **{**read, "drop_cols": None})
+        header = read_header(paths[0])
+        schema = infer_schema(df[[col for col in df.columns if col in header]])
+        path = schema_path(file_path)
+        # a schema inferred from the shards a filter kept may not fit the others
+        if path is not None and not filters:
+            save_schema(schema, path)
+        df = df.drop(columns=[col for col in drop_cols or [] if col in df])
+        return df.astype(read_options(schema, drop_cols, self.float_dtype)["dtype"])
 
-        if drop_cols:
-            for col in drop_cols:
-                if col in df.columns:
-                    df.drop(columns=[col], axis=1, inplace=True)
-        return df
+    def ingest_appended(
+        self, file_path, watermarks=None, drop_cols=["Unnamed: 0", "api"]
+    ):
+        file_path = os.fspath(file_path)
+        watermarks = dict(watermarks or {})
+        if os.path.isdir(file_path) or glob.has_magic(file_path):
+            paths = self.find_shards(file_path)
+        else:
+            paths = [file_path]
+        drop_cols = set(drop_cols or [])
+        frames, rewritten = [], []
+        for path in paths:
+            df, watermarks[path], was_rewritten = _read_appended(
+                path, watermarks.get(path), drop_cols
+            )
+            if was_rewritten:
+                rewritten.append(path)
+            frames.append(df)
+        return pd.concat(frames, ignore_index=True, copy=False), watermarks, rewritten
@@ -1,20 +1,253 @@
+import os
+import time
+import shutil
+import tempfile
+from joblib import Memory
 from nicefitbro.models.factory.model_factory import ModelFactory
 from nicefitbro.models.factory.data_factory import DataFactory
 from nicefitbro.models.tune.tuner import HyperparameterTuner
+from nicefitbro.models.tune.scheduler import BudgetScheduler
+from nicefitbro.models.tune.checkpoint import TuningCheckpoint
+from nicefitbro.models.tune.quick_rank import ProgressiveRanker
+from nicefitbro.models.tune.tpe import TPESearch
 from nicefitbro.models.train.trainer import ModelTrainer
 from nicefitbro.models.evaluate.evaluator import ModelEvaluator
+from nicefitbro.models.select.selector import ModelSelector
+from nicefitbro.models.export.compiled import compile_model, check_equivalence
+from nicefitbro.resources import ResourceBudget
+from nicefitbro.pipeliners.in_fold import count_fits
 
 
 class AutoModel:
-    def __init__(self, data, model_types, target, features=None):
-        self.data_factory = DataFactory(data, target)
-        self.model_factory = ModelFactory(model_types=model_types)
-        self.tuner = HyperparameterTuner(self.data_factory, self.model_factory)
+    def __init__(
+        self,
+        data,
+        model_types,
+        target,
+        features=None,
+        time_budget=None,
+        checkpoint_dir=None,
+        precision="float64",
+        test_size=0.33,
+        random_state=42,
+        quick_rank=False,
+        quick_rank_fractions=(0.01, 0.1),
+        quick_rank_top_k=3,
+        scalability_thresholds=None,
+        measure_latency=False,
+        max_latency_ms=None,
+        max_size_bytes=None,
+        tracker=None,
+        n_bootstrap=0,
+        search="grid",
+        n_trials=30,
+        n_parallel_trials=1,
+        n_cores=None,
+        prep_steps=None,
+    ):
+        if search not in ("grid", "tpe"):
+            raise ValueError("Invalid search. Choose 'grid' or 'tpe'.")
+        self.data_factory = DataFactory(
+            data,
+            target,
+            precision=precision,
+            test_size=test_size,
+            random_state=random_state,
+        )
+        self.scalability_thresholds = scalability_thresholds
+        self.tracker = tracker
+        self.n_bootstrap = n_bootstrap
+        self.random_state = random_state
+        self.search = search
+        self.n_trials = n_trials
+        self.n_parallel_trials = n_parallel_trials
+        self.search_report = {}
+        self.prep_steps = prep_steps or []
+        self.prep_report = {}
+        self.prep_memory = None
+        self.prep_fit_log = None
+        self.temporary_prep_cache = self.prep_steps and not checkpoint_dir
+        if self.prep_steps:
+            # fitted steps are cached by step arguments and fold rows, so each fold's
+            # steps are fitted once for every candidate and model; with a checkpoint
+            # the cache outlives the run
+            location = (
+                os.path.join(checkpoint_dir, "prep_cache")
+                if checkpoint_dir
+                else tempfile.mkdtemp(prefix="nicefitbro_prep_")
+            )
+            self.prep_memory = Memory(location, verbose=0)
+            self.prep_fit_log = os.path.join(location, "fits.log")
+        self.target = target
+        # budgeted and tpe tuning score folds one after another; grid search
+        # spreads its five folds over worker processes
+        sequential_folds = bool(time_budget) or search == "tpe"
+        self.resources = ResourceBudget(
+            n_cores,
+            outer=n_parallel_trials if search == "tpe" and not time_budget else 1,
+            cv=1 if sequential_folds else 5,
+        )
+        self.selector = ModelSelector(
+            max_latency_ms=max_latency_ms, max_size_bytes=max_size_bytes
+        )
+        # a budget can only be checked against measured latencies and sizes
+        self.measure_latency = (
+            measure_latency or max_latency_ms is not None or max_size_bytes is not None
+        )
+        self.selected_model = None
+        self.trained_models = {}
+        self.model_factory = self._build_model_factory(model_types)
+        self.substitutions = self.model_factory.substitutions
+        self.upcast_models = []
+        if precision != "float64":
+            self.upcast_models = [
+                model_type
+                for model_type in self.model_factory.models
+                if model_type not in self.model_factory.float32_models
+            ]
+        self.time_budget = time_budget
+        self.time_accounting = {}
+        self.checkpoint = None
+        if checkpoint_dir:
+            self.checkpoint = TuningCheckpoint(
+                checkpoint_dir, self.data_factory.X_train, self.data_factory.y_train
+            )
+        self.ranker = None
+        if quick_rank:
+            self.ranker = ProgressiveRanker(
+                self.data_factory,
+                self.model_factory,
+                fractions=quick_rank_fractions,
+                top_k=quick_rank_top_k,
+                random_state=random_state,
+            )
+        self.quick_rank_report = {}
+        self.tuner = self._make_tuner(self.model_factory)
+
+    def _build_model_factory(self, model_types):
+        model_factory = ModelFactory(model_types=model_types)
+        # swap models that would not finish on this many rows for approximations
+        model_factory.apply_guardrails(
+            *self.data_factory.X_train.shape,
+            thresholds=self.scalability_thresholds,
+            random_state=self.random_state,
+        )
+        for model in model_factory.models.values():
+            self.resources.configure(model)
+        if self.prep_steps:
+            model_factory.compose_steps(
+                self.prep_steps,
+                self.target,
+                memory=self.prep_memory,
+                fit_log=self.prep_fit_log,
+            )
+        return model_factory
+
+    def _make_tuner(self, model_factory):
+        if self.time_budget:
+            return BudgetScheduler(
+                self.data_factory,
+                model_factory,
+                self.time_budget,
+                checkpoint=self.checkpoint,
+                tracker=self.tracker,
+                resources=self.resources,
+            )
+        if self.search == "tpe":
+            return TPESearch(
+                self.data_factory,
+                model_factory,
+                n_trials=self.n_trials,
+                n_parallel=self.resources.outer,
+                random_state=self.random_state,
+                checkpoint=self.checkpoint,
+                tracker=self.tracker,
+                resources=self.resources,
+            )
+        return HyperparameterTuner(
+            self.data_factory,
+            model_factory,
+            checkpoint=self.checkpoint,
+            tracker=self.tracker,
+            resources=self.resources,
+        )
 
     def auto_model(self):
+        if self.tracker:
+            self.tracker.log_param("resources", self.resources.report)
+        try:
+            with self.resources.limits():
+                return self._auto_model()
+        finally:
+            if self.prep_memory:
+                self._close_prep_cache()
+
+    def _close_prep_cache(self):
+        # the steps log each fit they run, and fits served from the cache run none
+        self.prep_report = {
+            "steps": [type(step).__name__ for _, step in self.prep_steps],
+            "fits": count_fits(self.prep_fit_log),
+        }
+        if os.path.isfile(self.prep_fit_log):
+            # a cache kept with the checkpoint counts the next run's fits afresh
+            os.remove(self.prep_fit_log)
+        if self.temporary_prep_cache:
+            shutil.rmtree(self.prep_memory.location, ignore_errors=True)
+
+    def _auto_model(self):
+        if self.ranker:
+            # only the finalists of the sampled levels are tuned on all of X_train
+            finalists = self.ranker.rank()
+            self.tuner = self._make_tuner(self._build_model_factory(finalists))
+        start = time.perf_counter()
         tuned_models = self.tuner.tune_hyperparameters()
-        mt = ModelTrainer(self.data_factory, tuned_models)
-        trained_models = mt.train_models()
-        me = ModelEvaluator(self.data_factory, trained_models)
+        if self.time_budget:
+            # the scheduler already refit the winners on X_train within the budget
+            trained_models = tuned_models
+            self.time_accounting = self.tuner.time_accounting
+        else:
+            if self.search == "tpe":
+                self.search_report = self.tuner.search_report
+            mt = ModelTrainer(self.data_factory, tuned_models, tracker=self.tracker)
+            trained_models = mt.train_models()
+        if self.ranker:
+            self.quick_rank_report = self.ranker.record_full(
+                time.perf_counter() - start
+            )
+        me = ModelEvaluator(
+            self.data_factory,
+            trained_models,
+            measure_latency=self.measure_latency,
+            tracker=self.tracker,
+            n_bootstrap=self.n_bootstrap,
+        )
         trained_model_performance = me.evaluate_trained_models()
+        for model_name, accounting in self.time_accounting.items():
+            if model_name in trained_model_performance:
+                trained_model_performance[model_name]["seconds"] = accounting["seconds"]
+        for model_name, substitution in self.substitutions.items():
+            if model_name in trained_model_performance:
+                trained_model_performance[model_name]["substitute"] = substitution[
+                    "substitute"
+                ]
+        self.selected_model = self.selector.select(trained_model_performance)
+        self.trained_models = trained_models
         return trained_models, trained_model_performance
+
+    def export_model(self, path, model_name=None):
+        # the selected model by default; the export is refused if the compiled
+        # predictions drift from the original ones on the validation data
+        model_name = model_name or self.selected_model
+        compiled = compile_model(
+            self.trained_models[model_name], self.data_factory.feature_names
+        )
+        report = check_equivalence(
+            self.trained_models[model_name], compiled, self.data_factory.X_val
+        )
+        if not report["equivalent"]:
+            raise ValueError(
+                f"Compiled {model_name} does not match the original model: "
+                f"max abs error {report['max_abs_error']}."
+            )
+        compiled.save(path)
+        return {"model": model_name, "path": path, **report}
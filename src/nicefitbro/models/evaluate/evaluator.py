@@ -1,20 +1,93 @@
+import time
+import pickle
 import numpy as np
-from sklearn.metrics import mean_squared_error, r2_score
+from nicefitbro.models.evaluate.metrics import MetricsEngine
+
+
+def _percentiles_ms(timings_ns):
+    p50, p99 = np.percentile(timings_ns, [50, 99]) / 1e6
+    return p50, p99
 
 
 class ModelEvaluator:
-    def __init__(self, data_factory, trained_models):
+    def __init__(
+        self,
+        data_factory,
+        trained_models,
+        measure_latency=False,
+        n_single=200,
+        batch_size=1000,
+        n_batches=20,
+        tracker=None,
+        n_bootstrap=0,
+        confidence=0.95,
+    ):
         self.trained_models = trained_models
         self.data_factory = data_factory
+        self.measure_latency = measure_latency
+        self.n_single = n_single
+        self.batch_size = batch_size
+        self.n_batches = n_batches
+        self.tracker = tracker
+        self.n_bootstrap = n_bootstrap
+        self.confidence = confidence
+        self.predictions = {}
+        self.confidence_intervals = {}
         self.trained_model_performance = {}
 
+    def _time_predict(self, model, batches):
+        model.predict(batches[0])  # warm up caches and lazy initialisation
+        timings = []
+        for batch in batches:
+            start = time.perf_counter_ns()
+            model.predict(batch)
+            timings.append(time.perf_counter_ns() - start)
+        return timings
+
+    def measure_model(self, model):
+        X_val = self.data_factory.X_val
+        rows = np.arange(self.n_single) % len(X_val)
+        single = self._time_predict(model, [X_val.iloc[[row]] for row in rows])
+        batch_size = min(self.batch_size, len(X_val))
+        batch = self._time_predict(model, [X_val.iloc[:batch_size]] * self.n_batches)
+        single_p50, single_p99 = _percentiles_ms(single)
+        batch_p50, batch_p99 = _percentiles_ms(batch)
+        return {
+            "latency_p50_ms": single_p50,
+            "latency_p99_ms": single_p99,
+            "batch_size": batch_size,
+            "batch_p50_ms": batch_p50,
+            "batch_p99_ms": batch_p99,
+            "rows_per_second": batch_size / (batch_p50 / 1e3),
+            "size_bytes": len(pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)),
+        }
+
     def evaluate_trained_models(self):
         for model_name, model in self.trained_models.items():
-            y_val_pred = model.predict(self.data_factory.X_val)
-            self.trained_model_performance[model_name] = {
-                "R2": r2_score(self.data_factory.y_val, y_val_pred),
-                "RMSE": np.sqrt(
-                    mean_squared_error(self.data_factory.y_val, y_val_pred)
-                ),
-            }
+            self.predictions[model_name] = model.predict(self.data_factory.X_val)
+        if not self.predictions:
+            return self.trained_model_performance
+
+        engine = MetricsEngine(self.data_factory.y_val, self.predictions)
+        self.trained_model_performance = engine.metrics()
+        if self.n_bootstrap:
+            self.confidence_intervals = engine.bootstrap(
+                n_resamples=self.n_bootstrap, confidence=self.confidence
+            )
+            for model_name, intervals in self.confidence_intervals.items():
+                performance = self.trained_model_performance[model_name]
+                for metric in engine.metric_names:
+                    low, high = intervals[metric]
+                    performance[f"{metric}_low"] = low
+                    performance[f"{metric}_high"] = high
+                performance["best_share"] = intervals["best_share"]
+
+        for model_name, model in self.trained_models.items():
+            if self.measure_latency:
+                self.trained_model_performance[model_name].update(
+                    self.measure_model(model)
+                )
+            if self.tracker:
+                for metric, value in self.trained_model_performance[model_name].items():
+                    self.tracker.log_metric(f"{model_name}.{metric}", value)
         return self.trained_model_performance
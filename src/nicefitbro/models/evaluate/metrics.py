@@ -0,0 +1,144 @@
+import numpy as np
+
+# sklearn's mean_absolute_percentage_error floor on |y|
+MAPE_EPSILON = np.finfo(np.float64).eps
+DEFAULT_QUANTILES = (0.1, 0.5, 0.9)
+
+
+class MetricsEngine:
+    """
+    Class for computing regression metrics and bootstrap confidence intervals for many models at once.
+
+    Predictions are cached as one column per model, and every metric is reduced to sums of per-row statistics:
+    squared, absolute, absolute percentage and pinball errors per model, plus the count and the centred target
+    and its square shared by all models. The metrics are ratios of those sums, so R2, RMSE, MAE, MAPE and the
+    quantile losses of every model come out of one pass over the predictions.
+
+    A bootstrap resample only changes how many times each row is counted, so the metrics of a resample are a
+    weighted sum of the same statistics. Rows are split at random into n_buckets buckets whose statistics are summed
+    once; a (n_resamples x n_buckets) resample-index matrix draws buckets with replacement, is turned into counts,
+    and a single matrix product gives the statistics of every resample for every model. Resampling buckets of
+    exchangeable rows gives the same variance for these sums as resampling rows, and with fewer rows than buckets
+    each row is its own bucket. All models see the same resamples, so their intervals and rankings are paired.
+
+    Attributes:
+        y_true (numpy array): Target values.
+        model_names (list): Names of the models, in column order.
+        predictions (numpy array): One column of predictions per model.
+        quantiles (tuple): Quantile levels of the pinball losses.
+
+    Methods:
+        metrics():
+            Returns: dict of model name to a dict of metric name to value.
+        bootstrap(n_resamples=1000, confidence=0.95):
+            Returns: dict of model name to a dict of metric name to (lower, upper), and to best_share, the fraction
+            of resamples in which the model had the best R2. Resamples without any defined R2 count for no model.
+    """
+
+    def __init__(self, y_true, predictions, quantiles=DEFAULT_QUANTILES):
+        self.y_true = np.asarray(y_true, dtype=np.float64)
+        self.model_names = list(predictions)
+        self.predictions = np.column_stack(
+            [
+                np.asarray(predictions[name], dtype=np.float64)
+                for name in self.model_names
+            ]
+        )
+        self.quantiles = tuple(quantiles)
+        self.metric_names = ["R2", "RMSE", "MAE", "MAPE"] + [
+            f"pinball_{q:g}" for q in self.quantiles
+        ]
+        self._statistics = self._row_statistics()
+
+    def _row_statistics(self):
+        # columns: count, centred y, its square, then one block of models per error statistic
+        y = self.y_true
+        y_centred = y - y.mean()
+        errors = y[:, None] - self.predictions
+        absolute = np.abs(errors)
+        blocks = [
+            np.ones((len(y), 1)),
+            y_centred[:, None],
+            y_centred[:, None] ** 2,
+            errors**2,
+            absolute,
+            absolute / np.maximum(np.abs(y), MAPE_EPSILON)[:, None],
+        ]
+        for q in self.quantiles:
+            blocks.append(np.maximum(q * errors, (q - 1) * errors))
+        return np.hstack(blocks)
+
+    def _from_sums(self, sums):
+        # sums: (..., n_statistics) -> dict of metric name to (..., n_models)
+        n_models = len(self.model_names)
+        count = sums[..., 0:1]
+        total_sum_squares = sums[..., 2:3] - sums[..., 1:2] ** 2 / count
+        blocks = [
+            sums[..., 3 + i * n_models : 3 + (i + 1) * n_models]
+            for i in range(3 + len(self.quantiles))
+        ]
+        squared, absolute, percentage = blocks[:3]
+        with np.errstate(divide="ignore", invalid="ignore"):
+            metrics = {
+                "R2": 1 - squared / total_sum_squares,
+                "RMSE": np.sqrt(squared / count),
+                "MAE": absolute / count,
+                "MAPE": percentage / count,
+            }
+        for q, block in zip(self.quantiles, blocks[3:]):
+            metrics[f"pinball_{q:g}"] = block / count
+        return metrics
+
+    def metrics(self):
+        values = self._from_sums(self._statistics.sum(axis=0))
+        return {
+            name: {metric: float(values[metric][i]) for metric in self.metric_names}
+            for i, name in enumerate(self.model_names)
+        }
+
+    def _bucket_statistics(self, n_buckets, rng):
+        n_rows = len(self.y_true)
+        if n_rows <= n_buckets:
+            return self._statistics
+        order = rng.permutation(n_rows)
+        bounds = np.linspace(0, n_rows, n_buckets + 1).astype(np.int64)[:-1]
+        return np.add.reduceat(self._statistics[order], bounds, axis=0)
+
+    def bootstrap(
+        self, n_resamples=1000, confidence=0.95, n_buckets=2000, random_state=42
+    ):
+        rng = np.random.default_rng(random_state)
+        buckets = self._bucket_statistics(n_buckets, rng)
+        n = len(buckets)
+        # resample-index matrix, one row per resample, turned into per-bucket counts
+        resamples = rng.integers(n, size=(n_resamples, n))
+        flat = (resamples + n * np.arange(n_resamples)[:, None]).ravel()
+        counts = np.bincount(flat, minlength=n_resamples * n).reshape(n_resamples, n)
+        values = self._from_sums(counts.astype(np.float64) @ buckets)
+
+        tail = (1 - confidence) / 2 * 100
+        intervals = {
+            metric: np.percentile(values[metric], [tail, 100 - tail], axis=0)
+            for metric in self.metric_names
+        }
+        # a resample whose R2 is undefined for every model, e.g. of a constant target
+        # predicted exactly, has no best model
+        r2 = values["R2"]
+        scored = r2[~np.isnan(r2).all(axis=1)]
+        best = np.bincount(
+            np.nanargmax(scored, axis=1).astype(np.int64),
+            minlength=len(self.model_names),
+        )
+        return {
+            name: {
+                **{
+                    metric: (
+                        float(intervals[metric][0, i]),
+                        float(intervals[metric][1, i]),
+                    )
+                    for metric in self.metric_names
+                },
+                "best_share": float(best[i] / n_resamples),
+            }
+            for i, name in enumerate(self.model_names)
+        }
@@ -0,0 +1,268 @@
+import json
+import numpy as np
+import pandas as pd
+
+FORMAT_VERSION = 1
+
+
+def _sklearn_trees(estimators):
+    trees = []
+    for estimator in estimators:
+        tree = estimator.tree_
+        trees.append(
+            {
+                "left": tree.children_left,
+                "right": tree.children_right,
+                # sklearn trees never see missing values
+                "missing": tree.children_left,
+                "feature": np.where(tree.children_left < 0, -1, tree.feature),
+                "threshold": tree.threshold,
+                "value": tree.value[:, 0, 0],
+            }
+        )
+    return trees
+
+
+def _xgb_trees(model):
+    booster = model.get_booster()
+    learner = json.loads(booster.save_raw(raw_format="json"))["learner"]
+    trees = []
+    for tree in learner["gradient_booster"]["model"]["trees"]:
+        left = np.array(tree["left_children"])
+        right = np.array(tree["right_children"])
+        # conditions are float32 values, written with just enough digits to round trip
+        conditions = np.array(tree["split_conditions"], dtype=np.float32).astype(
+            np.float64
+        )
+        leaf = left < 0
+        trees.append(
+            {
+                "left": left,
+                "right": right,
+                "missing": np.where(np.array(tree["default_left"]) == 1, left, right),
+                "feature": np.where(leaf, -1, tree["split_indices"]),
+                "threshold": conditions,
+                # a leaf's split condition holds its value
+                "value": np.where(leaf, conditions, 0.0),
+            }
+        )
+    base_score = float(learner["learner_model_param"]["base_score"])
+    return trees, base_score
+
+
+def _pack(trees):
+    # one flat array per field, with child indices shifted to the packed positions
+    offsets = np.cumsum([0] + [len(tree["left"]) for tree in trees])
+    arrays = {}
+    for field in ("left", "right", "missing"):
+        arrays[field] = np.concatenate(
+            [
+                np.where(tree[field] < 0, -1, tree[field] + offset)
+                for tree, offset in zip(trees, offsets)
+            ]
+        ).astype(np.int64)
+    arrays["feature"] = np.concatenate([tree["feature"] for tree in trees]).astype(
+        np.int64
+    )
+    arrays["threshold"] = np.concatenate([tree["threshold"] for tree in trees]).astype(
+        np.float64
+    )
+    arrays["value"] = np.concatenate([tree["value"] for tree in trees]).astype(
+        np.float64
+    )
+    arrays["roots"] = offsets[:-1].astype(np.int64)
+    return arrays
+
+
+def compile_model(model, feature_names=None):
+    """Converts a fitted model into a CompiledModel, or raises ValueError when its type is not supported"""
+    # imported here so loading and running a compiled model never imports them
+    from sklearn.dummy import DummyRegressor
+    from sklearn.ensemble import GradientBoostingRegressor, RandomForestRegressor
+    from sklearn.linear_model import (
+        LinearRegression,
+        Ridge,
+        Lasso,
+        ElasticNet,
+        BayesianRidge,
+        SGDRegressor,
+    )
+    from sklearn.pipeline import Pipeline
+    from sklearn.preprocessing import PolynomialFeatures
+    from sklearn.tree import DecisionTreeRegressor
+    import xgboost as xgb
+
+    LINEAR_MODELS = (
+        LinearRegression,
+        Ridge,
+        Lasso,
+        ElasticNet,
+        BayesianRidge,
+        SGDRegressor,
+    )
+    if isinstance(model, LINEAR_MODELS):
+        arrays = {
+            "coef": np.ravel(model.coef_).astype(np.float64),
+            "intercept": np.ravel(model.intercept_).astype(np.float64),
+        }
+        return CompiledModel("linear", arrays, {}, feature_names)
+    if (
+        isinstance(model, Pipeline)
+        and len(model.steps) == 2
+        and isinstance(model.steps[0][1], PolynomialFeatures)
+        and isinstance(model.steps[1][1], LINEAR_MODELS)
+    ):
+        poly, linear = model.steps[0][1], model.steps[1][1]
+        powers = poly.powers_
+        degree = int(powers.sum(axis=1).max())
+        # a term x0**2 * x3 becomes [0, 0, 3]; index n_features points at a column of ones
+        factors = np.full((len(powers), degree), powers.shape[1], dtype=np.int64)
+        for term, exponents in enumerate(powers):
+            indices = np.repeat(np.arange(powers.shape[1]), exponents)
+            factors[term, : len(indices)] = indices
+        arrays = {
+            "factors": factors,
+            "coef": np.ravel(linear.coef_).astype(np.float64),
+            "intercept": np.ravel(linear.intercept_).astype(np.float64),
+        }
+        return CompiledModel("poly", arrays, {}, feature_names)
+    if isinstance(model, DecisionTreeRegressor):
+        meta = {"scale": 1.0, "base": 0.0, "strict": False}
+        return CompiledModel(
+            "trees", _pack(_sklearn_trees([model])), meta, feature_names
+        )
+    if isinstance(model, RandomForestRegressor):
+        meta = {
+            "scale": 1.0 / len(model.estimators_),
+            "base": 0.0,
+            "strict": False,
+        }
+        return CompiledModel(
+            "trees", _pack(_sklearn_trees(model.estimators_)), meta, feature_names
+        )
+    if isinstance(model, GradientBoostingRegressor):
+        if not isinstance(model.init_, DummyRegressor):
+            raise ValueError(
+                "Invalid model for export. Choose a GradientBoostingRegressor with the default init."
+            )
+        meta = {
+            "scale": float(model.learning_rate),
+            "base": float(np.ravel(model.init_.constant_)[0]),
+            "strict": False,
+        }
+        trees = _sklearn_trees(model.estimators_[:, 0])
+        return CompiledModel("trees", _pack(trees), meta, feature_names)
+    if isinstance(model, xgb.XGBRegressor):
+        trees, base_score = _xgb_trees(model)
+        meta = {"scale": 1.0, "base": base_score, "strict": True}
+        return CompiledModel("trees", _pack(trees), meta, feature_names)
+    raise ValueError(
+        f"Invalid model for export: {type(model).__name__}. Choose a linear, poly, "
+        "dtr, rfr, gbr or xgb model."
+    )
+
+
+def check_equivalence(model, compiled, X, rtol=1e-5, atol=1e-6):
+    """Compares the predictions of a model and its compiled form on X"""
+    expected = np.asarray(model.predict(X), dtype=np.float64)
+    actual = compiled.predict(X)
+    errors = np.abs(actual - expected)
+    return {
+        "rows": len(expected),
+        "max_abs_error": float(errors.max()) if len(errors) else 0.0,
+        "equivalent": bool(np.allclose(actual, expected, rtol=rtol, atol=atol)),
+    }
+
+
+class CompiledModel:
+    """
+    Class for running a trained model's predictions from plain NumPy arrays.
+
+    Linear models keep their coefficients, the poly pipeline the features multiplied into each term, and the tree models
+    (DecisionTree, RandomForest, GradientBoosting and XGBoost regressors) are packed into flat node arrays shared by
+    every tree. Prediction walks all trees for all rows at once, one tree level per step, and skips the input
+    validation and per call dispatch of sklearn and xgboost, which dominate single row latency. Comparisons follow
+    the original libraries: inputs are rounded to float32 like the trees saw them in training, sklearn sends
+    x <= threshold left and xgboost sends x < threshold left, with missing values taking xgboost's default branch.
+    A compiled model is saved as a single .npz file and loads without pickle or the original libraries.
+
+    Attributes:
+        kind (str): 'linear', 'poly' or 'trees'.
+        arrays (dict): NumPy arrays of the model.
+        meta (dict): Scalars of the model, such as the tree scale and base score.
+        feature_names (list): Column order of the training data, used to align DataFrame input.
+
+    Methods:
+        predict(X):
+            Returns predictions for a DataFrame or 2D array.
+        save(path):
+            Writes the model to an .npz file.
+        load(path):
+            Reads a model written by save.
+    """
+
+    def __init__(self, kind, arrays, meta, feature_names=None):
+        self.kind = kind
+        self.arrays = arrays
+        self.meta = meta
+        self.feature_names = list(feature_names) if feature_names is not None else None
+
+    def _matrix(self, X):
+        if isinstance(X, pd.DataFrame) and self.feature_names is not None:
+            if list(X.columns) != self.feature_names:
+                X = X[self.feature_names]
+        X = np.asarray(X, dtype=np.float64)
+        return X.reshape(1, -1) if X.ndim == 1 else X
+
+    def _predict_trees(self, X):
+        # both libraries compare the float32 rounding of the inputs
+        X = X.astype(np.float32).astype(np.float64)
+        a = self.arrays
+        n_rows, n_trees = len(X), len(a["roots"])
+        # one entry per (row, tree) still descending; finished ones drop out
+        rows = np.repeat(np.arange(n_rows), n_trees)
+        node = np.tile(a["roots"], n_rows)
+        total = np.zeros(n_rows)
+        while len(node):
+            feature = a["feature"][node]
+            leaf = feature < 0
+            if leaf.any():
+                total += np.bincount(
+                    rows[leaf], weights=a["value"][node[leaf]], minlength=n_rows
+                )
+                rows, node, feature = rows[~leaf], node[~leaf], feature[~leaf]
+            x = X[rows, feature]
+            threshold = a["threshold"][node]
+            go_left = x < threshold if self.meta["strict"] else x <= threshold
+            child = np.where(go_left, a["left"][node], a["right"][node])
+            node = np.where(np.isnan(x), a["missing"][node], child)
+        return self.meta["base"] + self.meta["scale"] * total
+
+    def predict(self, X):
+        X = self._matrix(X)
+        if self.kind == "trees":
+            return self._predict_trees(X)
+        if self.kind == "poly":
+            # each term multiplies the features listed in its row of factors;
+            # the extra column of ones pads lower degree terms
+            ones = np.ones((len(X), 1))
+            X = np.prod(np.hstack([X, ones])[:, self.arrays["factors"]], axis=2)
+        return X @ self.arrays["coef"] + self.arrays["intercept"][0]
+
+    def save(self, path):
+        header = {
+            "version": FORMAT_VERSION,
+            "kind": self.kind,
+            "meta": self.meta,
+            "feature_names": self.feature_names,
+        }
+        np.savez(path, header=np.array(json.dumps(header)), **self.arrays)
+
+    @classmethod
+    def load(cls, path):
+        with np.load(path, allow_pickle=False) as f:
+            header = json.loads(str(f["header"]))
+            if header["version"] != FORMAT_VERSION:
+                raise ValueError(f"Unsupported compiled model version in {path}.")
+            arrays = {name: f[name] for name in f.files if name != "header"}
+        return cls(header["kind"], arrays, header["meta"], header["feature_names"])
@@ -1,16 +1,112 @@
+import numpy as np
+import pandas as pd
 from sklearn.model_selection import train_test_split
+from nicefitbro.precision import PrecisionPolicy
 
 
 class DataFactory:
-    def __init__(self, data, target, features=None):
+    def __init__(
+        self,
+        data,
+        target,
+        features=None,
+        precision="float64",
+        test_size=0.33,
+        random_state=42,
+    ):
         self.features = features
         self.target = target
+        self.policy = PrecisionPolicy(precision)
+        self.test_size = test_size
+        self.random_state = random_state
         if self.features:
-            self.X = data[self.features]
-            self.y = data[self.target]
+            self.feature_names = list(self.features)
         else:
-            self.y = data[self.target]
-            self.X = data.drop(columns=[self.target], axis=1)
-        self.X_train, self.X_val, self.y_train, self.y_val = train_test_split(
-            self.X, self.y, test_size=0.33, random_state=42
+            self.feature_names = [col for col in data.columns if col != self.target]
+
+        # the same split train_test_split would make on the frame, as row positions
+        self.train_index, self.val_index = train_test_split(
+            np.arange(len(data)), test_size=test_size, random_state=random_state
+        )
+        self.n_train = len(self.train_index)
+        order = np.concatenate([self.train_index, self.val_index])
+        self.index = data.index[order]
+
+        # one row-major block of the numeric features with the train rows first, so the
+        # train and validation sets are contiguous views of it and nothing else copies them;
+        # other columns, e.g. categoricals left for in-fold encoding, are kept beside it
+        # rather than turning the whole block into objects
+        self.numeric_names = [
+            col
+            for col in self.feature_names
+            if pd.api.types.is_numeric_dtype(data[col].dtype)
+        ]
+        self.other_names = [
+            col for col in self.feature_names if col not in self.numeric_names
+        ]
+        self.block = np.empty(
+            (len(data), len(self.numeric_names)),
+            dtype=self._block_dtype(data),
+            order="C",
+        )
+        for j, col in enumerate(self.numeric_names):
+            self.block[:, j] = self._numeric_values(data[col])[order]
+        self.other = data[self.other_names].iloc[order]
+        self.targets = self.policy.cast(data[self.target]).to_numpy()[order]
+
+    def _block_dtype(self, data):
+        dtypes = [
+            self.policy.dtype
+            if self.policy.castable(data[col])
+            else self._numeric_values(data[col].iloc[:0]).dtype
+            for col in self.numeric_names
+        ]
+        return np.result_type(self.policy.dtype, *dtypes)
+
+    @staticmethod
+    def _numeric_values(series):
+        # nullable extension columns, e.g. Int64, become float with NaN for missing values
+        if pd.api.types.is_extension_array_dtype(series.dtype):
+            return series.to_numpy(dtype=np.float64, na_value=np.nan)
+        return series.to_numpy()
+
+    def _frame(self, rows):
+        numeric = pd.DataFrame(
+            self.block[rows],
+            columns=self.numeric_names,
+            index=self.index[rows],
+            copy=False,
         )
+        if not self.other_names:
+            return numeric
+        # the non-numeric columns are joined on, which copies the numeric ones
+        other = self.other.iloc[rows].set_axis(numeric.index)
+        return pd.concat([numeric, other], axis=1)[self.feature_names]
+
+    def _series(self, rows):
+        return pd.Series(self.targets[rows], index=self.index[rows], name=self.target)
+
+    @property
+    def X(self):
+        # every row, train rows first, as one frame over the block
+        return self._frame(slice(None))
+
+    @property
+    def y(self):
+        return self._series(slice(None))
+
+    @property
+    def X_train(self):
+        return self._frame(slice(None, self.n_train))
+
+    @property
+    def X_val(self):
+        return self._frame(slice(self.n_train, None))
+
+    @property
+    def y_train(self):
+        return self._series(slice(None, self.n_train))
+
+    @property
+    def y_val(self):
+        return self._series(slice(self.n_train, None))
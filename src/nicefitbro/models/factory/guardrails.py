@@ -0,0 +1,199 @@
+import numpy as np
+from sklearn.base import BaseEstimator, RegressorMixin, TransformerMixin
+from sklearn.pipeline import Pipeline
+from sklearn.kernel_approximation import Nystroem
+from sklearn.linear_model import BayesianRidge, LinearRegression
+from sklearn.neighbors import KNeighborsRegressor
+from sklearn.feature_selection import SelectKBest, f_regression
+from sklearn.preprocessing import PolynomialFeatures
+
+# above these sizes the exact models are swapped for scalable approximations;
+# a threshold of None turns its guardrail off
+DEFAULT_THRESHOLDS = {
+    "gpr_max_rows": 5_000,
+    "knn_max_rows": 50_000,
+    "poly_max_terms": 1_000,
+}
+# KNeighborsRegressor already searches a kd-tree up to this many features,
+# and falls back to brute force above it
+KD_TREE_MAX_FEATURES = 15
+NYSTROEM_COMPONENTS = 500
+
+
+def poly_terms(n_features):
+    """Returns the number of output columns of PolynomialFeatures of degree 2 with a bias"""
+    return (n_features + 1) * (n_features + 2) // 2
+
+
+def estimate_costs(n_rows, n_features):
+    """Returns rough fit time and memory estimates for the models that do not scale linearly"""
+    terms = poly_terms(n_features)
+    return {
+        # exact GP: Cholesky of the n x n kernel matrix
+        "gpr": {"flops": n_rows**3 / 3, "memory_bytes": 8 * n_rows**2},
+        # brute force KNN: every prediction is compared with every training row
+        "knn": {
+            "flops": n_rows**2 * n_features,
+            "memory_bytes": 8 * n_rows * n_features,
+        },
+        # degree 2 expansion, then least squares on the expanded matrix
+        "poly": {"flops": n_rows * terms**2, "memory_bytes": 8 * n_rows * terms},
+    }
+
+
+def _gpr_substitute(n_rows, n_features, random_state):
+    model = Pipeline(
+        [
+            (
+                "nystroem",
+                Nystroem(
+                    kernel="rbf",
+                    n_components=min(NYSTROEM_COMPONENTS, n_rows),
+                    random_state=random_state,
+                ),
+            ),
+            ("bayesridge", BayesianRidge()),
+        ]
+    )
+    # gamma 0.5 is the unit length scale GaussianProcessRegressor starts from
+    return model, {"nystroem__gamma": [0.1, 0.5, 1.0]}, "nystroem_gp"
+
+
+class SampledKNeighborsRegressor(BaseEstimator, RegressorMixin):
+    """
+    Class for a KNN regressor that searches neighbours among a random sample of the training rows.
+
+    Fitting keeps at most max_rows training rows, so every prediction costs at most max_rows distance computations
+    whatever the size of the training data. The neighbours found are the nearest ones within the sample, which
+    approximates the nearest neighbours of the full data.
+
+    Attributes:
+        n_neighbors (int): Number of neighbours averaged per prediction.
+        max_rows (int): Maximum number of training rows searched.
+        random_state (int): Seed of the row sample.
+
+    Methods:
+        fit(X, y):
+            Samples the training rows and indexes them.
+        predict(X):
+            Returns the mean target of the nearest sampled neighbours.
+    """
+
+    def __init__(self, n_neighbors=5, max_rows=50_000, random_state=42):
+        self.n_neighbors = n_neighbors
+        self.max_rows = max_rows
+        self.random_state = random_state
+
+    def fit(self, X, y):
+        X, y = np.asarray(X), np.asarray(y)
+        if len(X) > self.max_rows:
+            rows = np.random.default_rng(self.random_state).choice(
+                len(X), self.max_rows, replace=False
+            )
+            X, y = X[rows], y[rows]
+        self.knn_ = KNeighborsRegressor(n_neighbors=self.n_neighbors).fit(X, y)
+        return self
+
+    def predict(self, X):
+        return self.knn_.predict(np.asarray(X))
+
+
+def _knn_substitute(n_rows, n_features, max_rows, random_state):
+    return (
+        SampledKNeighborsRegressor(max_rows=max_rows, random_state=random_state),
+        {"n_neighbors": [3, 5, 7]},
+        f"sampled_{max_rows}_rows_knn",
+    )
+
+
+class TopKSelector(BaseEstimator, TransformerMixin):
+    """
+    Class for keeping the k features most correlated with the target, or every feature when there are fewer.
+
+    k is chosen from the width of the training data, but in-fold steps in front of the model, such as feature
+    selection, can hand it fewer columns; SelectKBest would then refuse to fit, so k is capped when fitting.
+
+    Attributes:
+        k (int): Maximum number of features kept.
+
+    Methods:
+        fit(X, y):
+            Scores the features with f_regression.
+        transform(X):
+            Returns: X with the kept features.
+    """
+
+    def __init__(self, k=10):
+        self.k = k
+
+    def fit(self, X, y):
+        self.selector_ = SelectKBest(f_regression, k=min(self.k, np.shape(X)[1]))
+        self.selector_.fit(X, y)
+        return self
+
+    def transform(self, X):
+        return self.selector_.transform(X)
+
+
+def _poly_substitute(n_features, max_terms):
+    k = n_features
+    while k > 1 and poly_terms(k) > max_terms:
+        k -= 1
+    model = Pipeline(
+        [
+            ("select", TopKSelector(k=k)),
+            ("poly", PolynomialFeatures(degree=2)),
+            ("linear", LinearRegression()),
+        ]
+    )
+    return model, {}, f"poly_top_{k}_features"
+
+
+def scalable_substitutes(
+    model_types, n_rows, n_features, thresholds=None, random_state=42
+):
+    """Returns the substitute model, grid and report for every model over its threshold, seeded with random_state"""
+    thresholds = {**DEFAULT_THRESHOLDS, **(thresholds or {})}
+    costs = estimate_costs(n_rows, n_features)
+    substitutes = {}
+    for model_type in model_types:
+        if model_type == "gpr" and _over(n_rows, thresholds["gpr_max_rows"]):
+            substitute = _gpr_substitute(n_rows, n_features, random_state)
+            reason = f"{n_rows} rows > gpr_max_rows={thresholds['gpr_max_rows']}"
+        elif (
+            model_type == "knn"
+            and n_features > KD_TREE_MAX_FEATURES
+            and _over(n_rows, thresholds["knn_max_rows"])
+        ):
+            substitute = _knn_substitute(
+                n_rows, n_features, thresholds["knn_max_rows"], random_state
+            )
+            reason = (
+                f"{n_rows} rows > knn_max_rows={thresholds['knn_max_rows']}, "
+                f"brute force search on {n_features} features"
+            )
+        elif model_type == "poly" and _over(
+            poly_terms(n_features), thresholds["poly_max_terms"]
+        ):
+            substitute = _poly_substitute(n_features, thresholds["poly_max_terms"])
+            reason = (
+                f"{poly_terms(n_features)} terms > "
+                f"poly_max_terms={thresholds['poly_max_terms']}"
+            )
+        else:
+            continue
+        model, hyperparameters, name = substitute
+        substitutes[model_type] = {
+            "model": model,
+            "hyperparameters": hyperparameters,
+            "report": {
+                "substitute": name,
+                "reason": reason,
+                "estimate": costs[model_type],
+            },
+        }
+    return substitutes
+
+
+def _over(value, threshold):
+    return threshold is not None and value > threshold
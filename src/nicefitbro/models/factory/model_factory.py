@@ -15,6 +15,8 @@ from sklearn.ensemble import RandomForestRegressor, GradientBoostingRegressor
 import xgboost as xgb
 from sklearn.pipeline import Pipeline
 from sklearn.preprocessing import PolynomialFeatures
+from nicefitbro.models.factory.guardrails import scalable_substitutes
+from nicefitbro.pipeliners.in_fold import MODEL_STEP, compose
 
 
 class ModelFactory:
@@ -52,14 +54,128 @@ class ModelFactory:
             "xgb": {"n_estimators": [50, 100, 150], "max_depth": [3, 5, 7]},
             "poly": {},
         }
+        # wider continuous ranges for model based search; a grid search
+        # over them would grow combinatorially
+        self.search_space_options = {
+            "lr": {},
+            "ridge": {"alpha": ("log", 1e-3, 1e3)},
+            "lasso": {"alpha": ("log", 1e-4, 10.0)},
+            "elastic": {"alpha": ("log", 1e-4, 10.0), "l1_ratio": ("float", 0.05, 1.0)},
+            "bayesridge": {},
+            "sgd": {
+                "loss": ("choice", ["squared_error", "huber"]),
+                "alpha": ("log", 1e-6, 1e-1),
+            },
+            "knn": {
+                "n_neighbors": ("int", 1, 50),
+                "weights": ("choice", ["uniform", "distance"]),
+            },
+            "gpr": {},
+            "dtr": {"max_depth": ("int", 2, 20), "min_samples_leaf": ("int", 1, 50)},
+            "rfr": {
+                "n_estimators": ("int", 20, 300),
+                "max_depth": ("int", 2, 20),
+                "max_features": ("float", 0.2, 1.0),
+            },
+            "gbr": {
+                "n_estimators": ("int", 20, 300),
+                "max_depth": ("int", 2, 8),
+                "learning_rate": ("log", 0.01, 0.3),
+                "subsample": ("float", 0.5, 1.0),
+            },
+            "xgb": {
+                "n_estimators": ("int", 20, 300),
+                "max_depth": ("int", 2, 10),
+                "learning_rate": ("log", 0.01, 0.3),
+                "subsample": ("float", 0.5, 1.0),
+                "colsample_bytree": ("float", 0.5, 1.0),
+            },
+            "poly": {},
+        }
+        # relative cost of a single fit, used to schedule cheap models first
+        self.model_costs = {
+            "lr": 1,
+            "ridge": 1,
+            "lasso": 1,
+            "elastic": 2,
+            "bayesridge": 2,
+            "sgd": 2,
+            "poly": 3,
+            "dtr": 3,
+            "knn": 4,
+            "xgb": 6,
+            "gbr": 8,
+            "rfr": 10,
+            "gpr": 20,
+        }
+        # models that fit float32 input without copying it to float64
+        self.float32_models = {
+            "lr",
+            "ridge",
+            "lasso",
+            "elastic",
+            "bayesridge",
+            "knn",
+            "dtr",
+            "rfr",
+            "gbr",
+            "xgb",
+            "poly",
+        }
         self.models = {}
         self.hyperparameters = {}
+        self.search_spaces = {}
+        self.substitutions = {}
         for model_type in model_types:
             if model_type in self.model_options.keys():
                 self.models[model_type] = self.model_options[model_type]
                 self.hyperparameters[model_type] = self.hyperparameter_options[
                     model_type
                 ]
+                self.search_spaces[model_type] = self.search_space_options[model_type]
 
     def get_models_to_train_and_tune(self):
-        return {"models": self.models, "hyperparameters": self.hyperparameters}
+        return {
+            "models": self.models,
+            "hyperparameters": self.hyperparameters,
+            "search_spaces": self.search_spaces,
+        }
+
+    def get_models_by_cost(self):
+        return sorted(self.models, key=lambda model_type: self.model_costs[model_type])
+
+    def compose_steps(self, steps, target, memory=None, fit_log=None):
+        # every model gets the in-fold steps in front of it, so its hyperparameters
+        # are now those of the pipeline's model step
+        for model_type, model in self.models.items():
+            self.models[model_type] = compose(
+                model, steps, target, memory=memory, fit_log=fit_log
+            )
+            self.hyperparameters[model_type] = {
+                f"{MODEL_STEP}__{name}": values
+                for name, values in self.hyperparameters[model_type].items()
+            }
+            self.search_spaces[model_type] = {
+                f"{MODEL_STEP}__{name}": space
+                for name, space in self.search_spaces[model_type].items()
+            }
+        return self.models
+
+    def apply_guardrails(self, n_rows, n_features, thresholds=None, random_state=42):
+        substitutes = scalable_substitutes(
+            self.models,
+            n_rows,
+            n_features,
+            thresholds=thresholds,
+            random_state=random_state,
+        )
+        for model_type, substitute in substitutes.items():
+            self.models[model_type] = substitute["model"]
+            self.hyperparameters[model_type] = substitute["hyperparameters"]
+            # the substitute is searched over its own small grid
+            self.search_spaces[model_type] = {
+                name: ("choice", values)
+                for name, values in substitute["hyperparameters"].items()
+            }
+            self.substitutions[model_type] = substitute["report"]
+        return self.substitutions
@@ -0,0 +1,71 @@
+# metrics where a higher value is better; every error metric is minimised
+HIGHER_IS_BETTER = {"R2", "best_share"}
+
+
+class ModelSelector:
+    """
+    Class for selecting the most accurate trained model within latency and size budgets.
+
+    Every model whose measured latency or size is over its budget is rejected, with the reasons recorded, and the
+    best of the rest on metric is selected. Error metrics are minimised and R2 and best_share maximised. With no
+    budgets this is the most accurate model, as before budgets existed.
+
+    Attributes:
+        metric (str): Performance metric models are ranked on.
+        max_latency_ms (float): Optional latency budget in milliseconds.
+        max_size_bytes (int): Optional serialized size budget in bytes.
+        latency (str): Latency measurement compared with max_latency_ms, e.g. 'latency_p99_ms'.
+        rejected (dict): Reasons each model was rejected by the last call to select.
+
+    Methods:
+        select(trained_model_performance):
+            Selects a model.
+            - trained_model_performance: dict of performance dicts keyed by model name.
+            Returns: name of the selected model, or None when no model is within the budgets.
+    """
+
+    def __init__(
+        self,
+        metric="R2",
+        max_latency_ms=None,
+        max_size_bytes=None,
+        latency="latency_p99_ms",
+    ):
+        self.metric = metric
+        self.max_latency_ms = max_latency_ms
+        self.max_size_bytes = max_size_bytes
+        self.latency = latency
+        self.rejected = {}
+
+    def _within_budget(self, performance):
+        reasons = []
+        if (
+            self.max_latency_ms is not None
+            and performance[self.latency] > self.max_latency_ms
+        ):
+            reasons.append(f"{self.latency} > {self.max_latency_ms}")
+        if (
+            self.max_size_bytes is not None
+            and performance["size_bytes"] > self.max_size_bytes
+        ):
+            reasons.append(f"size_bytes > {self.max_size_bytes}")
+        return reasons
+
+    def select(self, trained_model_performance):
+        # the most accurate model that fits the latency and size budgets, or
+        # None when no model does
+        self.rejected = {}
+        candidates = []
+        for model_name, performance in trained_model_performance.items():
+            reasons = self._within_budget(performance)
+            if reasons:
+                self.rejected[model_name] = reasons
+            else:
+                candidates.append(model_name)
+        if not candidates:
+            return None
+        sign = 1 if self.metric in HIGHER_IS_BETTER else -1
+        return max(
+            candidates,
+            key=lambda name: sign * trained_model_performance[name][self.metric],
+        )
@@ -1,11 +1,20 @@
+import time
+
+
 class ModelTrainer:
-    def __init__(self, data_factory, tuned_models):
+    def __init__(self, data_factory, tuned_models, tracker=None):
         self.data_factory = data_factory
         self.tuned_models = tuned_models
+        self.tracker = tracker
         self.trained_models = {}
 
     def train_models(self):
         for model_name, model in self.tuned_models.items():
+            start = time.perf_counter()
             model.fit(self.data_factory.X_train, self.data_factory.y_train)
+            if self.tracker:
+                self.tracker.log_metric(
+                    f"{model_name}.train_seconds", time.perf_counter() - start
+                )
         self.trained_models = self.tuned_models
         return self.trained_models
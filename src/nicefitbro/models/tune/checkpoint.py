@@ -0,0 +1,119 @@
+import os
+import json
+import pickle
+import hashlib
+import pandas as pd
+
+
+class TuningCheckpoint:
+    """
+    Class for persisting tuning progress so an interrupted run can be resumed.
+
+    Checkpoints live under checkpoint_dir/<data hash>/<model name>-<search space hash>/. Every scored candidate is
+    added to scores.json as soon as its cross validation finishes, and the refit winner is pickled to model.pkl once
+    the model is done. A sequential search, such as TPESearch, instead stores its trials and random state in
+    trials.json after every batch. A rerun on the same training data and search space reuses all of them, so only
+    unfinished work is repeated. Files are written to a temporary name and renamed, so a crash never leaves a half written checkpoint.
+
+    Attributes:
+        checkpoint_dir (str): Root directory of the checkpoints.
+        data_hash (str): Hash of the training data and cross validation setup.
+
+    Methods:
+        get_score(model_name, model, hyperparameters, params):
+            Returns the stored cross validation score of a candidate, or None.
+        save_score(model_name, model, hyperparameters, params, score):
+            Stores the cross validation score of a candidate.
+        get_model(model_name, model, hyperparameters):
+            Returns the stored tuned model, or None.
+        save_model(model_name, model, hyperparameters, tuned_model):
+            Stores the tuned model.
+        get_trials(model_name, model, hyperparameters):
+            Returns the stored search state, or None.
+        save_trials(model_name, model, hyperparameters, state):
+            Stores the search state, a JSON serializable dict.
+    """
+
+    def __init__(self, checkpoint_dir, X, y, cv=5):
+        self.checkpoint_dir = checkpoint_dir
+        self.data_hash = self.hash_data(X, y, cv)
+        self._scores = {}
+
+    @staticmethod
+    def hash_data(X, y, cv):
+        digest = hashlib.sha256()
+        digest.update(repr(list(X.columns)).encode())
+        digest.update(pd.util.hash_pandas_object(X).values.tobytes())
+        digest.update(pd.util.hash_pandas_object(y).values.tobytes())
+        digest.update(repr(cv).encode())
+        return digest.hexdigest()[:16]
+
+    @staticmethod
+    def _params_key(params):
+        return json.dumps(params, sort_keys=True, default=repr)
+
+    def _model_dir(self, model_name, model, hyperparameters):
+        search_space = repr(sorted(model.get_params(deep=False).items()))
+        search_space += self._params_key(hyperparameters)
+        space_hash = hashlib.sha256(search_space.encode()).hexdigest()[:16]
+        return os.path.join(
+            self.checkpoint_dir, self.data_hash, f"{model_name}-{space_hash}"
+        )
+
+    @staticmethod
+    def _write(path, content, mode="w"):
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, mode) as f:
+            f.write(content)
+        os.replace(tmp_path, path)
+
+    def _load_scores(self, model_dir):
+        if model_dir not in self._scores:
+            path = os.path.join(model_dir, "scores.json")
+            if os.path.exists(path):
+                with open(path) as f:
+                    self._scores[model_dir] = json.load(f)
+            else:
+                self._scores[model_dir] = {}
+        return self._scores[model_dir]
+
+    def get_score(self, model_name, model, hyperparameters, params):
+        model_dir = self._model_dir(model_name, model, hyperparameters)
+        return self._load_scores(model_dir).get(self._params_key(params))
+
+    def save_score(self, model_name, model, hyperparameters, params, score):
+        model_dir = self._model_dir(model_name, model, hyperparameters)
+        scores = self._load_scores(model_dir)
+        scores[self._params_key(params)] = float(score)
+        self._write(os.path.join(model_dir, "scores.json"), json.dumps(scores))
+
+    def get_model(self, model_name, model, hyperparameters):
+        path = os.path.join(
+            self._model_dir(model_name, model, hyperparameters), "model.pkl"
+        )
+        if not os.path.exists(path):
+            return None
+        with open(path, "rb") as f:
+            return pickle.load(f)
+
+    def save_model(self, model_name, model, hyperparameters, tuned_model):
+        path = os.path.join(
+            self._model_dir(model_name, model, hyperparameters), "model.pkl"
+        )
+        self._write(path, pickle.dumps(tuned_model), mode="wb")
+
+    def get_trials(self, model_name, model, hyperparameters):
+        path = os.path.join(
+            self._model_dir(model_name, model, hyperparameters), "trials.json"
+        )
+        if not os.path.exists(path):
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def save_trials(self, model_name, model, hyperparameters, state):
+        path = os.path.join(
+            self._model_dir(model_name, model, hyperparameters), "trials.json"
+        )
+        self._write(path, json.dumps(state))
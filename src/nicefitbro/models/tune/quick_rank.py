@@ -0,0 +1,163 @@
+import time
+import numpy as np
+import pandas as pd
+from scipy.stats import kendalltau
+from sklearn.base import clone
+from sklearn.model_selection import GridSearchCV, cross_val_score, train_test_split
+
+
+def stratified_sample(y, size, n_bins=10, random_state=42):
+    """Returns positions of a sample of y stratified on quantile bins of the target"""
+    bins = pd.qcut(pd.Series(np.asarray(y)), q=n_bins, labels=False, duplicates="drop")
+    positions = np.arange(len(y))
+    if size >= len(y):
+        return positions
+    counts = bins.value_counts()
+    # train_test_split needs every stratum represented at least twice, and at least once
+    # in both the sample and the rows left out; a sample of nearly every row is drawn
+    # unstratified, as it covers the whole range of the target anyway
+    stratify = (
+        bins.to_numpy()
+        if counts.min() >= 2 and min(size, len(y) - size) >= len(counts)
+        else None
+    )
+    sample, _ = train_test_split(
+        positions, train_size=size, stratify=stratify, random_state=random_state
+    )
+    return np.sort(sample)
+
+
+class ProgressiveRanker:
+    """
+    Class for ranking model families on growing samples of the training data.
+
+    Every requested model is tuned on a small stratified sample of X_train, and only the best top_k families move
+    on to the next, larger sample. The target is stratified on its quantiles, so each sample covers the whole range
+    of the target. The survivors of the last level are the finalists, to be tuned on the full training data. The
+    report records the scores and ranking at every level, how stable the ranking was between consecutive levels
+    (Kendall tau over the models ranked at both, and whether the leader changed), and the seconds spent per level.
+
+    Attributes:
+        data_factory (DataFactory): Train/validation data.
+        model_factory (ModelFactory): Models and hyperparameter grids to rank.
+        fractions (tuple): Increasing fractions of X_train to rank on.
+        top_k (int): Number of families kept after each level.
+        cv (int): Number of cross validation folds used on each sample.
+        min_rows (int): Smallest sample size used, whatever the fraction.
+        random_state (int): Seed of the stratified samples.
+        report (dict): Levels, ranking stability and timings of the last call to rank.
+
+    Methods:
+        rank():
+            Runs every level.
+            Returns: list of finalist model names, best first.
+        record_full(seconds):
+            Adds the time of the full data tuning of the finalists to the report, with the estimated time saved.
+    """
+
+    def __init__(
+        self,
+        data_factory,
+        model_factory,
+        fractions=(0.01, 0.1),
+        top_k=3,
+        cv=5,
+        min_rows=200,
+        random_state=42,
+    ):
+        if list(fractions) != sorted(fractions) or not all(
+            0 < fraction < 1 for fraction in fractions
+        ):
+            raise ValueError(
+                "Invalid fractions. Choose increasing fractions between 0 and 1."
+            )
+        self.data_factory = data_factory
+        self.model_factory = model_factory
+        self.fractions = fractions
+        self.top_k = top_k
+        self.cv = cv
+        self.min_rows = min_rows
+        self.random_state = random_state
+        self.report = {}
+
+    def _score(self, model, hyperparameters, X, y):
+        if hyperparameters:
+            grid_search = GridSearchCV(model, hyperparameters, cv=self.cv)
+            grid_search.fit(X, y)
+            score = grid_search.best_score_
+        else:
+            score = np.mean(cross_val_score(clone(model), X, y, cv=self.cv))
+        return float(np.nan_to_num(score, nan=-np.inf))
+
+    def rank(self):
+        models = self.model_factory.get_models_to_train_and_tune()
+        X, y = self.data_factory.X_train, self.data_factory.y_train
+        survivors = list(models["models"])
+        levels = []
+        for fraction in self.fractions:
+            size = max(int(fraction * len(y)), self.min_rows)
+            positions = stratified_sample(y, size, random_state=self.random_state)
+            X_sample, y_sample = X.iloc[positions], y.iloc[positions]
+            scores, seconds = {}, {}
+            for model_name in survivors:
+                start = time.perf_counter()
+                scores[model_name] = self._score(
+                    models["models"][model_name],
+                    models["hyperparameters"][model_name],
+                    X_sample,
+                    y_sample,
+                )
+                seconds[model_name] = time.perf_counter() - start
+            ranking = sorted(survivors, key=lambda name: -scores[name])
+            levels.append(
+                {
+                    "fraction": fraction,
+                    "rows": len(positions),
+                    "scores": scores,
+                    "ranking": ranking,
+                    "seconds": seconds,
+                }
+            )
+            survivors = ranking[: self.top_k]
+
+        self.report = {
+            "levels": levels,
+            "finalists": survivors,
+            "stability": [
+                self._stability(previous, current)
+                for previous, current in zip(levels, levels[1:])
+            ],
+            "rank_seconds": sum(sum(level["seconds"].values()) for level in levels),
+        }
+        return survivors
+
+    def _stability(self, previous, current):
+        common = current["ranking"]
+        previous_ranks = [previous["ranking"].index(name) for name in common]
+        tau = (
+            kendalltau(previous_ranks, range(len(common)))[0]
+            if len(common) > 1
+            else 1.0
+        )
+        return {
+            "fractions": (previous["fraction"], current["fraction"]),
+            "kendall_tau": float(np.nan_to_num(tau, nan=1.0)),
+            "same_leader": previous["ranking"][0] == current["ranking"][0],
+        }
+
+    def record_full(self, seconds):
+        n_train = len(self.data_factory.y_train)
+        # a family dropped at a level would have cost about its last sampled
+        # tuning time scaled linearly up to the full training set; fixed per
+        # fit overhead makes this an overestimate on small samples
+        estimated = seconds
+        for level in self.report["levels"]:
+            dropped = set(level["ranking"][self.top_k :])
+            estimated += sum(
+                level["seconds"][name] * n_train / level["rows"] for name in dropped
+            )
+        self.report["full_seconds"] = seconds
+        self.report["total_seconds"] = self.report["rank_seconds"] + seconds
+        self.report["estimated_exhaustive_seconds"] = estimated
+        self.report["seconds_saved"] = estimated - self.report["total_seconds"]
+        return self.report
@@ -0,0 +1,221 @@
+import time
+import multiprocessing
+import numpy as np
+from sklearn.base import clone
+from sklearn.model_selection import ParameterGrid, cross_val_score
+from nicefitbro.resources import limit_threads
+
+# training data handed to the worker process once, when the pool starts
+_worker_data = {}
+
+
+def _init_worker(X, y, threads=None):
+    _worker_data["X"] = X
+    _worker_data["y"] = y
+    if threads:
+        limit_threads(threads)
+
+
+def _score_candidate(model, params, cv):
+    estimator = clone(model).set_params(**params)
+    scores = cross_val_score(estimator, _worker_data["X"], _worker_data["y"], cv=cv)
+    return np.mean(scores)
+
+
+def _refit_candidate(model, params):
+    estimator = clone(model).set_params(**params)
+    estimator.fit(_worker_data["X"], _worker_data["y"])
+    return estimator
+
+
+class BudgetScheduler:
+    """
+    Class for tuning models within a global wall-clock budget.
+
+    Models are visited from cheapest to most expensive. Each model is given an even share of the budget that is
+    left when it starts, so time not used by cheap models rolls over to the expensive ones. Every candidate fit runs
+    in a worker process and is cancelled when it runs past the model's share; the model then keeps the best
+    candidate scored so far. The winning candidate is refit on the training data inside the same worker, within
+    the time left for the whole run, and a refit still running at the end of the budget, even that of a model with
+    a single candidate, is cancelled and the model recorded as timed out.
+
+    Attributes:
+        data_factory (DataFactory): Train/validation data.
+        model_factory (ModelFactory): Models and hyperparameter grids to tune.
+        time_budget (float): Total number of seconds available for tuning.
+        cv (int): Number of cross validation folds used to score each candidate.
+        checkpoint (TuningCheckpoint): Optional store of finished candidates and models to resume from.
+        tracker (ExperimentTracker): Optional tracker the candidate scores and fit times are sent to.
+        resources (ResourceBudget): Optional thread cap of the worker process.
+        time_accounting (dict): Seconds spent, candidates scored and final status per model.
+
+    Methods:
+        tune_hyperparameters():
+            Tunes as many models as the budget allows.
+            Returns: dict of fitted models keyed by model name.
+    """
+
+    def __init__(
+        self,
+        data_factory,
+        model_factory,
+        time_budget,
+        cv=5,
+        checkpoint=None,
+        tracker=None,
+        resources=None,
+    ):
+        self.data_factory = data_factory
+        self.model_factory = model_factory
+        self.models_to_train_and_tune = model_factory.get_models_to_train_and_tune()
+        self.time_budget = time_budget
+        self.cv = cv
+        self.checkpoint = checkpoint
+        self.tracker = tracker
+        self.resources = resources
+        self.tuned_models = {}
+        self.time_accounting = {}
+        self._pool = None
+
+    def _get_pool(self):
+        if self._pool is None:
+            self._pool = multiprocessing.Pool(
+                1,
+                initializer=_init_worker,
+                initargs=(
+                    self.data_factory.X_train,
+                    self.data_factory.y_train,
+                    self.resources.threads if self.resources else None,
+                ),
+            )
+        return self._pool
+
+    def _cancel(self):
+        # the only way to stop a running fit is to kill the process running it
+        self._pool.terminate()
+        self._pool.join()
+        self._pool = None
+
+    def _run(self, func, args, deadline):
+        timeout = deadline - time.monotonic()
+        if timeout <= 0:
+            raise multiprocessing.TimeoutError
+        result = self._get_pool().apply_async(func, args)
+        try:
+            return result.get(timeout=timeout)
+        except multiprocessing.TimeoutError:
+            self._cancel()
+            raise
+
+    def _tune_model(
+        self, model_name, model, hyperparameters, model_deadline, run_deadline
+    ):
+        candidates = list(ParameterGrid(hyperparameters))
+        best_params, best_score = None, -np.inf
+        scored = 0
+        status = "complete"
+
+        if len(candidates) == 1:
+            best_params = candidates[0]
+        else:
+            for step, params in enumerate(candidates):
+                score = None
+                start = time.monotonic()
+                if self.checkpoint:
+                    score = self.checkpoint.get_score(
+                        model_name, model, hyperparameters, params
+                    )
+                if score is None:
+                    try:
+                        score = self._run(
+                            _score_candidate, (model, params, self.cv), model_deadline
+                        )
+                    except multiprocessing.TimeoutError:
+                        status = "partial" if best_params is not None else "timed_out"
+                        break
+                    if self.checkpoint:
+                        self.checkpoint.save_score(
+                            model_name, model, hyperparameters, params, score
+                        )
+                scored += 1
+                if self.tracker:
+                    self.tracker.log_candidate(
+                        model_name, step, params, score, time.monotonic() - start
+                    )
+                score = np.nan_to_num(score, nan=-np.inf)
+                if best_params is None or score > best_score:
+                    best_params, best_score = params, score
+
+        fitted = None
+        if best_params is not None:
+            # the refit may borrow from the time left for the models after this one
+            try:
+                fitted = self._run(_refit_candidate, (model, best_params), run_deadline)
+            except multiprocessing.TimeoutError:
+                status = "timed_out"
+
+        if self.checkpoint and status == "complete":
+            self.checkpoint.save_model(model_name, model, hyperparameters, fitted)
+
+        return fitted, {
+            "candidates_scored": scored,
+            "candidates_total": len(candidates),
+            "best_params": best_params,
+            "status": status,
+        }
+
+    def tune_hyperparameters(self):
+        start = time.monotonic()
+        run_deadline = start + self.time_budget
+        model_names = self.model_factory.get_models_by_cost()
+
+        try:
+            for i, model_name in enumerate(model_names):
+                model_start = time.monotonic()
+                share = (run_deadline - model_start) / (len(model_names) - i)
+                model = self.models_to_train_and_tune["models"][model_name]
+                hyperparameters = self.models_to_train_and_tune["hyperparameters"][
+                    model_name
+                ]
+
+                fitted = None
+                if self.checkpoint:
+                    fitted = self.checkpoint.get_model(
+                        model_name, model, hyperparameters
+                    )
+
+                if fitted is not None:
+                    accounting = {
+                        "candidates_scored": 0,
+                        "candidates_total": len(ParameterGrid(hyperparameters)),
+                        "best_params": None,
+                        "status": "checkpoint",
+                    }
+                elif share <= 0:
+                    fitted, accounting = None, {
+                        "candidates_scored": 0,
+                        "candidates_total": len(ParameterGrid(hyperparameters)),
+                        "best_params": None,
+                        "status": "skipped",
+                    }
+                else:
+                    fitted, accounting = self._tune_model(
+                        model_name,
+                        model,
+                        hyperparameters,
+                        model_start + share,
+                        run_deadline,
+                    )
+
+                accounting["budget"] = max(share, 0)
+                accounting["seconds"] = time.monotonic() - model_start
+                self.time_accounting[model_name] = accounting
+                if fitted is not None:
+                    self.tuned_models[model_name] = fitted
+        finally:
+            if self._pool is not None:
+                self._pool.close()
+                self._pool.join()
+                self._pool = None
+
+        return self.tuned_models
@@ -0,0 +1,346 @@
+import math
+import time
+import numpy as np
+from joblib import Parallel, delayed
+from scipy.stats import norm
+from sklearn.base import clone
+from sklearn.model_selection import KFold, ParameterGrid
+from nicefitbro.resources import ResourceBudget
+
+# a search space maps each hyperparameter to one of
+# ("float", low, high), ("log", low, high), ("int", low, high) or ("choice", [values])
+SEARCH_KINDS = ("float", "log", "int", "choice")
+
+
+def _check_spec(name, spec):
+    if spec[0] not in SEARCH_KINDS:
+        raise ValueError(
+            f"Invalid search space for {name}: {spec}. Choose one of {SEARCH_KINDS}."
+        )
+
+
+def _bounds(spec):
+    kind, low, high = spec
+    if kind == "log":
+        return math.log(low), math.log(high)
+    if kind == "int":
+        # every integer gets an equal share of the range once rounded
+        return low - 0.5, high + 0.5
+    return low, high
+
+
+def _encode(spec, value):
+    if spec[0] == "choice":
+        return spec[1].index(value)
+    if spec[0] == "log":
+        return math.log(value)
+    return float(value)
+
+
+def _decode(spec, x):
+    if spec[0] == "choice":
+        return spec[1][int(x)]
+    if spec[0] == "log":
+        return float(min(max(math.exp(x), spec[1]), spec[2]))
+    if spec[0] == "int":
+        return int(min(max(round(x), spec[1]), spec[2]))
+    return float(min(max(x, spec[1]), spec[2]))
+
+
+def _finite_grid(space):
+    """Returns every candidate of a space made only of choices, or None"""
+    if not all(spec[0] == "choice" for spec in space.values()):
+        return None
+    return list(ParameterGrid({name: spec[1] for name, spec in space.items()}))
+
+
+class _ParzenEstimator:
+    # mixture of normals truncated to [low, high], one per observation plus a
+    # wide prior centred on the range so unexplored values keep some density
+
+    def __init__(self, observations, low, high):
+        span = high - low
+        n = len(observations)
+        observations = np.sort(np.asarray(observations, dtype=np.float64))
+        # each observation is as wide as the larger gap to its neighbours,
+        # kept between span / (n + 1) and the whole span
+        edges = np.concatenate([[low], observations, [high]])
+        gaps = np.diff(edges)
+        sigma = np.clip(np.maximum(gaps[:-1], gaps[1:]), span / min(100, n + 1), span)
+        self.mu = np.append(observations, (low + high) / 2)
+        self.sigma = np.append(sigma, span)
+        self.weights = np.full(n + 1, 1.0 / (n + 1))
+        self.low, self.high = low, high
+        self.cdf_low = norm.cdf((low - self.mu) / self.sigma)
+        self.cdf_high = norm.cdf((high - self.mu) / self.sigma)
+
+    def sample(self, rng, size):
+        component = rng.choice(len(self.mu), size=size, p=self.weights)
+        u = rng.uniform(self.cdf_low[component], self.cdf_high[component])
+        x = self.mu[component] + self.sigma[component] * norm.ppf(u)
+        return np.clip(x, self.low, self.high)
+
+    def log_pdf(self, x):
+        z = (x[:, None] - self.mu) / self.sigma
+        mass = self.cdf_high - self.cdf_low
+        pdf = self.weights * norm.pdf(z) / (self.sigma * mass)
+        return np.log(pdf.sum(axis=1) + 1e-300)
+
+
+def _run_trial(model, params, X, y, folds, cutoffs):
+    # fits one fold at a time; once the running mean score falls below the
+    # median of earlier trials at the same fold the trial is pruned
+    start = time.perf_counter()
+    estimator = clone(model).set_params(**params)
+    scores = []
+    for step, (train, test) in enumerate(folds):
+        try:
+            fold_estimator = clone(estimator).fit(X.iloc[train], y.iloc[train])
+            scores.append(fold_estimator.score(X.iloc[test], y.iloc[test]))
+        except Exception:
+            # same as cross_val_score's error_score=np.nan
+            scores.append(np.nan)
+        running = np.nan_to_num(np.mean(scores), nan=-np.inf)
+        if cutoffs is not None and step < len(folds) - 1 and running < cutoffs[step]:
+            return scores, True, time.perf_counter() - start
+    return scores, False, time.perf_counter() - start
+
+
+class TPESearch:
+    """
+    Class for tuning models with a Tree-structured Parzen Estimator search over continuous and discrete ranges.
+
+    Every model gets a fixed budget of n_trials candidates drawn from its search space in the model factory, where
+    a hyperparameter is a float, log scaled float or integer range, or a list of choices. The first n_startup_trials
+    candidates are drawn at random. After that the finished trials are split into the best gamma fraction and the
+    rest, a Parzen estimator is fitted to each group per hyperparameter, and the candidate with the highest ratio of
+    good to bad density among n_candidates draws from the good estimator is tried next. Spaces made only of choices
+    with at most n_trials combinations are searched exhaustively instead.
+
+    Each trial is cross validated one fold at a time on the same folds. Once n_startup_trials trials have finished,
+    a trial whose running mean score falls below the median running mean of the finished trials at the same fold is
+    pruned, so hopeless candidates stop after a fold or two instead of five. Trials run n_parallel at a time, each
+    batch proposed from the trials finished before it. The best trial is refit on X_train, so the tuned models are
+    the same as HyperparameterTuner's.
+
+    Attributes:
+        data_factory (DataFactory): Train/validation data.
+        model_factory (ModelFactory): Models and search spaces to tune.
+        n_trials (int): Number of candidates tried per model.
+        cv (int): Number of cross validation folds.
+        n_startup_trials (int): Random trials before the search and the pruning start.
+        gamma (float): Fraction of the finished trials treated as good.
+        n_candidates (int): Draws from the good estimator scored per proposal.
+        prune (bool): Whether to prune trials on their intermediate fold scores.
+        n_parallel (int): Number of trials run at the same time.
+        random_state (int): Seed of the random draws.
+        checkpoint (TuningCheckpoint): Optional store of trials and tuned models to resume from. The trials are
+            saved after every batch, so a rerun continues the search where it stopped, and one with a larger
+            n_trials carries on from the trials already run.
+        tracker (ExperimentTracker): Optional tracker the trial scores and fit times are sent to.
+        resources (ResourceBudget): Thread cap of the processes running the trials.
+        trials (dict): Params, fold scores, pruned flag and seconds of every trial, per model.
+        search_report (dict): Trials, pruned trials, fits spent and best score per model.
+
+    Methods:
+        tune_hyperparameters():
+            Tunes every model.
+            Returns: dict of fitted models keyed by model name.
+    """
+
+    def __init__(
+        self,
+        data_factory,
+        model_factory,
+        n_trials=30,
+        cv=5,
+        n_startup_trials=8,
+        gamma=0.25,
+        n_candidates=24,
+        prune=True,
+        n_parallel=1,
+        random_state=42,
+        checkpoint=None,
+        tracker=None,
+        resources=None,
+    ):
+        self.data_factory = data_factory
+        self.model_factory = model_factory
+        self.models_to_train_and_tune = model_factory.get_models_to_train_and_tune()
+        self.n_trials = n_trials
+        self.cv = cv
+        self.n_startup_trials = n_startup_trials
+        self.gamma = gamma
+        self.n_candidates = n_candidates
+        self.prune = prune
+        self.n_parallel = n_parallel
+        self.random_state = random_state
+        self.checkpoint = checkpoint
+        self.tracker = tracker
+        self.resources = resources or ResourceBudget(outer=n_parallel)
+        self.tuned_models = {}
+        self.trials = {}
+        self.search_report = {}
+
+    def _random(self, space, rng):
+        params = {}
+        for name, spec in space.items():
+            if spec[0] == "choice":
+                params[name] = spec[1][rng.integers(len(spec[1]))]
+            else:
+                params[name] = _decode(spec, rng.uniform(*_bounds(spec)))
+        return params
+
+    def _suggest(self, space, trials, rng):
+        finished = [trial for trial in trials if not trial["pruned"]]
+        if len(trials) < self.n_startup_trials or not finished:
+            return self._random(space, rng)
+        finished.sort(key=lambda trial: -trial["score"])
+        n_good = max(1, math.ceil(self.gamma * len(finished)))
+        good = finished[:n_good]
+        # pruned trials were below the median, so they count as bad
+        bad = finished[n_good:] + [trial for trial in trials if trial["pruned"]]
+        params = {}
+        for name, spec in space.items():
+            good_x = [_encode(spec, trial["params"][name]) for trial in good]
+            bad_x = [_encode(spec, trial["params"][name]) for trial in bad]
+            if spec[0] == "choice":
+                n = len(spec[1])
+                l = np.bincount(good_x, minlength=n) + 1.0
+                g = np.bincount(np.asarray(bad_x, dtype=np.int64), minlength=n) + 1.0
+                l, g = l / l.sum(), g / g.sum()
+                candidates = rng.choice(n, size=self.n_candidates, p=l)
+                ratio = np.log(l[candidates]) - np.log(g[candidates])
+            else:
+                low, high = _bounds(spec)
+                l = _ParzenEstimator(good_x, low, high)
+                g = _ParzenEstimator(bad_x, low, high)
+                candidates = l.sample(rng, self.n_candidates)
+                ratio = l.log_pdf(candidates) - g.log_pdf(candidates)
+            params[name] = _decode(spec, candidates[np.argmax(ratio)])
+        return params
+
+    def _cutoffs(self, trials):
+        finished = [trial for trial in trials if not trial["pruned"]]
+        if not self.prune or len(finished) < self.n_startup_trials:
+            return None
+        running = np.nan_to_num(
+            [
+                np.cumsum(trial["scores"]) / np.arange(1, self.cv + 1)
+                for trial in finished
+            ],
+            nan=-np.inf,
+        )
+        return np.median(running, axis=0)
+
+    def _checkpoint_key(self, space, **budget):
+        # everything that decides which trials are run; the tuned model also depends on
+        # n_trials, while the trials run so far do not
+        return {
+            "search_space": space,
+            "n_startup_trials": self.n_startup_trials,
+            "gamma": self.gamma,
+            "n_candidates": self.n_candidates,
+            "prune": self.prune,
+            "n_parallel": self.n_parallel,
+            "random_state": self.random_state,
+            **budget,
+        }
+
+    def _search(self, model_name, model, space):
+        for name, spec in space.items():
+            _check_spec(name, spec)
+        rng = np.random.default_rng(self.random_state)
+        X, y = self.data_factory.X_train, self.data_factory.y_train
+        folds = list(KFold(self.cv).split(X))
+        grid = _finite_grid(space)
+        exhaustive = grid is not None and len(grid) <= self.n_trials
+        n_trials = len(grid) if exhaustive else self.n_trials
+
+        trials = []
+        trials_key = self._checkpoint_key(space, exhaustive=exhaustive)
+        state = (
+            self.checkpoint.get_trials(model_name, model, trials_key)
+            if self.checkpoint
+            else None
+        )
+        if state:
+            # the random state is that after the stored trials, so continuing gives
+            # the trials a single run with this n_trials would have
+            trials = state["trials"][:n_trials]
+            rng.bit_generator.state = state["rng"]
+        resumed = len(trials)
+        with self.resources.workers(), Parallel(n_jobs=self.n_parallel) as parallel:
+            while len(trials) < n_trials:
+                batch = min(self.n_parallel, n_trials - len(trials))
+                if exhaustive:
+                    proposals = grid[len(trials) : len(trials) + batch]
+                else:
+                    proposals = [
+                        self._suggest(space, trials, rng) for _ in range(batch)
+                    ]
+                cutoffs = self._cutoffs(trials)
+                results = parallel(
+                    delayed(_run_trial)(model, params, X, y, folds, cutoffs)
+                    for params in proposals
+                )
+                for params, (scores, pruned, seconds) in zip(proposals, results):
+                    score = float(np.nan_to_num(np.mean(scores), nan=-np.inf))
+                    if self.tracker and not pruned:
+                        self.tracker.log_candidate(
+                            model_name, len(trials), params, score, seconds
+                        )
+                    trials.append(
+                        {
+                            "params": params,
+                            "scores": scores,
+                            "score": score,
+                            "pruned": pruned,
+                            "seconds": seconds,
+                        }
+                    )
+                if self.checkpoint:
+                    self.checkpoint.save_trials(
+                        model_name,
+                        model,
+                        trials_key,
+                        {"trials": trials, "rng": rng.bit_generator.state},
+                    )
+
+        finished = [trial for trial in trials if not trial["pruned"]]
+        best = max(finished, key=lambda trial: trial["score"])
+        self.trials[model_name] = trials
+        self.search_report[model_name] = {
+            "trials": len(trials),
+            "resumed": resumed,
+            "pruned": len(trials) - len(finished),
+            # every fold fitted plus the refit of the winner
+            "fits": sum(len(trial["scores"]) for trial in trials) + 1,
+            "best_params": best["params"],
+            "best_score": best["score"],
+            "seconds": sum(trial["seconds"] for trial in trials),
+        }
+        return clone(model).set_params(**best["params"]).fit(X, y)
+
+    def tune_hyperparameters(self):
+        for model_name, model in self.models_to_train_and_tune["models"].items():
+            space = self.models_to_train_and_tune["search_spaces"][model_name]
+            if self.tracker:
+                self.tracker.log_param(f"{model_name}.search_space", space)
+            model_key = self._checkpoint_key(space, n_trials=self.n_trials)
+            if self.checkpoint:
+                tuned_model = self.checkpoint.get_model(model_name, model, model_key)
+                if tuned_model is not None:
+                    self.tuned_models[model_name] = tuned_model
+                    continue
+
+            if space:
+                tuned_model = self._search(model_name, model, space)
+            else:
+                model.fit(self.data_factory.X_train, self.data_factory.y_train)
+                tuned_model = model
+
+            if self.checkpoint:
+                self.checkpoint.save_model(model_name, model, model_key, tuned_model)
+            self.tuned_models[model_name] = tuned_model
+        return self.tuned_models
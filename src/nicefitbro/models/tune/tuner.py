@@ -1,22 +1,106 @@
-from sklearn.model_selection import GridSearchCV
+import time
+import numpy as np
+from sklearn.base import clone
+from sklearn.model_selection import GridSearchCV, ParameterGrid, cross_val_score
+from nicefitbro.resources import ResourceBudget
 
 
 class HyperparameterTuner:
-    def __init__(self, data_factory, model_factory):
+    def __init__(
+        self,
+        data_factory,
+        model_factory,
+        checkpoint=None,
+        tracker=None,
+        resources=None,
+    ):
         self.data_factory = data_factory
         self.models_to_train_and_tune = model_factory.get_models_to_train_and_tune()
+        self.checkpoint = checkpoint
+        self.tracker = tracker
+        self.resources = resources or ResourceBudget(1)
         self.tuned_models = {}
 
+    def _tune_candidates(self, model_name, model, hyperparameters):
+        # same search as GridSearchCV, one candidate at a time so each
+        # finished candidate can be checkpointed
+        best_params, best_score = None, -np.inf
+        for step, params in enumerate(ParameterGrid(hyperparameters)):
+            score = self.checkpoint.get_score(
+                model_name, model, hyperparameters, params
+            )
+            start = time.perf_counter()
+            if score is None:
+                estimator = clone(model).set_params(**params)
+                with self.resources.workers():
+                    score = np.mean(
+                        cross_val_score(
+                            estimator,
+                            self.data_factory.X_train,
+                            self.data_factory.y_train,
+                            cv=5,
+                            n_jobs=self.resources.cv_jobs,
+                        )
+                    )
+                self.checkpoint.save_score(
+                    model_name, model, hyperparameters, params, score
+                )
+            if self.tracker:
+                self.tracker.log_candidate(
+                    model_name, step, params, score, time.perf_counter() - start
+                )
+            score = np.nan_to_num(score, nan=-np.inf)
+            if best_params is None or score > best_score:
+                best_params, best_score = params, score
+        best_estimator = clone(model).set_params(**best_params)
+        best_estimator.fit(self.data_factory.X_train, self.data_factory.y_train)
+        return best_estimator
+
+    def _track_grid_search(self, model_name, cv_results):
+        for step, params in enumerate(cv_results["params"]):
+            self.tracker.log_candidate(
+                model_name,
+                step,
+                params,
+                cv_results["mean_test_score"][step],
+                cv_results["mean_fit_time"][step],
+            )
+
     def tune_hyperparameters(self):
         for model_name, model in self.models_to_train_and_tune["models"].items():
             hyperparameters = self.models_to_train_and_tune["hyperparameters"][
                 model_name
             ]
-            if hyperparameters:
-                grid_search = GridSearchCV(model, hyperparameters, cv=5)
-                grid_search.fit(self.data_factory.X_train, self.data_factory.y_train)
-                self.tuned_models[model_name] = grid_search.best_estimator_
+            if self.tracker:
+                self.tracker.log_param(f"{model_name}.grid", hyperparameters)
+            if self.checkpoint:
+                tuned_model = self.checkpoint.get_model(
+                    model_name, model, hyperparameters
+                )
+                if tuned_model is not None:
+                    self.tuned_models[model_name] = tuned_model
+                    continue
+
+            if hyperparameters and self.checkpoint:
+                tuned_model = self._tune_candidates(model_name, model, hyperparameters)
+            elif hyperparameters:
+                grid_search = GridSearchCV(
+                    model, hyperparameters, cv=5, n_jobs=self.resources.cv_jobs
+                )
+                with self.resources.workers():
+                    grid_search.fit(
+                        self.data_factory.X_train, self.data_factory.y_train
+                    )
+                tuned_model = grid_search.best_estimator_
+                if self.tracker:
+                    self._track_grid_search(model_name, grid_search.cv_results_)
             else:
                 model.fit(self.data_factory.X_train, self.data_factory.y_train)
-                self.tuned_models[model_name] = model
+                tuned_model = model
+
+            if self.checkpoint:
+                self.checkpoint.save_model(
+                    model_name, model, hyperparameters, tuned_model
+                )
+            self.tuned_models[model_name] = tuned_model
         return self.tuned_models
@@ -1,4 +1,8 @@
 from nicefitbro.ingestors.local_ingestor import LocalFileIngestor
+from nicefitbro.ingestors.column_store_ingestor import (
+    ColumnStoreIngestor,
+    is_column_store,
+)
 from nicefitbro.preprocess.missing_value_processor import MissingValuePreprocessor
 from nicefitbro.preprocess.outlier_detector import OutlierDetector
 from nicefitbro.feature_engineering.categorical_encoding import CategoricalEncoder
@@ -9,8 +13,11 @@ from nicefitbro.feature_engineering.feature_transformations import FeatureTransf
 from nicefitbro.pipeliners.fe_pipeliner import FtEngineeringPipeliner
 from nicefitbro.pipeliners.preprocessor_pipeliner import PreprocessorPipeliner
 from nicefitbro.pipeliners.prepper import DataPrepper
+from nicefitbro.pipeliners.in_fold import split_in_fold
 from nicefitbro.models.auto_model import AutoModel
 from nicefitbro.config.run_config import RunConfig
+from nicefitbro.tracking import ExperimentTracker
+from nicefitbro.artifact import save_artifact
 
 
 class NiceFitBro:
@@ -20,7 +27,28 @@ class NiceFitBro:
         self.engineer = None
         self.processor_steps = []
         self.feature_engineering_steps = []
-        self.local_file_ingestor = LocalFileIngestor()
+        self.fold_steps = []
+        self.local_file_ingestor = LocalFileIngestor(
+            schema=run_config.schema,
+            # float32 runs parse floats straight into single precision
+            float_dtype="float32" if run_config.precision == "float32" else None,
+        )
+        if is_column_store(run_config.file_path):
+            self.ingestor = ColumnStoreIngestor()
+        else:
+            self.ingestor = self.local_file_ingestor
+        self.time_accounting = {}
+        self.precision_report = {"steps": [], "models": []}
+        self.quick_rank_report = {}
+        self.substitutions = {}
+        self.selected_model = None
+        self.tracking_report = {}
+        self.search_report = {}
+        self.resource_report = {}
+        self.prep_report = {}
+        self.trained_models = {}
+        self.performance = {}
+        self.feature_names = []
 
     def _missing(self):
         if self.run_config.missing_value_method:
@@ -59,7 +87,9 @@ class NiceFitBro:
         self._outliers()
 
         if self.processor_steps:
-            self.preprocessor = PreprocessorPipeliner(self.processor_steps)
+            self.preprocessor = PreprocessorPipeliner(
+                self.processor_steps, fused=self.run_config.fused
+            )
 
     def _engineer(self):
         self._selectors()
@@ -69,27 +99,145 @@ class NiceFitBro:
         if self.feature_engineering_steps:
             self.engineer = FtEngineeringPipeliner(self.feature_engineering_steps)
 
-    def prepare_data(self):
+    def _planned_steps(self):
+        steps = [("preprocess", step) for step in self.processor_steps]
+        # DataPrepper only runs feature engineering on preprocessed data
+        if self.preprocessor:
+            steps += [("engineer", step) for step in self.feature_engineering_steps]
+        return steps
+
+    def plan_steps(self):
+        # the steps run on the whole data; with in_fold, the others go to fold_steps
         self._preprocess()
         self._engineer()
+        if self.run_config.in_fold:
+            return self._split_in_fold()
+        return self._planned_steps()
+
+    def _split_in_fold(self):
+        # row filters, and the steps before them, still run on the whole data;
+        # the rest is fitted on each fold's training rows inside the models
+        pre_split, self.fold_steps = split_in_fold(self._planned_steps())
+        self.preprocessor = None
+        if pre_split:
+            self.preprocessor = PreprocessorPipeliner(
+                [step for _, step in pre_split], fused=self.run_config.fused
+            )
+        self.engineer = None
+        return pre_split
+
+    def prepare_data(self):
+        self.plan_steps()
 
         data_prepper = DataPrepper(
-            self.local_file_ingestor,
+            self.ingestor,
             self.run_config.target,
             self.preprocessor,
             self.engineer,
+            fused=self.run_config.fused,
+            precision=self.run_config.precision,
+            backend=self.run_config.backend,
         )
         processed_data = data_prepper.load_and_preprocess_data(
             self.run_config.file_path
         )
+        self.precision_report["steps"] = data_prepper.policy.upcasts
         return processed_data
 
+    def _tracker(self):
+        if not self.run_config.tracking_uri:
+            return None
+        tracker = ExperimentTracker(
+            tracking_uri=self.run_config.tracking_uri,
+            experiment_name=self.run_config.experiment_name,
+        )
+        tracker.log_params(
+            {
+                key: value
+                for key, value in vars(self.run_config).items()
+                if value is not None and key != "tracking_uri"
+            }
+        )
+        return tracker
+
     def autofit(self, processed_data):
+        tracker = self._tracker()
         am = AutoModel(
-            processed_data, self.run_config.model_types, self.run_config.target
+            processed_data,
+            self.run_config.model_types,
+            self.run_config.target,
+            time_budget=self.run_config.time_budget,
+            checkpoint_dir=self.run_config.checkpoint_dir,
+            precision=self.run_config.precision,
+            test_size=self.run_config.test_size,
+            random_state=self.run_config.random_state,
+            quick_rank=self.run_config.quick_rank,
+            quick_rank_fractions=self.run_config.quick_rank_fractions,
+            quick_rank_top_k=self.run_config.quick_rank_top_k,
+            scalability_thresholds=self.run_config.scalability_thresholds,
+            measure_latency=self.run_config.measure_latency,
+            max_latency_ms=self.run_config.max_latency_ms,
+            max_size_bytes=self.run_config.max_size_bytes,
+            tracker=tracker,
+            n_bootstrap=self.run_config.n_bootstrap,
+            search=self.run_config.search,
+            n_trials=self.run_config.n_trials,
+            n_parallel_trials=self.run_config.n_parallel_trials,
+            n_cores=self.run_config.n_cores,
+            prep_steps=self.fold_steps,
         )
-        trained_models, performance = am.auto_model()
+        try:
+            trained_models, performance = am.auto_model()
+        finally:
+            if tracker:
+                self.tracking_report = tracker.close()
+        self.time_accounting = am.time_accounting
+        self.precision_report["models"] = am.upcast_models
+        self.quick_rank_report = am.quick_rank_report
+        self.search_report = am.search_report
+        self.resource_report = am.resources.report
+        self.prep_report = am.prep_report
+        self.substitutions = am.substitutions
+        self.selected_model = am.selected_model
+        self.trained_models = trained_models
+        self.performance = performance
+        self.feature_names = am.data_factory.feature_names
         return trained_models, performance
 
     def sendit(self):
         return self.autofit(self.prepare_data())
+
+    def fitted_steps(self):
+        if self.run_config.in_fold:
+            # the in-fold steps are fitted inside every model's pipeline
+            return (
+                list(self.preprocessor.preprocessor_steps) if self.preprocessor else []
+            )
+        # the steps DataPrepper ran: feature engineering only follows preprocessing
+        steps = list(self.processor_steps)
+        if self.preprocessor:
+            steps += self.feature_engineering_steps
+        return steps
+
+    def save(self, path, all_models=False, originals=False):
+        if self.selected_model is None and not all_models:
+            raise ValueError(
+                "Invalid save, no model was selected within the latency and size budgets. "
+                "Choose all_models=True."
+            )
+        steps = self.fitted_steps()
+        names = list(self.trained_models) if all_models else [self.selected_model]
+        return save_artifact(
+            path,
+            steps,
+            self.feature_names,
+            self.run_config.target,
+            {name: self.trained_models[name] for name in names},
+            selected_model=self.selected_model,
+            precision=self.run_config.precision,
+            metadata={
+                "performance": {name: self.performance[name] for name in names},
+                "run_config": vars(self.run_config),
+            },
+            originals=originals,
+        )
@@ -0,0 +1,202 @@
+import numpy as np
+import pandas as pd
+from nicefitbro.preprocess.missing_value_processor import MissingValuePreprocessor
+from nicefitbro.preprocess.outlier_detector import OutlierDetector
+from nicefitbro.feature_engineering.feature_scaling import FeatureScaler
+
+FUSABLE_METHODS = {
+    MissingValuePreprocessor: ("mean", "median", "fill", "drop"),
+    OutlierDetector: ("zscore", "iqr"),
+    FeatureScaler: ("standard", "minmax"),
+}
+
+
+def is_fusable(step):
+    # outlier bounds from a fitted sketch are not recomputed from the data
+    if getattr(step, "sketch", None) is not None:
+        return False
+    return step.method in FUSABLE_METHODS.get(type(step), ())
+
+
+class FusedNumericKernel:
+    """
+    Class for running a chain of numeric steps as a single pass over one NumPy block.
+
+    Missing value imputation, IQR/ZScore outlier removal and standard/minmax scaling are run on one column-major
+    float block (float32 when every column is float32, float64 otherwise), with statistics accumulated in float64. Each step sweeps the block column by column, computing a column's statistics and
+    updating it in place, so temporaries stay the size of one column. Rows are only physically removed when a later
+    step needs statistics over the survivors, and the block becomes the output frame without another copy. The
+    output matches running the steps one after the other, and so do the side effects on the input: when data is a
+    single float block of that dtype, imputation fills its missing values in place, as fillna(inplace=True) does,
+    while scaling works on a copy and leaves data unscaled.
+
+    Attributes:
+        steps (list): MissingValuePreprocessor, OutlierDetector and FeatureScaler steps, in order.
+
+    Methods:
+        can_run(data):
+            Returns: True when every column of data is numeric.
+        run(data):
+            Runs the steps on the data.
+            - data: pandas DataFrame containing the data.
+            Returns: pandas DataFrame with the steps applied.
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+
+    def can_run(self, data):
+        return all(pd.api.types.is_numeric_dtype(dtype) for dtype in data.dtypes)
+
+    def _impute(self, X, keep, method, fill_value=0):
+        # the fill value of every column is kept for transform, not only of the columns with gaps
+        fills = np.full(X.shape[1], np.nan if method in ("mean", "median") else 0.0)
+        for j, col in enumerate(X.T):
+            missing = np.isnan(col)
+            has_missing = missing.any()
+            present = col[~missing] if has_missing else col
+            if method == "mean" and len(present):
+                fills[j] = present.mean(dtype=np.float64)
+            elif method == "median" and len(present):
+                fills[j] = np.median(present)
+            elif method == "fill":
+                fills[j] = fill_value
+            if not has_missing:
+                continue
+            if method == "drop":
+                keep &= ~missing
+            else:
+                col[missing] = fills[j]
+        return keep, fills
+
+    def _filter(self, X, keep, method):
+        outlier = np.zeros(X.shape[0], dtype=bool)
+        inlier = np.zeros(X.shape[0], dtype=bool)
+        for col in X.T:
+            if method == "zscore":
+                mean, std = col.mean(dtype=np.float64), col.std(dtype=np.float64)
+                # a row survives when any of its columns is within 3 std of the mean
+                inlier |= np.abs(col - mean) < 3 * std
+            else:
+                Q1, Q3 = np.nanquantile(col, [0.25, 0.75])
+                IQR = Q3 - Q1
+                outlier |= (col < Q1 - 1.5 * IQR) | (col > Q3 + 1.5 * IQR)
+        return keep & inlier if method == "zscore" else keep & ~outlier
+
+    def _scale(self, X, method):
+        eps = 10 * np.finfo(X.dtype).eps
+        offsets, scales = np.empty(X.shape[1]), np.empty(X.shape[1])
+        for j, col in enumerate(X.T):
+            if method == "standard":
+                offset, scale = col.mean(dtype=np.float64), col.std(dtype=np.float64)
+            else:
+                offset = col.min()
+                scale = col.max() - offset
+            if np.isnan(offset):
+                # like the sklearn scalers, ignore missing values and keep them
+                if method == "standard":
+                    offset = np.nanmean(col, dtype=np.float64)
+                    scale = np.nanstd(col, dtype=np.float64)
+                else:
+                    offset = np.nanmin(col)
+                    scale = np.nanmax(col) - offset
+            offsets[j], scales[j] = offset, scale if scale >= eps else 1.0
+            col -= offset
+            col /= scales[j]
+        return offsets, scales
+
+    @staticmethod
+    def _compress(X, keep):
+        # column by column, so the block stays column-major without a second full copy
+        compressed = np.empty((int(keep.sum()), X.shape[1]), dtype=X.dtype, order="F")
+        for j in range(X.shape[1]):
+            np.compress(keep, X[:, j], out=compressed[:, j])
+        return compressed
+
+    def run(self, data):
+        # column-major, like pandas blocks, so every column sweep reads contiguous memory;
+        # a single float block is imputed in place, as the unfused fillna(inplace=True) does
+        dtype = np.float32 if (data.dtypes == np.float32).all() else np.float64
+        X = data.to_numpy()
+        shared = X.dtype == dtype and X.flags.f_contiguous and X.flags.writeable
+        if not shared:
+            X = np.empty(data.shape, dtype=dtype, order="F")
+            for j, column in enumerate(data.columns):
+                X[:, j] = data[column].to_numpy()
+        index = data.index
+        keep = np.ones(X.shape[0], dtype=bool)
+        scaled = False
+
+        for step in self.steps:
+            if not keep.all():
+                X, index = self._compress(X, keep), index[keep]
+                keep = np.ones(X.shape[0], dtype=bool)
+                shared = False
+            # the steps keep the statistics they were run with, as they do unfused
+            if isinstance(step, MissingValuePreprocessor):
+                keep, fills = self._impute(X, keep, step.method)
+                if step.method in ("mean", "median"):
+                    step.fill_values = pd.Series(fills, index=data.columns)
+                elif step.method == "fill":
+                    step.fill_values = 0
+            elif isinstance(step, OutlierDetector):
+                keep = self._filter(X, keep, step.method)
+            else:
+                if shared:
+                    # unfused scaling returns a new frame and leaves the caller's as it was
+                    X, shared = X.copy(order="F"), False
+                offsets, scales = self._scale(X, step.method)
+                step.offsets = pd.Series(offsets, index=data.columns)
+                step.scales = pd.Series(scales, index=data.columns)
+                scaled = True
+
+        if not keep.all():
+            X, index = self._compress(X, keep), index[keep]
+
+        if scaled:
+            # FeatureScaler returns a freshly indexed float frame
+            return pd.DataFrame(X, columns=data.columns)
+        return pd.DataFrame(X, columns=data.columns, index=index).astype(
+            data.dtypes.to_dict(), copy=False
+        )
+
+
+def fuse_steps(steps):
+    """Groups runs of two or more fusable (kind, step) pairs into ("fused", FusedNumericKernel) pairs"""
+    fused, run = [], []
+    for kind, step in steps + [(None, None)]:
+        if step is not None and is_fusable(step):
+            run.append((kind, step))
+            continue
+        if len(run) > 1:
+            fused.append(("fused", FusedNumericKernel([s for _, s in run])))
+        else:
+            fused.extend(run)
+        run = []
+        if step is not None:
+            fused.append((kind, step))
+    return fused
+
+
+def _step_kind(step):
+    return "engineer" if isinstance(step, FeatureScaler) else "preprocess"
+
+
+def run_steps(data, steps, target=None, policy=None):
+    for kind, step in steps:
+        if kind == "fused" and step.can_run(data):
+            data = step.run(data)
+        elif kind == "fused":
+            data = run_steps(
+                data,
+                [(_step_kind(s), s) for s in step.steps],
+                target=target,
+                policy=policy,
+            )
+        elif kind == "preprocess":
+            data = step.preprocess_data(data)
+        else:
+            data = step.engineer_features(data, target)
+        if policy:
+            data = policy.check(type(step).__name__, data)
+    return data
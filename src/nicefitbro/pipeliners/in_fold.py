@@ -0,0 +1,109 @@
+import os
+import inspect
+from sklearn.base import BaseEstimator, TransformerMixin
+from sklearn.pipeline import Pipeline
+from nicefitbro.preprocess.missing_value_processor import MissingValuePreprocessor
+from nicefitbro.preprocess.outlier_detector import OutlierDetector
+
+# name of the model inside a composed pipeline, and the prefix of its hyperparameters
+MODEL_STEP = "model"
+
+
+def is_row_filter(step):
+    # steps that decide which rows exist rather than transform them; X and y must
+    # keep the same rows inside a scikit-learn pipeline, so they run before the split
+    if isinstance(step, OutlierDetector):
+        return True
+    return isinstance(step, MissingValuePreprocessor) and step.method == "drop"
+
+
+def split_in_fold(steps):
+    """Splits (kind, step) pairs into the steps run before the split, up to the last row filter, and those fitted in each fold"""
+    last_filter = max(
+        (i for i, (_, step) in enumerate(steps) if is_row_filter(step)), default=-1
+    )
+    return steps[: last_filter + 1], steps[last_filter + 1 :]
+
+
+def step_params(step):
+    """Returns the constructor arguments of a step, read from the attributes of the same names"""
+    return {
+        name: getattr(step, name)
+        for name in inspect.signature(type(step)).parameters
+        if name not in ("self", "sketch")
+    }
+
+
+class StepTransformer(BaseEstimator, TransformerMixin):
+    """
+    Class for running a nicefitbro preprocessing or feature engineering step as a scikit-learn transformer.
+
+    The transformer is built from the step's type and constructor arguments, not from a step object, so cloning it
+    gives an unfitted step and two transformers with the same arguments hash alike, which is what lets a pipeline
+    with memory reuse a fit. Fitting creates the step and runs its preprocess_data or engineer_features on a copy
+    of the fold's rows, with the target as a column for the steps that use it, and keeps the fitted step;
+    transforming runs the fitted step's transform, so held out rows get the statistics of the training rows only.
+    With a fit log, every fit appends the step's name to it, which counts the fits made in worker processes and
+    leaves out those a pipeline's memory served from its cache.
+
+    Attributes:
+        step_type (type): Class of the step, e.g. FeatureScaler.
+        step_params (dict): Constructor arguments of the step.
+        target (str): Name of the target column given to steps that use it.
+        fit_log (str): Path of the file each fit appends a line to, or None.
+        step_ (object): The fitted step.
+
+    Methods:
+        fit(X, y=None):
+            Fits a new step on X.
+        transform(X):
+            Returns: X transformed by the fitted step.
+    """
+
+    def __init__(self, step_type=None, step_params=None, target="target", fit_log=None):
+        self.step_type = step_type
+        self.step_params = step_params
+        self.target = target
+        self.fit_log = fit_log
+
+    def _fit(self, X, y):
+        if self.fit_log:
+            # one short append per fit, which processes can share
+            with open(self.fit_log, "a") as f:
+                f.write(self.step_type.__name__ + "\n")
+        self.step_ = self.step_type(**(self.step_params or {}))
+        data = X.copy()
+        if isinstance(self.step_, MissingValuePreprocessor):
+            return self.step_.preprocess_data(data)
+        if y is not None:
+            data[self.target] = y.to_numpy() if hasattr(y, "to_numpy") else y
+        data = self.step_.engineer_features(data, self.target)
+        return data.drop(columns=[self.target], errors="ignore")
+
+    def fit(self, X, y=None):
+        self._fit(X, y)
+        return self
+
+    def fit_transform(self, X, y=None):
+        # the step's own fitting call already returns its output
+        return self._fit(X, y)
+
+    def transform(self, X):
+        return self.step_.transform(X)
+
+
+def count_fits(fit_log):
+    """Returns the number of fits a fit log recorded, or 0 when there were none"""
+    if not os.path.isfile(fit_log):
+        return 0
+    with open(fit_log) as f:
+        return sum(1 for _ in f)
+
+
+def compose(model, steps, target, memory=None, fit_log=None):
+    """Puts the in-fold steps in front of a model as one scikit-learn Pipeline"""
+    prep = [
+        (f"prep{i}", StepTransformer(type(step), step_params(step), target, fit_log))
+        for i, (_, step) in enumerate(steps)
+    ]
+    return Pipeline(prep + [(MODEL_STEP, model)], memory=memory)
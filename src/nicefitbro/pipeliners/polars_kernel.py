@@ -0,0 +1,278 @@
+import numpy as np
+import pandas as pd
+import polars as pl
+from scipy import special, stats
+from sklearn.feature_selection import SelectKBest, f_regression
+from nicefitbro.preprocess.missing_value_processor import MissingValuePreprocessor
+from nicefitbro.preprocess.outlier_detector import OutlierDetector
+from nicefitbro.feature_engineering.feature_scaling import FeatureScaler
+from nicefitbro.feature_engineering.feature_selection import FeatureSelection
+from nicefitbro.feature_engineering.feature_transformations import FeatureTransformer
+
+# steps and methods with a Polars form; every other step runs on pandas
+LAZY_METHODS = {
+    MissingValuePreprocessor: ("mean", "median", "fill", "drop"),
+    OutlierDetector: ("zscore", "iqr"),
+    FeatureScaler: ("standard", "minmax"),
+    FeatureTransformer: ("log", "box_cox"),
+    FeatureSelection: ("select_k_best",),
+}
+FLOATS = (pl.Float32, pl.Float64)
+
+
+def is_lazy(step):
+    # outlier bounds from a fitted sketch are not recomputed from the data
+    if getattr(step, "sketch", None) is not None:
+        return False
+    return step.method in LAZY_METHODS.get(type(step), ())
+
+
+def to_polars(data):
+    """Wraps a pandas DataFrame in a Polars LazyFrame, with NaN as null"""
+    # Polars column names are unique, so a repeated column (polynomial features re-adding
+    # an input) is kept once, at its first position
+    repeated = data.columns.duplicated()
+    return pl.DataFrame(
+        {
+            str(col): data.iloc[:, i].to_numpy()
+            for i, col in enumerate(data.columns)
+            if not repeated[i]
+        },
+        nan_to_null=True,
+    ).lazy()
+
+
+def to_pandas(frame):
+    """Converts a collected Polars DataFrame to pandas, one NumPy array per column"""
+    return pd.DataFrame({col: frame[col].to_numpy() for col in frame.columns})
+
+
+class PolarsKernel:
+    """
+    Class for running preprocessing and feature engineering steps as a single lazy Polars query.
+
+    The steps are translated into one LazyFrame plan: missing value filling and dropping, ZScore/IQR outlier
+    filters, standard/minmax scaling, log and Box Cox transforms and SelectKBest selection. A step whose parameters
+    depend on the data (fill values, bounds, offsets, lambdas, selected columns) first collects a one row
+    aggregate of the plan so far, then adds its expressions to the plan with those values as literals. Polars runs
+    each collect multithreaded and fuses the pending fills, filters and projections into it, and the output is only
+    materialized once, at the end, as one NumPy array per column. Steps without a Polars form (Mahalanobis and LOF
+    outliers, polynomial features, RFE and Lasso selection, categorical encoding, correlation analysis, sketch
+    based bounds) collect the plan, run on pandas and start a new plan from their output.
+
+    The steps keep the parameters they were fitted with, as they do on pandas, and the output matches running them
+    one after the other on pandas, apart from the index, which always starts again from zero.
+
+    Attributes:
+        steps (list): (kind, step) pairs, in order.
+        collects (int): Number of times the plan was executed, for statistics, fallbacks and the output.
+        plan (list): 'lazy' or 'pandas' per step, how it ran.
+
+    Methods:
+        run(data, target=None):
+            Runs the steps on the data.
+            - data: pandas DataFrame containing the data.
+            Returns: pandas DataFrame with the steps applied.
+    """
+
+    def __init__(self, steps):
+        self.steps = steps
+        self.collects = 0
+        self.plan = []
+
+    def _collect(self, frame):
+        self.collects += 1
+        return frame.collect()
+
+    def _aggregate(self, frame, columns, **aggregations):
+        # every statistic of every column in one pass: {name: {column: value}}
+        row = self._collect(
+            frame.select(
+                [
+                    aggregation(pl.col(col)).alias(f"{name}:{col}")
+                    for name, aggregation in aggregations.items()
+                    for col in columns
+                ]
+            )
+        ).row(0)
+        values = iter(row)
+        return {name: {col: next(values) for col in columns} for name in aggregations}
+
+    def _missing(self, frame, step, schema):
+        columns = list(schema)
+        if step.method == "drop":
+            return frame.drop_nulls()
+        if step.method == "fill":
+            step.fill_values = 0
+            fills = dict.fromkeys(columns, 0)
+        else:
+            aggregation = (
+                (lambda col: col.mean())
+                if step.method == "mean"
+                else (lambda col: col.median())
+            )
+            fills = self._aggregate(frame, columns, fill=aggregation)["fill"]
+            step.fill_values = pd.Series(
+                [np.nan if fills[col] is None else fills[col] for col in columns],
+                index=columns,
+                dtype=np.float64,
+            )
+        return frame.with_columns(
+            [
+                pl.col(col).fill_null(pl.lit(fills[col])).cast(schema[col])
+                for col in columns
+                if fills[col] is not None
+            ]
+        )
+
+    def _outliers(self, frame, step, schema):
+        columns = list(schema)
+        if step.method == "zscore":
+            values = self._aggregate(
+                frame,
+                columns,
+                mean=lambda col: col.mean(),
+                std=lambda col: col.std(ddof=0),
+                nulls=lambda col: col.null_count(),
+            )
+            # a column with a missing value or no spread gives NaN zscores, which are never inliers
+            inlier = [
+                ((pl.col(col) - values["mean"][col]) / values["std"][col]).abs() < 3
+                for col in columns
+                if values["nulls"][col] == 0 and values["std"][col]
+            ]
+            return frame.filter(pl.any_horizontal(inlier) if inlier else pl.lit(False))
+        values = self._aggregate(
+            frame,
+            columns,
+            q1=lambda col: col.quantile(0.25, interpolation="linear"),
+            q3=lambda col: col.quantile(0.75, interpolation="linear"),
+        )
+        outlier = []
+        for col in columns:
+            q1, q3 = values["q1"][col], values["q3"][col]
+            if q1 is None:
+                continue
+            iqr = q3 - q1
+            # comparisons with a missing value are not outliers
+            outlier.append(
+                (
+                    (pl.col(col) < q1 - 1.5 * iqr) | (pl.col(col) > q3 + 1.5 * iqr)
+                ).fill_null(False)
+            )
+        return frame.filter(~pl.any_horizontal(outlier)) if outlier else frame
+
+    def _scale(self, frame, step, schema):
+        columns = list(schema)
+        # like the scikit-learn scalers: float32 only when every column is float32
+        dtype = (
+            pl.Float32
+            if all(schema[col] == pl.Float32 for col in columns)
+            else pl.Float64
+        )
+        eps = 10 * np.finfo(np.float32 if dtype == pl.Float32 else np.float64).eps
+        if step.method == "standard":
+            values = self._aggregate(
+                frame,
+                columns,
+                offset=lambda col: col.mean(),
+                scale=lambda col: col.std(ddof=0),
+            )
+            offsets, scales = values["offset"], values["scale"]
+        else:
+            values = self._aggregate(
+                frame, columns, low=lambda col: col.min(), high=lambda col: col.max()
+            )
+            offsets = values["low"]
+            scales = {
+                col: None
+                if offsets[col] is None
+                else values["high"][col] - offsets[col]
+                for col in columns
+            }
+        offsets = pd.Series(offsets, index=columns, dtype=np.float64)
+        scales = pd.Series(scales, index=columns, dtype=np.float64)
+        scales[~(scales >= eps)] = 1.0
+        step.offsets, step.scales = offsets, scales
+        return frame.with_columns(
+            [
+                ((pl.col(col).cast(pl.Float64) - offsets[col]) / scales[col]).cast(
+                    dtype
+                )
+                for col in columns
+            ]
+        )
+
+    def _transform(self, frame, step, schema):
+        # float columns keep their precision, as they do through NumPy
+        dtypes = {
+            col: schema[col] if schema[col] in FLOATS else pl.Float64
+            for col in step.features
+        }
+        if step.method == "log":
+            return frame.with_columns(
+                [pl.col(col).cast(dtypes[col]).log1p() for col in step.features]
+            )
+        fitted = self._collect(frame.select(step.features))
+        for col in step.features:
+            _, step.lambdas[col] = stats.boxcox(fitted[col].to_numpy())
+        # scipy's own boxcox inside the plan, so the values match it exactly
+        return frame.with_columns(
+            [
+                pl.col(col)
+                .cast(dtypes[col])
+                .map_batches(
+                    lambda series, lmbda=step.lambdas[col]: pl.Series(
+                        special.boxcox(series.to_numpy(), lmbda)
+                    ),
+                    return_dtype=dtypes[col],
+                )
+                for col in step.features
+            ]
+        )
+
+    def _select(self, frame, step, target, schema):
+        features = [col for col in schema if col != target]
+        fitted = self._collect(frame)
+        selector = SelectKBest(f_regression, k=step.k)
+        selector.fit(fitted.select(features).to_numpy(), fitted[target].to_numpy())
+        step.selected_features = [
+            col for col, keep in zip(features, selector.get_support()) if keep
+        ]
+        return fitted.lazy().select(step.selected_features)
+
+    def _lazy(self, frame, step, target):
+        schema = frame.collect_schema()
+        if isinstance(step, MissingValuePreprocessor):
+            return self._missing(frame, step, schema)
+        if isinstance(step, OutlierDetector):
+            return self._outliers(frame, step, schema)
+        if isinstance(step, FeatureScaler):
+            return self._scale(frame, step, schema)
+        if isinstance(step, FeatureTransformer):
+            return self._transform(frame, step, schema)
+        return self._select(frame, step, target, schema)
+
+    def run(self, data, target=None, policy=None):
+        frame = to_polars(data)
+        for kind, step in self.steps:
+            if is_lazy(step):
+                frame = self._lazy(frame, step, target)
+                self.plan.append("lazy")
+                continue
+            pandas_data = to_pandas(self._collect(frame))
+            if kind == "preprocess":
+                pandas_data = step.preprocess_data(pandas_data)
+            else:
+                pandas_data = step.engineer_features(pandas_data, target)
+            frame = to_polars(pandas_data)
+            self.plan.append("pandas")
+        data = to_pandas(self._collect(frame))
+        if policy:
+            data = policy.check(type(self).__name__, data)
+        return data
+
+
+def run_polars_steps(data, steps, target=None, policy=None):
+    """Runs (kind, step) pairs through one PolarsKernel, the counterpart of run_steps"""
+    return PolarsKernel(steps).run(data, target=target, policy=policy)
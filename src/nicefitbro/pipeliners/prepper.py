@@ -1,4 +1,8 @@
 import mlflow
+from nicefitbro.pipeliners.fused_kernel import fuse_steps, run_steps
+from nicefitbro.precision import PrecisionPolicy
+
+BACKENDS = ("pandas", "polars")
 
 
 class DataPrepper:
@@ -13,6 +17,11 @@ class DataPrepper:
         preprocessor (DataPreprocessor): An instance of a concrete implementation of the DataPreprocessor abstract class.
         engineer (FtEngineeringPipeliner):
         target (str): String value of the target column name
+        fused (bool): Run consecutive numeric preprocessing and feature engineering steps as a single pass.
+        backend (str): Dataframe engine the steps run on.
+            'pandas': Run the steps on pandas, fused or not.
+            'polars': Run the steps as one lazy Polars query (see PolarsKernel). Needs polars installed.
+        policy (PrecisionPolicy): Casts ingested data to the requested precision and records steps that upcast it.
 
     Methods:
         load_and_preprocess_data(source):
@@ -21,14 +30,46 @@ class DataPrepper:
             Returns: pandas DataFrame containing the preprocessed data.
     """
 
-    def __init__(self, importer, target, preprocessor=None, engineer=None):
+    def __init__(
+        self,
+        importer,
+        target,
+        preprocessor=None,
+        engineer=None,
+        fused=False,
+        precision="float64",
+        backend="pandas",
+    ):
+        if backend not in BACKENDS:
+            raise ValueError("Invalid backend. Choose 'pandas' or 'polars'.")
         self.importer = importer
         self.preprocessor = preprocessor
         self.engineer = engineer
         self.target = target
+        self.fused = fused
+        self.backend = backend
+        self.policy = PrecisionPolicy(precision)
+
+    def _steps(self, fused=None):
+        steps = [("preprocess", step) for step in self.preprocessor.preprocessor_steps]
+        if self.engineer:
+            steps += [("engineer", step) for step in self.engineer.fe_steps]
+        # fuse across both pipeliners so impute, outliers and scaling share a pass
+        return fuse_steps(steps) if (self.fused if fused is None else fused) else steps
 
     def load_and_preprocess_data(self, source):
-        data = self.importer.ingest_data(source)
+        data = self.policy.cast(self.importer.ingest_data(source))
+        if self.preprocessor and self.backend == "polars":
+            # imported here, so pandas runs do not need polars installed
+            from nicefitbro.pipeliners.polars_kernel import run_polars_steps
+
+            # the query fuses the steps itself, so they go in as they are
+            return run_polars_steps(
+                data, self._steps(fused=False), self.target, self.policy
+            )
+        if self.preprocessor and (self.fused or self.policy.precision != "float64"):
+            # step by step, so every step's output dtypes can be checked
+            return run_steps(data, self._steps(), self.target, policy=self.policy)
         if self.preprocessor:
             preprocessed_data = self.preprocessor.preprocess_data(data)
 
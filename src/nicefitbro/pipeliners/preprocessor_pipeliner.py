@@ -1,3 +1,6 @@
+from nicefitbro.pipeliners.fused_kernel import fuse_steps, run_steps
+
+
 class PreprocessorPipeliner:
     """
     Class for organizing and executing a pipeline of preprocessing steps.
@@ -7,6 +10,7 @@ class PreprocessorPipeliner:
     Attributes:
         preprocessor_steps (list): A list of preprocessing steps to perform. Each step should be an instance of a concrete
         implementation of the DataPreprocessor abstract class.
+        fused (bool): Run consecutive numeric steps as a single FusedNumericKernel pass.
 
     Methods:
         preprocess_data(data):
@@ -15,10 +19,14 @@ class PreprocessorPipeliner:
             Returns: pandas DataFrame containing the preprocessed data.
     """
 
-    def __init__(self, preprocessor_steps):
+    def __init__(self, preprocessor_steps, fused=False):
         self.preprocessor_steps = preprocessor_steps
+        self.fused = fused
 
     def preprocess_data(self, data):
+        if self.fused:
+            steps = [("preprocess", step) for step in self.preprocessor_steps]
+            return run_steps(data, fuse_steps(steps))
         for step in self.preprocessor_steps:
             data = step.preprocess_data(data)
         return data
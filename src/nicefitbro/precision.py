@@ -0,0 +1,68 @@
+import numpy as np
+import pandas as pd
+
+PRECISIONS = {"float64": np.float64, "float32": np.float32}
+# integers up to this magnitude are represented exactly in float32
+FLOAT32_EXACT_INT = 2**24
+
+
+class PrecisionPolicy:
+    """
+    Class for carrying a floating point precision through the pipeline.
+
+    In float32 mode numeric columns are cast down once at ingestion, and every later step is checked: a step that
+    silently widens a float column back to float64 is recorded in upcasts and its output is cast back down, so the
+    rest of the pipeline keeps working in single precision. Integer columns are only cast when every value is
+    exactly representable in float32. In float64 mode the policy does nothing.
+
+    Attributes:
+        precision (str): 'float64' or 'float32'.
+        dtype (numpy dtype): The floating point dtype for precision.
+        upcasts (list): One dict per upcasting step, with the step name and the widened columns.
+
+    Methods:
+        cast(data):
+            Casts numeric columns of a DataFrame or Series to the policy dtype.
+        check(step_name, data):
+            Records step_name if it produced wider float columns, and casts them back.
+    """
+
+    def __init__(self, precision="float64"):
+        if precision not in PRECISIONS:
+            raise ValueError("Invalid precision. Choose 'float64' or 'float32'.")
+        self.precision = precision
+        self.dtype = np.dtype(PRECISIONS[precision])
+        self.upcasts = []
+
+    def castable(self, series):
+        if pd.api.types.is_float_dtype(series):
+            return series.dtype != self.dtype
+        if pd.api.types.is_integer_dtype(series) and not pd.api.types.is_bool_dtype(
+            series
+        ):
+            return series.empty or series.abs().max() <= FLOAT32_EXACT_INT
+        return False
+
+    def cast(self, data):
+        if self.precision == "float64":
+            return data
+        if isinstance(data, pd.Series):
+            return data.astype(self.dtype) if self.castable(data) else data
+        columns = [col for col in data.columns if self.castable(data[col])]
+        if columns:
+            data = data.astype({col: self.dtype for col in columns})
+        return data
+
+    def check(self, step_name, data):
+        if self.precision == "float64":
+            return data
+        widened = [
+            col
+            for col in data.columns
+            if pd.api.types.is_float_dtype(data[col])
+            and data[col].dtype.itemsize > self.dtype.itemsize
+        ]
+        if widened:
+            self.upcasts.append({"step": step_name, "columns": widened})
+            data = self.cast(data)
+        return data
@@ -16,24 +16,44 @@ class MissingValuePreprocessor(DataPreprocessor):
             'median': Replace missing values with the median of the column.
             'fill': Replace missing values with input fill_value. Defualts to 0
             'drop': Drop rows with missing values.
+        fill_values (pandas Series or scalar): Values the missing values were replaced with, per column, once
+            preprocess_data has run.
 
     Methods:
         preprocess_data(data):
             Handles missing values in the data.
             - data: pandas DataFrame containing the data.
             Returns: pandas DataFrame with missing values handled.
+        transform(data):
+            Fills missing values in new data with the fill_values of the data preprocessed, e.g. at inference.
+            Rows are never dropped, so with the 'drop' method missing values are kept.
+            - data: pandas DataFrame containing the new data.
+            Returns: pandas DataFrame with missing values filled.
     """
 
     def __init__(self, method="mean"):
         self.method = method
+        self.fill_values = None
 
     def preprocess_data(self, data, fill_value=0):
         if self.method == "mean":
-            data.fillna(data.mean(), inplace=True)
+            self.fill_values = data.mean()
+            data.fillna(self.fill_values, inplace=True)
         elif self.method == "median":
-            data.fillna(data.median(), inplace=True)
+            self.fill_values = data.median()
+            data.fillna(self.fill_values, inplace=True)
         elif self.method == "fill":
+            self.fill_values = fill_value
             data.fillna(fill_value, inplace=True)
         elif self.method == "drop":
             data.dropna(inplace=True)
         return data
+
+    def transform(self, data):
+        if self.method == "drop":
+            return data
+        if self.fill_values is None:
+            raise ValueError(
+                "Invalid MissingValuePreprocessor for transform. Choose one that has run preprocess_data."
+            )
+        return data.fillna(self.fill_values)
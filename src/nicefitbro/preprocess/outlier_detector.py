@@ -3,6 +3,7 @@ import pandas as pd
 from scipy import stats
 from sklearn.neighbors import LocalOutlierFactor
 from nicefitbro.preprocess.preprocessor_abc import DataPreprocessor
+from nicefitbro.preprocess.sketches import ColumnSketch
 
 
 class OutlierDetector(DataPreprocessor):
@@ -18,23 +19,62 @@ class OutlierDetector(DataPreprocessor):
             'mahalanobis': Detect outliers using the Mahalanobis Distance method.
             'lof': Detect outliers using the Local Outlier Factor (LOF) method.
         threshold (float): Threshold for determining outliers. The specific meaning of this threshold will depend on the method used for outlier detection.
+        sketch (ColumnSketch): Optional streaming statistics. When set, the ZScore and IQR methods take their mean,
+            standard deviation and quartiles from the sketch instead of from the data being filtered, so bounds
+            fitted in one pass over chunks, merged across shards or loaded from disk are reused as they are.
 
     Methods:
         preprocess_data(data):
             Detects outliers in the data.
             - data: pandas DataFrame containing the data.
             Returns: pandas DataFrame without outlier data points.
+        transform(data):
+            Returns new data unchanged: rows being scored are never dropped as outliers.
+        partial_fit(data):
+            Adds a chunk of data to the sketch, creating it on the first call.
+            - data: pandas DataFrame containing the chunk.
+            Returns: the OutlierDetector.
+        merge(other):
+            Adds the sketch of another OutlierDetector, e.g. one fitted on another shard.
+            Returns: the OutlierDetector.
     """
 
-    def __init__(self, method="zscore"):
+    def __init__(self, method="zscore", sketch=None):
         self.method = method
+        self.sketch = sketch
+
+    def partial_fit(self, data, k=200):
+        if self.sketch is None:
+            self.sketch = ColumnSketch(data.columns, k=k)
+        self.sketch.update(data)
+        return self
+
+    def merge(self, other):
+        if other.sketch is None:
+            # nothing was fitted on the other shard
+            return self
+        if self.sketch is None:
+            self.sketch = ColumnSketch.from_dict(other.sketch.to_dict())
+        else:
+            self.sketch.merge(other.sketch)
+        return self
+
+    def transform(self, data):
+        return data
 
     def detect_outliers_zscore(self, data):
+        if self.sketch is not None:
+            zscores = (data - self.sketch.mean) / self.sketch.std()
+            return data[(np.abs(zscores) < 3).any(axis=1)]
         return data[(np.abs(stats.zscore(data)) < 3).any(axis=1)]
 
     def detect_outliers_iqr(self, data):
-        Q1 = data.quantile(0.25)
-        Q3 = data.quantile(0.75)
+        if self.sketch is not None:
+            Q1 = self.sketch.quantile(0.25)
+            Q3 = self.sketch.quantile(0.75)
+        else:
+            Q1 = data.quantile(0.25)
+            Q3 = data.quantile(0.75)
         IQR = Q3 - Q1
         return data[
             ~((data < (Q1 - 1.5 * IQR)) | (data > (Q3 + 1.5 * IQR))).any(axis=1)
@@ -0,0 +1,142 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+from collections import Counter
+
+# stages of a run, as the nicefitbro method each one runs under; prepare includes ingest
+STAGES = (
+    ("ingest", "ingest_data"),
+    ("prepare", "load_and_preprocess_data"),
+    ("tune", "tune_hyperparameters"),
+    ("train", "train_models"),
+    ("evaluate", "evaluate_trained_models"),
+)
+PROFILERS = ("sample", "cprofile")
+SAMPLE_INTERVAL = 0.005
+
+
+def _is_package_file(filename):
+    return os.path.join("nicefitbro", "") in filename
+
+
+def _frame_name(code):
+    module = os.path.splitext(os.path.basename(code.co_filename))[0]
+    return f"{module}:{code.co_name}"
+
+
+class StackSampler:
+    """
+    Class for a sampling profiler of the calling thread, written out as collapsed stacks.
+
+    A background thread reads the calling thread's stack every interval seconds through sys._current_frames, so
+    the profiled code runs unmodified and at close to full speed, unlike under cProfile, which hooks every call.
+    Identical stacks are counted, and written one per line as 'outer;...;inner count', the collapsed format that
+    flamegraph.pl, speedscope and inferno read. Worker processes started by the run are not sampled.
+
+    Attributes:
+        interval (float): Seconds between samples.
+        stacks (Counter): Samples per stack, each a tuple of (file, function) pairs from outermost to innermost.
+
+    Methods:
+        start():
+            Starts sampling the calling thread.
+        stop():
+            Stops sampling.
+        write(path):
+            Writes the collapsed stacks to path.
+        stage_seconds():
+            Returns: dict of the estimated seconds spent in each stage.
+    """
+
+    def __init__(self, interval=SAMPLE_INTERVAL):
+        self.interval = interval
+        self.stacks = Counter()
+        self._thread = None
+        self._stopped = threading.Event()
+
+    def _sample(self, thread_id):
+        while not self._stopped.wait(self.interval):
+            frame = sys._current_frames().get(thread_id)
+            stack = []
+            while frame is not None:
+                stack.append((frame.f_code.co_filename, _frame_name(frame.f_code)))
+                frame = frame.f_back
+            self.stacks[tuple(reversed(stack))] += 1
+
+    def start(self):
+        self._stopped.clear()
+        self._thread = threading.Thread(
+            target=self._sample, args=(threading.get_ident(),), daemon=True
+        )
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stopped.set()
+        self._thread.join()
+        return self
+
+    def write(self, path):
+        with open(path, "w") as f:
+            for stack, count in self.stacks.most_common():
+                f.write(";".join(name for _, name in stack) + f" {count}\n")
+
+    def stage_seconds(self):
+        seconds = {stage: 0.0 for stage, _ in STAGES}
+        for stack, count in self.stacks.items():
+            functions = {
+                name.split(":")[1]
+                for filename, name in stack
+                if _is_package_file(filename)
+            }
+            for stage, function in STAGES:
+                if function in functions:
+                    seconds[stage] += count * self.interval
+        return seconds
+
+
+def cprofile_stage_seconds(profiler):
+    """Returns the seconds spent in each stage, from the cumulative times of a cProfile run"""
+    stats = pstats.Stats(profiler).stats
+    seconds = {stage: 0.0 for stage, _ in STAGES}
+    for (filename, _, function), (_, _, _, cumulative, _) in stats.items():
+        for stage, stage_function in STAGES:
+            # the outermost call, as a stage method may call another one of the same name
+            if function == stage_function and _is_package_file(filename):
+                seconds[stage] = max(seconds[stage], cumulative)
+    return seconds
+
+
+def profile_call(func, path, profiler="sample"):
+    """Runs func under a profiler, writes the profile to path and returns (result, stage table)"""
+    if profiler not in PROFILERS:
+        raise ValueError("Invalid profiler. Choose 'sample' or 'cprofile'.")
+    start = time.perf_counter()
+    if profiler == "sample":
+        sampler = StackSampler().start()
+        try:
+            result = func()
+        finally:
+            sampler.stop()
+        sampler.write(path)
+        seconds = sampler.stage_seconds()
+    else:
+        cprofiler = cProfile.Profile()
+        result = cprofiler.runcall(func)
+        # pstats dump, read by snakeviz, gprof2dot and flameprof
+        cprofiler.dump_stats(path)
+        seconds = cprofile_stage_seconds(cprofiler)
+    total = time.perf_counter() - start
+    # everything outside the stages, e.g. tracking and saving; ingest is part of prepare
+    seconds["other"] = max(
+        0.0, total - sum(value for stage, value in seconds.items() if stage != "ingest")
+    )
+    table = [
+        {"stage": stage, "seconds": value, "share": value / total if total else 0.0}
+        for stage, value in seconds.items()
+    ]
+    table.append({"stage": "total", "seconds": total, "share": 1.0})
+    return result, table
@@ -0,0 +1,80 @@
+from joblib import cpu_count, parallel_config
+from threadpoolctl import threadpool_limits
+
+# estimator parameters sizing a model's own thread pool: n_jobs in scikit-learn
+# ensembles and neighbours, and in xgboost, where it is passed on as nthread
+THREAD_PARAMS = ("n_jobs", "nthread")
+
+
+def limit_threads(threads):
+    """Caps the BLAS and OpenMP thread pools of the calling process, for use as a worker initializer"""
+    threadpool_limits(limits=threads)
+
+
+class ResourceBudget:
+    """
+    Class for sharing a core budget between parallel trials, cross validation workers and native thread pools.
+
+    Left alone, every level of parallelism sizes itself to the whole machine: trials or configs run side by side,
+    GridSearchCV workers, the BLAS threads of the linear models and xgboost's own threads all ask for every core,
+    and the oversubscribed run ends up slower than a serial one. The budget splits cores between the levels so
+    their product never exceeds it. The outer units (trials run at once by TPESearch, or configs run at once by
+    BatchRunner) each get an equal share. Within a share, cross validation workers come first, as independent
+    folds scale better than threads inside one fit, and the threads left go to each fit's native pools: BLAS and
+    OpenMP through threadpoolctl, and the n_jobs of models that have one.
+
+    Attributes:
+        cores (int): Cores to share. Defaults to the cores available to the process.
+        outer (int): Units running side by side.
+        cv_jobs (int): Cross validation workers per unit.
+        threads (int): Native threads per fit.
+        report (dict): The allocation.
+
+    Methods:
+        configure(model):
+            Sets the thread count of a model that has its own thread pool.
+            Returns: the model.
+        limits():
+            Context manager capping the thread pools of this process.
+        workers():
+            Context manager starting joblib process workers, such as GridSearchCV's, with the same cap.
+        share():
+            Returns: the number of cores of one outer unit.
+    """
+
+    def __init__(self, n_cores=None, outer=1, cv=1):
+        if n_cores is not None and n_cores < 1:
+            raise ValueError("Invalid n_cores. Choose a positive number of cores.")
+        self.cores = n_cores or cpu_count()
+        self.outer = max(1, min(outer, self.cores))
+        share = self.share()
+        # the most cores used for the most folds at once, e.g. 4 workers x 2 threads on 8 cores rather than 5 x 1
+        self.cv_jobs = max(
+            range(1, max(1, min(cv, share)) + 1),
+            key=lambda jobs: (jobs * (share // jobs), jobs),
+        )
+        self.threads = max(1, share // self.cv_jobs)
+        self.report = {
+            "cores": self.cores,
+            "outer": self.outer,
+            "cv_jobs": self.cv_jobs,
+            "threads": self.threads,
+            "used": self.outer * self.cv_jobs * self.threads,
+        }
+
+    def share(self):
+        return max(1, self.cores // self.outer)
+
+    def configure(self, model):
+        params = model.get_params(deep=False)
+        model.set_params(
+            **{param: self.threads for param in THREAD_PARAMS if param in params}
+        )
+        return model
+
+    def limits(self):
+        return threadpool_limits(limits=self.threads)
+
+    def workers(self):
+        # only a named backend takes inner_max_num_threads; the workers are processes either way
+        return parallel_config(backend="loky", inner_max_num_threads=self.threads)
@@ -0,0 +1,286 @@
+import io
+import os
+import json
+import time
+import struct
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from joblib import cpu_count
+import numpy as np
+import pandas as pd
+from nicefitbro.artifact import load_artifact
+from nicefitbro.ingestors.csv_schema import (
+    schema_path,
+    read_header,
+    load_schema,
+    read_options,
+)
+from nicefitbro.ingestors.column_store_ingestor import (
+    SCHEMA_FILE,
+    SCHEMA_VERSION,
+    ColumnStoreIngestor,
+    is_column_store,
+)
+from nicefitbro.resources import ResourceBudget, limit_threads
+
+PREDICTION_COLUMN = "prediction"
+# a fixed size .npy header, rewritten with the final row count once every chunk is written
+NPY_HEADER_BYTES = 128
+# lines read to estimate the bytes per row of a CSV
+SAMPLE_LINES = 1_000
+
+# per worker process: the artifact, the model to score with and the source, opened once
+_worker = {}
+
+
+def _npy_header(n_rows):
+    """Returns a .npy version 1.0 header of NPY_HEADER_BYTES for a (1, n_rows) float64 array"""
+    magic = np.lib.format.magic(1, 0)
+    text = repr({"descr": "<f8", "fortran_order": False, "shape": (1, n_rows)})
+    length = NPY_HEADER_BYTES - len(magic) - 2
+    return magic + struct.pack("<H", length) + (text.ljust(length - 1) + "\n").encode()
+
+
+def _init_worker(artifact_path, model_name, source, columns, dtypes, threads=None):
+    if threads:
+        limit_threads(threads)
+    artifact = load_artifact(artifact_path)
+    _worker.update(
+        artifact=artifact,
+        model=artifact.model(model_name),
+        source=source,
+        columns=columns,
+        dtypes=dtypes,
+        # a column store is memory mapped once, and each chunk is a slice of it
+        store=ColumnStoreIngestor().ingest_data(source) if columns is None else None,
+    )
+
+
+def _read_chunk(start, stop):
+    if _worker["store"] is not None:
+        return _worker["store"].iloc[start:stop]
+    # a byte range of whole lines, parsed in this worker
+    with open(_worker["source"], "rb") as f:
+        f.seek(start)
+        raw = f.read(stop - start)
+    if _worker["dtypes"]:
+        try:
+            return pd.read_csv(
+                io.BytesIO(raw),
+                header=None,
+                names=_worker["columns"],
+                dtype=_worker["dtypes"],
+            )
+        except (ValueError, TypeError):
+            # a chunk the schema's dtypes do not parse, e.g. an empty integer cell
+            pass
+    return pd.read_csv(io.BytesIO(raw), header=None, names=_worker["columns"])
+
+
+def _score_chunk(start, stop):
+    artifact = _worker["artifact"]
+    features = artifact.prepare(_read_chunk(start, stop))
+    return np.asarray(_worker["model"].predict(features), dtype=np.float64)
+
+
+def _csv_ranges(path, chunk_rows):
+    """Splits a CSV file into byte ranges of about chunk_rows whole lines, after the header"""
+    size = os.path.getsize(path)
+    with open(path, "rb") as f:
+        f.readline()
+        start = f.tell()
+        sample = [line for line in (f.readline() for _ in range(SAMPLE_LINES)) if line]
+        chunk_bytes = max(1, chunk_rows * sum(map(len, sample)) // max(1, len(sample)))
+        while start < size:
+            f.seek(min(start + chunk_bytes, size))
+            # move on to the end of the line the estimate fell in
+            if f.tell() < size:
+                f.readline()
+            stop = f.tell()
+            yield start, stop
+            start = stop
+
+
+def _store_ranges(path, chunk_rows):
+    with open(os.path.join(path, SCHEMA_FILE)) as f:
+        n_rows = json.load(f)["n_rows"]
+    for start in range(0, n_rows, chunk_rows):
+        yield start, min(start + chunk_rows, n_rows)
+
+
+class PredictionWriter:
+    """
+    Class for appending predictions to a column store, chunk by chunk.
+
+    Predictions are written straight to the store's float64.npy after a fixed size header, so only the chunk being
+    written is held in memory whatever the number of rows. Closing rewrites the header with the final row count
+    and writes schema.json last, so a store whose writing was interrupted is never taken for a complete one (see
+    is_column_store). The output opens with ColumnStoreIngestor, memory mapped.
+
+    Attributes:
+        path (str): Directory of the column store.
+        n_rows (int): Rows written so far.
+
+    Methods:
+        append(values):
+            Writes the next predictions.
+        close():
+            Completes the store.
+        abort():
+            Closes the file without completing the store, after a failed chunk.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self.n_rows = 0
+        os.makedirs(path, exist_ok=True)
+        if os.path.exists(os.path.join(path, SCHEMA_FILE)):
+            os.remove(os.path.join(path, SCHEMA_FILE))
+        self._file = open(os.path.join(path, "float64.npy"), "wb")
+        self._file.write(_npy_header(0))
+
+    def append(self, values):
+        values = np.ascontiguousarray(values, dtype="<f8")
+        self._file.write(values.tobytes())
+        self.n_rows += len(values)
+
+    def close(self):
+        self._file.seek(0)
+        self._file.write(_npy_header(self.n_rows))
+        self._file.close()
+        schema = {
+            "version": SCHEMA_VERSION,
+            "n_rows": self.n_rows,
+            "columns": [
+                {
+                    "name": PREDICTION_COLUMN,
+                    "dtype": "float64",
+                    "group": "float64",
+                    "position": 0,
+                    "categories": None,
+                }
+            ],
+        }
+        with open(os.path.join(self.path, SCHEMA_FILE), "w") as f:
+            json.dump(schema, f, indent=2)
+
+    def abort(self):
+        self._file.close()
+
+
+class BatchScorer:
+    """
+    Class for scoring a large file with a saved artifact, in fixed-size chunks across a process pool.
+
+    The source, a CSV file or a column store, is split into chunks of about chunk_rows rows without being read: a
+    CSV into byte ranges of whole lines, found by seeking to an estimate of the chunk size and on to the next line
+    end, and a column store into row ranges. Each worker process opens the artifact once, memory mapped so the
+    workers share its pages, and for every chunk it is given reads the chunk itself, runs the artifact's fitted
+    steps and model on it and returns the predictions. The parent never holds the input: it keeps at most two
+    chunks per worker in flight and appends the predictions to a column store in the original row order as they
+    come back, so memory stays bounded by the chunk size whatever the size of the file. Each worker gets an even
+    share of n_cores for its native thread pools (see ResourceBudget). CSV chunks are split on line ends, so quoted
+    fields must not contain newlines, and are parsed with the dtypes of the file's schema sidecar when it has one
+    (see LocalFileIngestor), so they get the types the model was trained on rather than each chunk's own guess.
+
+    Attributes:
+        artifact_path (str): Path of the artifact written by NiceFitBro.save or save_artifact.
+        model_name (str): Model to score with. Defaults to the artifact's selected model.
+        chunk_rows (int): Rows per chunk.
+        n_jobs (int): Number of worker processes, used as given. 1 scores in the calling process. Defaults to
+            one per core.
+        resources (ResourceBudget): Workers and cores per worker.
+        report (dict): Rows, chunks, workers requested and used, seconds and rows per second of the last score().
+
+    Methods:
+        score(source, output):
+            Scores every row of source.
+            - source: path of a CSV file or a column store directory.
+            - output: directory of the column store the predictions are written to.
+            Returns: dict report.
+    """
+
+    def __init__(
+        self,
+        artifact_path,
+        model_name=None,
+        chunk_rows=100_000,
+        n_jobs=None,
+        n_cores=None,
+    ):
+        if chunk_rows < 1:
+            raise ValueError("Invalid chunk_rows. Choose a positive number of rows.")
+        self.artifact_path = artifact_path
+        self.model_name = model_name
+        self.chunk_rows = chunk_rows
+        self.n_jobs = n_jobs
+        # one worker per core unless told otherwise
+        self.resources = ResourceBudget(n_cores, outer=n_jobs or n_cores or cpu_count())
+        self.report = {}
+
+    def _source(self, source):
+        if is_column_store(source):
+            return None, None, _store_ranges(source, self.chunk_rows)
+        if not os.path.isfile(source):
+            raise ValueError(
+                f"Invalid source {source}. Choose a CSV file or a column store directory."
+            )
+        header = read_header(source)
+        schema = load_schema(schema_path(source), header)
+        dtypes = read_options(schema)["dtype"] if schema else None
+        return header, dtypes, _csv_ranges(source, self.chunk_rows)
+
+    def score(self, source, output):
+        start = time.perf_counter()
+        columns, dtypes, ranges = self._source(source)
+        writer = PredictionWriter(output)
+        # an explicit n_jobs is honoured even above the core count, where each worker gets one thread
+        workers = self.n_jobs or self.resources.outer
+        init_args = (self.artifact_path, self.model_name, source, columns, dtypes)
+        chunks = 0
+        try:
+            if workers == 1:
+                _init_worker(*init_args)
+                for chunk_start, chunk_stop in ranges:
+                    writer.append(_score_chunk(chunk_start, chunk_stop))
+                    chunks += 1
+            else:
+                with ProcessPoolExecutor(
+                    max_workers=workers,
+                    initializer=_init_worker,
+                    initargs=init_args + (self.resources.share(),),
+                ) as executor:
+                    # futures in row order; the oldest is written as soon as it is done
+                    pending = deque()
+                    for chunk_start, chunk_stop in ranges:
+                        if len(pending) >= 2 * workers:
+                            writer.append(pending.popleft().result())
+                            chunks += 1
+                        pending.append(
+                            executor.submit(_score_chunk, chunk_start, chunk_stop)
+                        )
+                    while pending:
+                        writer.append(pending.popleft().result())
+                        chunks += 1
+        except BaseException:
+            writer.abort()
+            raise
+        finally:
+            _worker.clear()
+        writer.close()
+        seconds = time.perf_counter() - start
+        self.report = {
+            "rows": writer.n_rows,
+            "chunks": chunks,
+            "workers_requested": self.n_jobs,
+            "workers": workers,
+            "seconds": seconds,
+            "rows_per_second": writer.n_rows / seconds if seconds else 0.0,
+            "output": output,
+        }
+        return self.report
+
+
+def score_file(artifact_path, source, output, **kwargs):
+    """Scores a CSV file or column store with a saved artifact, see BatchScorer"""
+    return BatchScorer(artifact_path, **kwargs).score(source, output)
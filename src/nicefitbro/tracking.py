@@ -0,0 +1,212 @@
+import json
+import time
+import queue
+import threading
+
+# MLflow's log_batch limits per request
+MAX_METRICS_PER_BATCH = 1000
+MAX_PARAMS_PER_BATCH = 100
+MAX_TAGS_PER_BATCH = 100
+_STOP = object()
+
+
+def _now_ms():
+    return int(time.time() * 1000)
+
+
+class ExperimentTracker:
+    """
+    Class for recording tuning, training and evaluation events to MLflow without blocking the caller.
+
+    The MLflow run is created when the tracker is, so a tracking URI MLflow cannot open raises there rather than
+    leaving a run that silently logs nothing. The log methods only timestamp the event and put it on a bounded
+    in-memory queue. A background writer thread drains the queue and sends the events to the run with log_batch, in
+    batches of up to batch_size events or every flush_interval seconds, so the store is written a batch at a time
+    instead of once per value. Params are deduplicated per batch, the last value winning, and sent apart from the
+    metrics and tags, so a param MLflow rejects cannot lose the metrics with it. When the writer falls behind by
+    max_pending events, new events are dropped and counted rather than slowing down the caller. The time spent
+    inside the log methods is accumulated in hot_path_seconds.
+
+    Attributes:
+        tracking_uri (str): MLflow tracking URI, a local SQLite database by default.
+        experiment_name (str): Name of the MLflow experiment, created if missing.
+        run_name (str): Optional name of the MLflow run.
+        batch_size (int): Maximum number of events sent per flush.
+        flush_interval (float): Maximum seconds an event waits before it is flushed.
+        max_pending (int): Maximum number of queued events.
+        run_id (str): Id of the MLflow run, once the writer has created it.
+        events (int): Number of events queued.
+        dropped (int): Number of events dropped because the queue was full or MLflow rejected them.
+        error (Exception): Last error raised by MLflow while writing, if any.
+        hot_path_seconds (float): Seconds spent by callers inside the log methods.
+
+    Methods:
+        log_metric(key, value, step=0) / log_param(key, value) / set_tag(key, value):
+            Queues an event.
+        log_params(params):
+            Queues one param event per key of a dict.
+        log_candidate(model_name, step, params, score, seconds):
+            Queues the params, CV score and fit time of one tuning candidate.
+        close():
+            Flushes every queued event, ends the run and stops the writer.
+            Returns: dict with the run id and the event, drop and overhead counts.
+    """
+
+    def __init__(
+        self,
+        tracking_uri="sqlite:///mlruns.db",
+        experiment_name="nicefitbro",
+        run_name=None,
+        batch_size=1000,
+        flush_interval=1.0,
+        max_pending=100_000,
+    ):
+        self.tracking_uri = tracking_uri
+        self.experiment_name = experiment_name
+        self.run_name = run_name
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.max_pending = max_pending
+        self.run_id = None
+        self.events = 0
+        self.dropped = 0
+        self.hot_path_seconds = 0.0
+        self.flushes = 0
+        self.error = None
+        # counted from both the caller and the writer thread
+        self._dropped_lock = threading.Lock()
+        self._client = self._start_run()
+        self._queue = queue.Queue(maxsize=max_pending)
+        self._writer = threading.Thread(target=self._write, daemon=True)
+        self._writer.start()
+
+    def _put(self, event):
+        start = time.perf_counter()
+        try:
+            self._queue.put_nowait(event)
+            self.events += 1
+        except queue.Full:
+            self._drop(1)
+        self.hot_path_seconds += time.perf_counter() - start
+
+    def _drop(self, n):
+        with self._dropped_lock:
+            self.dropped += n
+
+    def log_metric(self, key, value, step=0):
+        self._put(("metric", key, value, step, _now_ms()))
+
+    def log_param(self, key, value):
+        self._put(("param", key, value, 0, 0))
+
+    def log_params(self, params):
+        for key, value in params.items():
+            self.log_param(key, value)
+
+    def set_tag(self, key, value):
+        self._put(("tag", key, value, 0, 0))
+
+    def log_candidate(self, model_name, step, params, score, seconds):
+        # one step per grid candidate, so the MLflow UI plots score against candidate
+        self.set_tag(f"{model_name}.candidate.{step}", params)
+        self.log_metric(f"{model_name}.cv_score", score, step=step)
+        self.log_metric(f"{model_name}.fit_seconds", seconds, step=step)
+
+    def _start_run(self):
+        # imported here so importing nicefitbro never pays for loading mlflow
+        from mlflow.tracking import MlflowClient
+
+        client = MlflowClient(tracking_uri=self.tracking_uri)
+        experiment = client.get_experiment_by_name(self.experiment_name)
+        experiment_id = (
+            experiment.experiment_id
+            if experiment
+            else client.create_experiment(self.experiment_name)
+        )
+        run = client.create_run(experiment_id, run_name=self.run_name)
+        self.run_id = run.info.run_id
+        return client
+
+    def _send(self, n_events, **batch):
+        # one rejected request only loses its own events
+        try:
+            self._client.log_batch(self.run_id, **batch)
+        except Exception as error:
+            self.error = error
+            self._drop(n_events)
+
+    def _flush(self, events):
+        from mlflow.entities import Metric, Param, RunTag
+
+        metrics, params, tags = [], {}, {}
+        for kind, key, value, step, timestamp in events:
+            if kind == "metric":
+                metrics.append(Metric(key, float(value), timestamp, step))
+            elif kind == "param":
+                # MLflow rejects a batch that repeats a param key
+                params[key] = Param(key, _as_string(value))
+            else:
+                tags[key] = RunTag(key, _as_string(value))
+        params, tags = list(params.values()), list(tags.values())
+        # repeated keys that were merged away count as written
+        for i in range(0, len(params), MAX_PARAMS_PER_BATCH):
+            batch = params[i : i + MAX_PARAMS_PER_BATCH]
+            self._send(len(batch), params=batch)
+        while metrics or tags:
+            batch_metrics = metrics[:MAX_METRICS_PER_BATCH]
+            batch_tags = tags[:MAX_TAGS_PER_BATCH]
+            self._send(
+                len(batch_metrics) + len(batch_tags),
+                metrics=batch_metrics,
+                tags=batch_tags,
+            )
+            metrics = metrics[MAX_METRICS_PER_BATCH:]
+            tags = tags[MAX_TAGS_PER_BATCH:]
+        self.flushes += 1
+
+    def _write(self):
+        events = []
+        stopping = False
+        while not stopping:
+            deadline = time.monotonic() + self.flush_interval
+            while len(events) < self.batch_size:
+                try:
+                    event = self._queue.get(timeout=max(deadline - time.monotonic(), 0))
+                except queue.Empty:
+                    break
+                if event is _STOP:
+                    stopping = True
+                    break
+                events.append(event)
+            if events:
+                self._flush(events)
+            events = []
+        try:
+            self._client.set_terminated(
+                self.run_id, status="FAILED" if self.error else "FINISHED"
+            )
+        except Exception as error:
+            # tracking must never take the run down with it
+            self.error = error
+
+    def close(self):
+        self._queue.put(_STOP)
+        self._writer.join()
+        return {
+            "run_id": self.run_id,
+            "events": self.events,
+            "dropped": self.dropped,
+            "flushes": self.flushes,
+            "hot_path_seconds": self.hot_path_seconds,
+            "error": repr(self.error) if self.error else None,
+        }
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+
+def _as_string(value):
+    return value if isinstance(value, str) else json.dumps(value, default=str)
@@ -0,0 +1,102 @@
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+from sklearn.neighbors import KNeighborsRegressor
+
+from nicefitbro.artifact import load_artifact, save_artifact
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.feature_engineering.feature_scaling import FeatureScaler
+from nicefitbro.models.export.compiled import CompiledModel
+from nicefitbro.preprocess.missing_value_processor import MissingValuePreprocessor
+
+
+@pytest.fixture(scope="module")
+def fitted():
+    data = make_regression_frame(500, 4, missing_frac=0.05)
+    steps = [MissingValuePreprocessor(method="mean"), FeatureScaler(method="standard")]
+    prepared = steps[1].engineer_features(steps[0].preprocess_data(data.copy()))
+    X, y = prepared.drop(columns=["target"]), data["target"]
+    models = {
+        "ridge": Ridge().fit(X, y),
+        "rfr": RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y),
+        "knn": KNeighborsRegressor().fit(X, y),
+    }
+    new_data = make_regression_frame(50, 4, missing_frac=0.05, seed=1)
+    return steps, list(X.columns), models, new_data
+
+
+def _expected(steps, feature_names, model, data):
+    for step in steps:
+        data = step.transform(data)
+    return model.predict(data[feature_names])
+
+
+def test_round_trip_predictions(fitted, tmp_path):
+    """A loaded artifact predicts like the steps and models it was saved from"""
+    steps, feature_names, models, new_data = fitted
+    path = str(tmp_path / "model.nfb")
+    save_artifact(path, steps, feature_names, "target", models, selected_model="rfr")
+    artifact = load_artifact(path)
+    assert artifact.feature_names == feature_names
+    assert artifact.header["models"] == {
+        "ridge": "compiled",
+        "rfr": "compiled",
+        "knn": "original",
+    }
+    for name, model in models.items():
+        np.testing.assert_allclose(
+            artifact.predict(new_data, name),
+            _expected(steps, feature_names, model, new_data),
+            rtol=1e-6,
+        )
+    # the selected model by default
+    np.testing.assert_array_equal(
+        artifact.predict(new_data), artifact.predict(new_data, "rfr")
+    )
+
+
+def test_arrays_are_read_only_views_of_the_file(fitted, tmp_path):
+    """Compiled model arrays are memory mapped, not copied"""
+    steps, feature_names, models, _ = fitted
+    path = str(tmp_path / "model.nfb")
+    save_artifact(path, steps, feature_names, "target", models, selected_model="rfr")
+    compiled = load_artifact(path).model("rfr")
+    assert isinstance(compiled, CompiledModel)
+    threshold = compiled.arrays["threshold"]
+    assert not threshold.flags.writeable
+    base = threshold
+    while getattr(base, "base", None) is not None and not isinstance(base, np.memmap):
+        base = base.base
+    assert isinstance(base, np.memmap)
+
+
+def test_originals_are_kept_next_to_compiled_models(fitted, tmp_path):
+    """With originals=True the fitted estimator is stored too"""
+    steps, feature_names, models, _ = fitted
+    path = str(tmp_path / "model.nfb")
+    save_artifact(
+        path,
+        steps,
+        feature_names,
+        "target",
+        models,
+        selected_model="ridge",
+        originals=True,
+    )
+    original = load_artifact(path).model("ridge", original=True)
+    assert isinstance(original, Ridge)
+    np.testing.assert_array_equal(original.coef_, models["ridge"].coef_)
+
+
+def test_invalid_file_and_model_are_rejected(fitted, tmp_path):
+    """Other files and unknown model names raise ValueError"""
+    steps, feature_names, models, _ = fitted
+    other = tmp_path / "other.bin"
+    other.write_bytes(b"\0" * 64)
+    with pytest.raises(ValueError, match="Invalid artifact"):
+        load_artifact(str(other))
+    path = str(tmp_path / "model.nfb")
+    save_artifact(path, steps, feature_names, "target", models, selected_model="rfr")
+    with pytest.raises(ValueError, match="Invalid model"):
+        load_artifact(path).model("xgb")
@@ -0,0 +1,64 @@
+import asyncio
+
+import pandas as pd
+import pytest
+
+from nicefitbro.benchmarks.local_s3 import LocalS3Client
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.ingestors.async_s3_ingestor import AsyncS3Ingestor
+
+
+@pytest.fixture
+def client():
+    client = LocalS3Client(page_size=3)
+    for i in range(7):
+        client.put_object(
+            Bucket="bucket",
+            Key=f"runs/part-{i:02d}.csv",
+            Body=make_regression_frame(20, 3, seed=i).to_csv(index=False),
+        )
+    return client
+
+
+def _expected(n_objects):
+    return pd.concat(
+        [make_regression_frame(20, 3, seed=i) for i in range(n_objects)],
+        ignore_index=True,
+    )
+
+
+def test_ingest_concatenates_every_page_in_key_order(client):
+    """Objects listed over several pages come back as one frame in key order"""
+    data = AsyncS3Ingestor(max_concurrency=2).ingest_data(client, "bucket", "runs/")
+    pd.testing.assert_frame_equal(data, _expected(7))
+
+
+def test_zero_byte_markers_are_skipped(client):
+    """_SUCCESS markers and directory placeholders are not parsed"""
+    client.put_object(Bucket="bucket", Key="runs/_SUCCESS", Body=b"")
+    client.put_object(Bucket="bucket", Key="runs/empty/", Body=b"")
+    data = AsyncS3Ingestor().ingest_data(client, "bucket", "runs/")
+    pd.testing.assert_frame_equal(data, _expected(7))
+
+
+def test_on_chunk_runs_on_every_object(client):
+    """on_chunk is applied to each parsed object"""
+    data = AsyncS3Ingestor().ingest_data(
+        client, "bucket", "runs/", on_chunk=lambda df: df.head(1)
+    )
+    assert len(data) == 7
+
+
+def test_empty_prefix_raises(client):
+    """A prefix with no objects is an error, not an empty frame"""
+    with pytest.raises(ValueError, match="No objects found"):
+        AsyncS3Ingestor().ingest_data(client, "bucket", "missing/")
+
+
+def test_ingest_inside_a_running_event_loop(client):
+    """ingest_data works when called from code already running an event loop"""
+
+    async def ingest():
+        return AsyncS3Ingestor().ingest_data(client, "bucket", "runs/")
+
+    pd.testing.assert_frame_equal(asyncio.run(ingest()), _expected(7))
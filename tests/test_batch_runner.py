@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+
+from nicefitbro.batch_runner import BatchRunner
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.config.run_config import RunConfig
+from nicefitbro.ingestors.local_ingestor import LocalFileIngestor
+from nicefitbro.nicefitbro import NiceFitBro
+
+
+@pytest.fixture(scope="module")
+def file_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("data") / "data.csv"
+    make_regression_frame(400, 6, missing_frac=0.05).to_csv(path, index=False)
+    return str(path)
+
+
+def _config(file_path, **fields):
+    return RunConfig(
+        target="target",
+        file_path=file_path,
+        missing_value_method="mean",
+        model_types=["ridge", "lr"],
+        schema=False,
+        **fields,
+    )
+
+
+def _configs(file_path):
+    return [
+        _config(file_path, feature_scaler_method="standard"),
+        _config(file_path, feature_scaler_method="minmax"),
+        _config(
+            file_path,
+            outlier_detector_method="zscore",
+            feature_scaler_method="standard",
+        ),
+        # scaling fitted in each fold, after the row filter the third config shares
+        _config(
+            file_path,
+            outlier_detector_method="zscore",
+            feature_scaler_method="standard",
+            in_fold=True,
+        ),
+    ]
+
+
+def _assert_same_performance(actual, expected):
+    assert actual.keys() == expected.keys()
+    for model_type, metrics in expected.items():
+        for name, value in metrics.items():
+            np.testing.assert_allclose(actual[model_type][name], value, rtol=1e-9)
+
+
+def test_shared_prefix_runs_once(file_path, monkeypatch):
+    """Ingest and imputation shared by every config run a single time"""
+    ingests = []
+    ingest_data = LocalFileIngestor.ingest_data
+
+    def counting(self, *args, **kwargs):
+        ingests.append(args)
+        return ingest_data(self, *args, **kwargs)
+
+    monkeypatch.setattr(LocalFileIngestor, "ingest_data", counting)
+    configs = _configs(file_path)[:3]
+    runner = BatchRunner(configs, n_jobs=1)
+    runner.run()
+    assert len(ingests) == 1
+    # ingest and mean imputation once, then each config's own tail
+    assert runner.step_counts == {"planned": 3 + 3 + 4, "run": 2 + 1 + 1 + 2}
+
+
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_results_match_separate_runs(file_path, n_jobs):
+    """Each config gives the same models and scores as its own sendit()"""
+    configs = _configs(file_path)
+    results = BatchRunner(configs, n_jobs=n_jobs).run()
+    for run_config, (trained_models, performance) in zip(configs, results):
+        nice_fit_bro = NiceFitBro(run_config)
+        expected_models, expected_performance = nice_fit_bro.sendit()
+        assert trained_models.keys() == expected_models.keys()
+        _assert_same_performance(performance, expected_performance)
+
+
+def test_in_fold_steps_stay_in_the_models(file_path):
+    """An in_fold config shares the steps up to its last row filter and no further"""
+    runner = BatchRunner(_configs(file_path), n_jobs=1)
+    assert [kind for _, kind, _ in runner.plans[3]] == [
+        "ingest",
+        "preprocess",
+        "preprocess",
+    ]
+    # the same keys as the third config's first steps, so they are run once for both
+    assert [path for path, _, _ in runner.plans[3]] == [
+        path for path, _, _ in runner.plans[2][:3]
+    ]
+    assert [type(step).__name__ for _, step in runner.fold_steps[3]] == [
+        "FeatureScaler"
+    ]
+    assert runner.fold_steps[2] == []
@@ -0,0 +1,85 @@
+import pytest
+
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.models.factory.data_factory import DataFactory
+from nicefitbro.models.factory.model_factory import ModelFactory
+from nicefitbro.models.tune import tuner
+from nicefitbro.models.tune.checkpoint import TuningCheckpoint
+from nicefitbro.models.tune.tuner import HyperparameterTuner
+
+
+class Interrupted(Exception):
+    pass
+
+
+@pytest.fixture
+def scored(monkeypatch):
+    """Counts cross validations, and interrupts the run after a given number"""
+    calls = {"count": 0, "limit": None}
+    cross_val_score = tuner.cross_val_score
+
+    def counting(*args, **kwargs):
+        if calls["limit"] is not None and calls["count"] >= calls["limit"]:
+            raise Interrupted
+        calls["count"] += 1
+        return cross_val_score(*args, **kwargs)
+
+    monkeypatch.setattr(tuner, "cross_val_score", counting)
+    return calls
+
+
+def _data_factory(seed=0):
+    return DataFactory(
+        make_regression_frame(300, 4, missing_frac=0, seed=seed), "target"
+    )
+
+
+def _tune(data_factory, checkpoint_dir):
+    checkpoint = TuningCheckpoint(
+        str(checkpoint_dir), data_factory.X_train, data_factory.y_train
+    )
+    return HyperparameterTuner(
+        data_factory, ModelFactory(["ridge"]), checkpoint=checkpoint
+    ).tune_hyperparameters()
+
+
+def test_interrupted_run_resumes_from_scored_candidates(scored, tmp_path):
+    """A rerun after a crash only scores the candidates that were not finished"""
+    data_factory = _data_factory()
+    scored["limit"] = 2
+    with pytest.raises(Interrupted):
+        _tune(data_factory, tmp_path)
+    assert scored["count"] == 2
+
+    scored["limit"], scored["count"] = None, 0
+    resumed = _tune(data_factory, tmp_path)
+    # ridge has three alphas, two of them scored before the crash
+    assert scored["count"] == 1
+    assert (
+        resumed["ridge"].alpha == _tune(data_factory, tmp_path / "fresh")["ridge"].alpha
+    )
+
+
+def test_finished_model_is_not_refit(scored, tmp_path):
+    """A rerun of a finished model loads it without scoring any candidate"""
+    data_factory = _data_factory()
+    first = _tune(data_factory, tmp_path)
+    scored["count"] = 0
+    rerun = _tune(data_factory, tmp_path)
+    assert scored["count"] == 0
+    assert rerun["ridge"].alpha == first["ridge"].alpha
+    assert (rerun["ridge"].coef_ == first["ridge"].coef_).all()
+
+
+def test_other_training_data_is_not_reused(scored, tmp_path):
+    """A checkpoint of different training rows is ignored"""
+    _tune(_data_factory(), tmp_path)
+    scored["count"] = 0
+    _tune(_data_factory(seed=1), tmp_path)
+    assert scored["count"] == 3
+    # the same features with another target are other training data too
+    X, y = _data_factory().X_train, _data_factory().y_train
+    assert (
+        TuningCheckpoint(str(tmp_path), X, y).data_hash
+        != TuningCheckpoint(str(tmp_path), X, y + 1).data_hash
+    )
@@ -0,0 +1,72 @@
+import json
+
+import pytest
+
+from nicefitbro.cli import _overrides, build_run_config, list_benchmarks, main
+
+
+def _error(capsys):
+    return capsys.readouterr().err
+
+
+def test_missing_config_is_an_error(tmp_path, capsys):
+    """A config file that does not exist exits with 2 and a message"""
+    assert main(["run", str(tmp_path / "missing.yaml")]) == 2
+    assert "nicefitbro: error:" in _error(capsys)
+
+
+def test_invalid_yaml_is_an_error(tmp_path, capsys):
+    """A YAML syntax error exits with 2 and names the config"""
+    pytest.importorskip("yaml")
+    path = tmp_path / "config.yaml"
+    path.write_text("target: [unclosed\n")
+    assert main(["run", str(path)]) == 2
+    assert "Invalid config" in _error(capsys)
+
+
+def test_unknown_field_is_an_error(tmp_path, capsys):
+    """A field RunConfig does not have exits with 2"""
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"target": "target", "file_path": "data.csv"}))
+    assert main(["run", str(path), "--set", "n_trees=3"]) == 2
+    assert "Invalid RunConfig fields ['n_trees']" in _error(capsys)
+
+
+def test_unknown_bench_argument_is_an_error(capsys):
+    """A --set key a benchmark's run() does not take exits with 2 before running"""
+    assert main(["bench", "fused_kernel", "--set", "n_rowz=10"]) == 2
+    err = _error(capsys)
+    assert "Invalid --set ['n_rowz'] for fused_kernel" in err
+    assert "n_rows" in err
+
+
+def test_overrides_are_parsed_as_json(tmp_path):
+    """--set values that parse as JSON keep their type"""
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"target": "target", "file_path": "data.csv"}))
+    run_config = build_run_config(
+        str(path), _overrides(['model_types=["lr"]', "quick_rank=true"])
+    )
+    assert run_config.model_types == ["lr"]
+    assert run_config.quick_rank is True
+
+
+def test_benchmarks_are_listed(capsys):
+    """bench --list prints every benchmark without its prefix"""
+    assert main(["bench", "--list"]) == 0
+    assert capsys.readouterr().out.split() == list_benchmarks()
+    assert "fused_kernel" in list_benchmarks()
+
+
+def test_errors_during_the_run_propagate(tmp_path, monkeypatch):
+    """A ValueError raised by the fit itself is not reported as bad input"""
+    import nicefitbro.cli as cli
+
+    def fail(run_config, save=None):
+        raise ValueError("failed inside the fit")
+
+    monkeypatch.setattr(cli, "_fit", fail)
+    path = tmp_path / "config.json"
+    path.write_text(json.dumps({"target": "target", "file_path": "data.csv"}))
+    with pytest.raises(ValueError, match="failed inside the fit"):
+        main(["run", str(path)])
@@ -0,0 +1,50 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nicefitbro.ingestors.column_store_ingestor import ColumnStoreIngestor
+
+
+def _frame():
+    return pd.DataFrame(
+        {
+            "x": np.arange(6, dtype=np.float32),
+            "n": np.arange(6, dtype=np.int64),
+            "flag": [True, False] * 3,
+            "when": pd.date_range("2024-01-01", periods=6, freq="H"),
+            "city": ["a", "b", None, "a", "c", "b"],
+            "size": pd.Categorical(
+                ["s", "m", "l", "s", "m", "l"], categories=["s", "m", "l"], ordered=True
+            ),
+        }
+    )
+
+
+def test_round_trip(tmp_path):
+    """Every supported dtype comes back with its values and dtype"""
+    data = _frame()
+    ColumnStoreIngestor().write(data, tmp_path / "store")
+    loaded = ColumnStoreIngestor().ingest_data(tmp_path / "store")
+    pd.testing.assert_frame_equal(loaded, data)
+
+
+def test_columns_are_memory_mapped(tmp_path):
+    """Numeric columns are views of the memory mapped arrays, not copies"""
+    ColumnStoreIngestor().write(_frame(), tmp_path / "store")
+    loaded = ColumnStoreIngestor().ingest_data(tmp_path / "store")
+    assert isinstance(loaded["x"].to_numpy().base, np.memmap)
+
+
+@pytest.mark.parametrize(
+    "column",
+    [
+        pd.array([1, None, 3], dtype="Int64"),
+        pd.date_range("2024-01-01", periods=3, tz="UTC"),
+        [1, "a", 2.5],
+    ],
+)
+def test_unsupported_dtypes_are_rejected(tmp_path, column):
+    """Columns that would not round-trip fail before anything is written"""
+    with pytest.raises(ValueError, match="Invalid column"):
+        ColumnStoreIngestor().write(pd.DataFrame({"c": column}), tmp_path / "store")
+    assert not (tmp_path / "store").exists()
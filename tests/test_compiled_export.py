@@ -0,0 +1,77 @@
+import numpy as np
+import pytest
+from sklearn.base import clone
+from sklearn.neighbors import KNeighborsRegressor
+
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.models.export.compiled import (
+    CompiledModel,
+    check_equivalence,
+    compile_model,
+)
+from nicefitbro.models.factory.model_factory import ModelFactory
+
+COMPILED_TYPES = [
+    "lr",
+    "ridge",
+    "lasso",
+    "elastic",
+    "bayesridge",
+    "sgd",
+    "poly",
+    "dtr",
+    "rfr",
+    "gbr",
+    "xgb",
+]
+
+
+@pytest.fixture(scope="module")
+def data():
+    frame = make_regression_frame(400, 4, missing_frac=0)
+    return frame.drop(columns=["target"]), frame["target"]
+
+
+def _fitted(model_type, X, y):
+    model = clone(ModelFactory([model_type]).models[model_type])
+    if model_type in ("rfr", "gbr", "xgb"):
+        model.set_params(n_estimators=20)
+    return model.fit(X, y)
+
+
+@pytest.mark.parametrize("model_type", COMPILED_TYPES)
+def test_compiled_predictions_match(model_type, data):
+    """Every exportable model type predicts the same from its compiled form"""
+    X, y = data
+    model = _fitted(model_type, X, y)
+    compiled = compile_model(model, feature_names=list(X.columns))
+    report = check_equivalence(model, compiled, X)
+    assert report["rows"] == len(X)
+    assert report["equivalent"], report
+
+
+@pytest.mark.parametrize("model_type", ["ridge", "poly", "rfr", "xgb"])
+def test_saved_model_loads_and_matches(model_type, data, tmp_path):
+    """A saved compiled model loads without pickle and predicts the same"""
+    X, y = data
+    model = _fitted(model_type, X, y)
+    compile_model(model, feature_names=list(X.columns)).save(tmp_path / "model.npz")
+    loaded = CompiledModel.load(tmp_path / "model.npz")
+    assert check_equivalence(model, loaded, X)["equivalent"]
+    # columns are aligned by name
+    np.testing.assert_array_equal(loaded.predict(X[X.columns[::-1]]), loaded.predict(X))
+
+
+def test_xgb_missing_values_take_the_default_branch():
+    """Missing values follow xgboost's learned default direction"""
+    frame = make_regression_frame(400, 4, missing_frac=0.2)
+    X, y = frame.drop(columns=["target"]), frame["target"]
+    model = _fitted("xgb", X, y)
+    assert check_equivalence(model, compile_model(model), X)["equivalent"]
+
+
+def test_unsupported_model_is_rejected(data):
+    """A model type without a compiled form raises ValueError"""
+    X, y = data
+    with pytest.raises(ValueError, match="Invalid model for export"):
+        compile_model(KNeighborsRegressor().fit(X, y))
@@ -0,0 +1,108 @@
+import os
+
+import pandas as pd
+
+from nicefitbro.ingestors.csv_schema import (
+    SCHEMA_SUFFIX,
+    SHARDS_SCHEMA_FILE,
+    load_schema,
+    schema_path,
+)
+from nicefitbro.ingestors.local_ingestor import LocalFileIngestor
+
+
+def _frame(n_rows=20):
+    return pd.DataFrame(
+        {
+            "id": range(n_rows),
+            "x0": [i / 10 for i in range(n_rows)],
+            "city": ["a", "b"] * (n_rows // 2),
+            "api": ["key"] * n_rows,
+        }
+    )
+
+
+def test_first_read_saves_the_schema(tmp_path):
+    """The first read infers and saves a sidecar that later reads go through"""
+    path = str(tmp_path / "data.csv")
+    _frame().to_csv(path, index=False)
+    first = LocalFileIngestor().ingest_data(path)
+    schema = load_schema(schema_path(path))
+    # every column, the dropped one included
+    assert schema["dtypes"] == {
+        "id": "int64",
+        "x0": "float64",
+        "city": "category",
+        "api": "category",
+    }
+    assert schema["skip"] == []
+
+    second = LocalFileIngestor().ingest_data(path)
+    pd.testing.assert_frame_equal(first, second)
+    assert list(second.columns) == ["id", "x0", "city"]
+    assert second["city"].dtype == "category"
+
+
+def test_empty_integer_cell_is_inferred_again(tmp_path):
+    """A row appended with an empty integer cell rewrites the schema instead of failing"""
+    path = str(tmp_path / "data.csv")
+    _frame().to_csv(path, index=False)
+    LocalFileIngestor().ingest_data(path)
+    with open(path, "a") as f:
+        f.write(",2.5,a,key\n")
+
+    df = LocalFileIngestor().ingest_data(path)
+    assert len(df) == 21 and df["id"].isna().sum() == 1
+    assert load_schema(schema_path(path))["dtypes"]["id"] == "float64"
+    # the rewritten schema reads the file from then on
+    pd.testing.assert_frame_equal(LocalFileIngestor().ingest_data(path), df)
+
+
+def test_changed_header_is_inferred_again(tmp_path):
+    """A schema whose columns no longer match the header is replaced"""
+    path = str(tmp_path / "data.csv")
+    _frame().to_csv(path, index=False)
+    LocalFileIngestor().ingest_data(path)
+    _frame().assign(x1=1.0).to_csv(path, index=False)
+
+    df = LocalFileIngestor().ingest_data(path)
+    assert "x1" in df
+    assert "x1" in load_schema(schema_path(path))["dtypes"]
+
+
+def test_filtered_read_saves_no_schema(tmp_path):
+    """A read that only sees the shards a filter kept leaves no sidecar behind"""
+    for year in (2023, 2024):
+        shard = tmp_path / f"year={year}"
+        shard.mkdir()
+        _frame().to_csv(shard / "part-0.csv", index=False)
+    ingestor = LocalFileIngestor()
+    df = ingestor.ingest_data(str(tmp_path), filters={"year": "2024"})
+    assert len(df) == 20
+    assert not os.path.exists(tmp_path / SHARDS_SCHEMA_FILE)
+
+    assert len(ingestor.ingest_data(str(tmp_path))) == 40
+    assert os.path.exists(tmp_path / SHARDS_SCHEMA_FILE)
+
+
+def test_drop_cols_apply_to_each_read(tmp_path):
+    """Columns dropped on the first read are still read by a later one that keeps them"""
+    path = str(tmp_path / "data.csv")
+    _frame().to_csv(path, index=False)
+    ingestor = LocalFileIngestor()
+    assert "api" not in ingestor.ingest_data(path)
+    kept = ingestor.ingest_data(path, drop_cols=None)
+    assert list(kept.columns) == ["id", "x0", "city", "api"]
+    assert kept["api"].dtype == "category"
+    assert list(ingestor.ingest_data(path, drop_cols=["city"]).columns) == [
+        "id",
+        "x0",
+        "api",
+    ]
+
+
+def test_schema_path_accepts_path_objects(tmp_path):
+    """A pathlib.Path has the same sidecar as its string"""
+    path = tmp_path / "data.csv"
+    assert schema_path(path) == schema_path(str(path)) == str(path) + SCHEMA_SUFFIX
+    assert schema_path(tmp_path) == os.path.join(str(tmp_path), SHARDS_SCHEMA_FILE)
@@ -0,0 +1,30 @@
+import numpy as np
+import pandas as pd
+
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.models.factory.data_factory import DataFactory
+
+
+def test_splits_are_views_of_one_block():
+    """X_train and X_val share the numeric block and match train_test_split's rows"""
+    data = make_regression_frame(300, 4, missing_frac=0)
+    data_factory = DataFactory(data, "target")
+    assert isinstance(data_factory.X, pd.DataFrame)
+    assert np.shares_memory(data_factory.X_train.to_numpy(), data_factory.block)
+    pd.testing.assert_frame_equal(
+        data_factory.X_val,
+        data.drop(columns=["target"]).loc[data_factory.X_val.index],
+    )
+    assert len(data_factory.X_train) + len(data_factory.X_val) == len(data)
+
+
+def test_non_numeric_columns_stay_out_of_the_block():
+    """A categorical column keeps the block numeric and comes back in its position"""
+    data = make_regression_frame(100, 3, missing_frac=0)
+    data.insert(1, "colour", np.where(np.arange(100) % 2, "red", "blue"))
+    data_factory = DataFactory(data, "target", precision="float32")
+    assert data_factory.block.dtype == np.float32
+    assert data_factory.other_names == ["colour"]
+    X_train = data_factory.X_train
+    assert list(X_train.columns) == data_factory.feature_names
+    pd.testing.assert_series_equal(X_train["colour"], data.loc[X_train.index, "colour"])
@@ -0,0 +1,61 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.feature_engineering.feature_scaling import FeatureScaler
+from nicefitbro.pipeliners.fused_kernel import fuse_steps, run_steps
+from nicefitbro.preprocess.missing_value_processor import MissingValuePreprocessor
+from nicefitbro.preprocess.outlier_detector import OutlierDetector
+
+
+def _steps(outlier_method="iqr", scaler_method="standard"):
+    return [
+        ("preprocess", MissingValuePreprocessor(method="mean")),
+        ("preprocess", OutlierDetector(method=outlier_method)),
+        ("engineer", FeatureScaler(method=scaler_method)),
+    ]
+
+
+@pytest.mark.parametrize("outlier_method", ["iqr", "zscore"])
+@pytest.mark.parametrize("scaler_method", ["standard", "minmax"])
+def test_fused_matches_unfused(outlier_method, scaler_method):
+    """The fused chain gives the output of the steps run one after the other"""
+    data = make_regression_frame(2_000, 5)
+    unfused = run_steps(data.copy(), _steps(outlier_method, scaler_method), "target")
+    fused_steps = fuse_steps(_steps(outlier_method, scaler_method))
+    assert [kind for kind, _ in fused_steps] == ["fused"]
+    fused = run_steps(data.copy(), fused_steps, "target")
+    assert fused.shape == unfused.shape
+    np.testing.assert_allclose(fused.to_numpy(), unfused.to_numpy(), atol=1e-10)
+
+
+def test_fused_scaling_leaves_input_unscaled():
+    """Without imputation the caller's frame is not changed, as it is not unfused"""
+    data = pd.DataFrame(
+        np.asfortranarray(np.random.default_rng(0).normal(5, 2, (500, 4))),
+        columns=list("abcd"),
+    )
+    before = data.copy()
+    steps = [
+        ("preprocess", OutlierDetector(method="zscore")),
+        ("engineer", FeatureScaler(method="standard")),
+    ]
+    run_steps(data, fuse_steps(steps), "target")
+    pd.testing.assert_frame_equal(data, before)
+
+
+def test_fused_imputation_fills_input_in_place():
+    """Imputation fills the caller's float block in place, as fillna(inplace=True) does"""
+    values = np.asfortranarray(np.random.default_rng(0).normal(5, 2, (500, 3)))
+    values[::7, 1] = np.nan
+    unfused_input = pd.DataFrame(values.copy(order="F"), columns=list("abc"))
+    fused_input = pd.DataFrame(values, columns=list("abc"))
+    steps = [
+        ("preprocess", MissingValuePreprocessor(method="mean")),
+        ("engineer", FeatureScaler(method="minmax")),
+    ]
+    run_steps(unfused_input, steps)
+    run_steps(fused_input, fuse_steps(steps))
+    assert not fused_input.isna().any().any()
+    np.testing.assert_allclose(fused_input.to_numpy(), unfused_input.to_numpy())
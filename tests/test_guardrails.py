@@ -0,0 +1,100 @@
+import numpy as np
+import pytest
+from sklearn.base import clone
+from sklearn.neighbors import KNeighborsRegressor
+
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.feature_engineering.feature_selection import FeatureSelection
+from nicefitbro.models.factory.guardrails import (
+    SampledKNeighborsRegressor,
+    poly_terms,
+)
+from nicefitbro.models.factory.model_factory import ModelFactory
+from nicefitbro.pipeliners.in_fold import MODEL_STEP
+
+
+def _fit_substitute(random_state):
+    data = make_regression_frame(600, 4, missing_frac=0)
+    X, y = data.drop(columns=["target"]), data["target"]
+    model_factory = ModelFactory(["gpr"])
+    model_factory.apply_guardrails(
+        *X.shape, thresholds={"gpr_max_rows": 100}, random_state=random_state
+    )
+    assert model_factory.substitutions["gpr"]["substitute"] == "nystroem_gp"
+    return clone(model_factory.models["gpr"]).fit(X, y).predict(X)
+
+
+def test_gpr_substitute_is_reproducible():
+    """The Nystroem substitute gives the same model for the same random_state"""
+    np.testing.assert_array_equal(_fit_substitute(0), _fit_substitute(0))
+    assert not np.array_equal(_fit_substitute(0), _fit_substitute(1))
+
+
+def _data(n_rows, n_features):
+    data = make_regression_frame(n_rows, n_features, missing_frac=0)
+    return data.drop(columns=["target"]), data["target"]
+
+
+def test_knn_is_sampled_above_its_threshold():
+    """Brute force KNN on many rows searches a sample of max_rows rows"""
+    X, y = _data(600, 20)
+    model_factory = ModelFactory(["knn"])
+    model_factory.apply_guardrails(*X.shape, thresholds={"knn_max_rows": 200})
+    report = model_factory.substitutions["knn"]
+    assert report["substitute"] == "sampled_200_rows_knn"
+    assert "600 rows > knn_max_rows=200" in report["reason"]
+    model = model_factory.models["knn"]
+    assert isinstance(model, SampledKNeighborsRegressor)
+    assert model_factory.hyperparameters["knn"] == {"n_neighbors": [3, 5, 7]}
+    assert clone(model).fit(X, y).knn_.n_samples_fit_ == 200
+
+
+@pytest.mark.parametrize(
+    "n_rows, n_features, thresholds",
+    [
+        # under the row threshold
+        (600, 20, {"knn_max_rows": 1_000}),
+        # few enough features for a kd-tree
+        (600, 10, {"knn_max_rows": 200}),
+        # guardrail turned off
+        (600, 20, {"knn_max_rows": None}),
+    ],
+)
+def test_knn_is_kept_below_its_threshold(n_rows, n_features, thresholds):
+    """Exact KNN stays when it scales, or when its guardrail is off"""
+    model_factory = ModelFactory(["knn"])
+    model_factory.apply_guardrails(n_rows, n_features, thresholds=thresholds)
+    assert "knn" not in model_factory.substitutions
+    assert isinstance(model_factory.models["knn"], KNeighborsRegressor)
+
+
+def test_poly_keeps_the_top_features_within_its_terms():
+    """A degree 2 expansion over max_terms is limited to the best k features"""
+    X, y = _data(300, 12)
+    model_factory = ModelFactory(["poly", "lr"])
+    model_factory.apply_guardrails(*X.shape, thresholds={"poly_max_terms": 30})
+    assert poly_terms(12) > 30 >= poly_terms(6)
+    assert model_factory.substitutions["poly"]["substitute"] == "poly_top_6_features"
+    assert (
+        "91 terms > poly_max_terms=30" in model_factory.substitutions["poly"]["reason"]
+    )
+    assert "lr" not in model_factory.substitutions
+    model = clone(model_factory.models["poly"]).fit(X, y)
+    assert model.named_steps["poly"].n_output_features_ == poly_terms(6)
+
+    kept = ModelFactory(["poly"])
+    kept.apply_guardrails(*X.shape, thresholds={"poly_max_terms": None})
+    assert kept.substitutions == {}
+
+
+def test_poly_substitute_fits_fewer_columns_than_planned():
+    """In-fold selection leaving fewer columns than k keeps them all"""
+    X, y = _data(300, 12)
+    model_factory = ModelFactory(["poly"])
+    model_factory.apply_guardrails(*X.shape, thresholds={"poly_max_terms": 30})
+    model_factory.compose_steps([("engineer", FeatureSelection(k=4))], "target")
+    model = clone(model_factory.models["poly"]).fit(X, y)
+    poly = model.named_steps[MODEL_STEP]
+    assert poly.named_steps["select"].selector_.k == 4
+    assert poly.named_steps["poly"].n_output_features_ == poly_terms(4)
+    assert len(model.predict(X)) == len(X)
@@ -0,0 +1,91 @@
+import os
+
+import numpy as np
+import pandas as pd
+import pytest
+from joblib import Memory
+from sklearn.linear_model import Ridge
+from sklearn.model_selection import GridSearchCV, KFold
+
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.feature_engineering.feature_scaling import FeatureScaler
+from nicefitbro.models.auto_model import AutoModel
+from nicefitbro.pipeliners.in_fold import StepTransformer, compose, count_fits
+from nicefitbro.preprocess.missing_value_processor import MissingValuePreprocessor
+
+STEPS = [
+    ("preprocess", MissingValuePreprocessor(method="mean")),
+    ("engineer", FeatureScaler(method="standard")),
+]
+
+
+@pytest.fixture(scope="module")
+def data():
+    frame = make_regression_frame(300, 4, missing_frac=0.05)
+    return frame.drop(columns=["target"]), frame["target"]
+
+
+def test_held_out_rows_get_training_statistics(data):
+    """Transforming held out rows uses the statistics of the rows the step was fitted on"""
+    X, y = data
+    train, held_out = X.iloc[:200], X.iloc[200:]
+    imputer = StepTransformer(MissingValuePreprocessor, {"method": "mean"})
+    imputer.fit(train, y.iloc[:200])
+    filled = imputer.transform(held_out)
+    missing = held_out.isna()
+    for col in X.columns:
+        assert (filled.loc[missing[col], col] == train[col].mean()).all()
+
+    scaler = StepTransformer(FeatureScaler, {"method": "standard"})
+    scaled = scaler.fit_transform(train.fillna(0), y.iloc[:200])
+    pd.testing.assert_series_equal(
+        scaler.step_.offsets[X.columns], train.fillna(0).mean()
+    )
+    np.testing.assert_allclose(scaled.mean(), 0, atol=1e-12)
+    # the held out rows are not centred on their own mean
+    assert not np.allclose(scaler.transform(held_out.fillna(0)).mean(), 0, atol=1e-3)
+
+
+def test_each_fold_is_fitted_on_its_own_rows(data):
+    """A grid search fits the steps on each fold's training rows only"""
+    X, y = data
+    search = GridSearchCV(
+        compose(Ridge(), STEPS, "target"), {"model__alpha": [1.0]}, cv=KFold(3)
+    )
+    search.fit(X, y)
+    for train, _ in KFold(3).split(X):
+        fold = compose(Ridge(), STEPS, "target").fit(X.iloc[train], y.iloc[train])
+        fill_values = fold.named_steps["prep0"].step_.fill_values
+        pd.testing.assert_series_equal(
+            fill_values, X.iloc[train].mean(), check_names=False
+        )
+
+
+def test_cached_fits_are_not_repeated(data, tmp_path):
+    """With memory, each fold's steps are fitted once for every candidate"""
+    X, y = data
+    grid = {"model__alpha": [0.1, 1.0, 10.0]}
+
+    def fits(name, memory):
+        fit_log = str(tmp_path / f"{name}.log")
+        model = compose(Ridge(), STEPS, "target", memory=memory, fit_log=fit_log)
+        GridSearchCV(model, grid, cv=KFold(3)).fit(X, y)
+        return count_fits(fit_log)
+
+    # three folds per candidate, and the refit on every row
+    assert fits("uncached", None) == len(STEPS) * (3 * 3 + 1)
+    assert fits("cached", Memory(str(tmp_path / "cache"), verbose=0)) == len(STEPS) * (
+        3 + 1
+    )
+
+
+def test_auto_model_reports_prep_fits(data):
+    """AutoModel counts the in-fold fits and removes its temporary cache"""
+    X, y = data
+    auto_model = AutoModel(X.assign(target=y), ["ridge"], "target", prep_steps=STEPS)
+    auto_model.auto_model()
+    report = auto_model.prep_report
+    assert report["steps"] == ["MissingValuePreprocessor", "FeatureScaler"]
+    # every fold and the refit are fitted once, however many alphas are tried
+    assert 0 < report["fits"] <= len(STEPS) * (5 + 1)
+    assert not os.path.exists(auto_model.prep_memory.location)
@@ -0,0 +1,98 @@
+import pytest
+
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.config.run_config import RunConfig
+from nicefitbro.incremental import IncrementalRefresher
+from nicefitbro.ingestors.local_ingestor import LocalFileIngestor
+
+
+@pytest.fixture
+def data():
+    return make_regression_frame(900, 4, missing_frac=0.01)
+
+
+def _append(path, rows):
+    with open(path, "a") as f:
+        f.write(rows.to_csv(index=False, header=False))
+
+
+def _refresher(path, tmp_path):
+    run_config = RunConfig(
+        target="target",
+        file_path=str(path),
+        missing_value_method="mean",
+        feature_scaler_method="standard",
+        model_types=["sgd", "lr"],
+        refresh_dir=str(tmp_path / "state"),
+        schema=False,
+    )
+    return IncrementalRefresher(run_config, drift_threshold=10.0)
+
+
+def test_append_is_warm_started(data, tmp_path):
+    """Appended rows are read alone and warm start the models that support it"""
+    path = tmp_path / "data.csv"
+    data.iloc[:600].to_csv(path, index=False)
+    refresher = _refresher(path, tmp_path)
+    assert refresher.refresh()["action"] == "full_refit"
+
+    _append(path, data.iloc[600:750])
+    report = refresher.refresh()
+    assert report["action"] == "warm_start"
+    assert report["rows_read"] == 150
+    assert report["models"] == {"sgd": "warm_start", "lr": "kept"}
+    state = refresher.load().header["metadata"]["refresh"]
+    assert state["rows_fitted"] == 750
+
+    assert refresher.refresh()["action"] == "none"
+
+
+def test_rewrite_forces_a_full_refit(data, tmp_path):
+    """A file rewritten rather than appended to is refit from every row"""
+    path = tmp_path / "data.csv"
+    data.iloc[:600].to_csv(path, index=False)
+    refresher = _refresher(path, tmp_path)
+    refresher.refresh()
+
+    data.iloc[100:800].to_csv(path, index=False)
+    report = refresher.refresh()
+    assert report["action"] == "full_refit"
+    assert report["reason"].startswith("rewritten")
+    state = refresher.load().header["metadata"]["refresh"]
+    assert state["rows_fitted"] == 700
+
+
+def test_partial_line_is_left_for_the_next_read(data, tmp_path):
+    """Only complete lines are read; the rest waits for its newline"""
+    path = tmp_path / "data.csv"
+    data.iloc[:10].to_csv(path, index=False)
+    ingestor = LocalFileIngestor(schema=False)
+    _, watermarks, _ = ingestor.ingest_appended(str(path))
+    line = data.iloc[10:11].to_csv(index=False, header=False)
+    with open(path, "a") as f:
+        f.write(line[:5])
+    rows, watermarks, _ = ingestor.ingest_appended(str(path), watermarks)
+    assert rows.empty
+    with open(path, "a") as f:
+        f.write(line[5:])
+    rows, watermarks, _ = ingestor.ingest_appended(str(path), watermarks)
+    assert len(rows) == 1
+    assert watermarks[str(path)]["rows"] == 11
+
+
+@pytest.mark.parametrize("content", ["", "x0,x1", "x0,x1,x2,x3,target\n"])
+def test_new_shard_without_rows(data, tmp_path, content):
+    """An empty or half-written new shard gives no rows until it has some"""
+    shards = tmp_path / "shards"
+    shards.mkdir()
+    data.iloc[:10].to_csv(shards / "part-0.csv", index=False)
+    (shards / "part-1.csv").write_text(content)
+    ingestor = LocalFileIngestor(schema=False)
+    rows, watermarks, rewritten = ingestor.ingest_appended(str(shards))
+    assert len(rows) == 10 and not rewritten
+    assert list(rows.columns) == list(data.columns)
+
+    data.iloc[10:15].to_csv(shards / "part-1.csv", index=False)
+    rows, watermarks, rewritten = ingestor.ingest_appended(str(shards), watermarks)
+    assert len(rows) == 5
+    assert list(rows.columns) == list(data.columns)
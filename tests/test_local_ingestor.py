@@ -0,0 +1,96 @@
+import pathlib
+
+import pandas as pd
+import pytest
+
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.ingestors.local_ingestor import LocalFileIngestor, partition_keys
+
+
+@pytest.fixture
+def data():
+    return make_regression_frame(120, 3, missing_frac=0.05)
+
+
+@pytest.fixture
+def shards(data, tmp_path):
+    """Four shards under year=/month= directories, in path order"""
+    root = tmp_path / "shards"
+    for i, (year, month) in enumerate([(2023, 1), (2023, 2), (2024, 1), (2024, 2)]):
+        shard = root / f"year={year}" / f"month={month}"
+        shard.mkdir(parents=True)
+        data.iloc[i * 30 : (i + 1) * 30].to_csv(shard / "part-0.csv", index=False)
+    return root
+
+
+def test_single_file_matches_read_csv(data, tmp_path):
+    """A single file reads as pandas reads it"""
+    path = tmp_path / "data.csv"
+    data.to_csv(path, index=False)
+    pd.testing.assert_frame_equal(
+        LocalFileIngestor(schema=False).ingest_data(str(path)), pd.read_csv(path)
+    )
+
+
+@pytest.mark.parametrize("schema", [False, True])
+def test_path_objects_are_accepted(data, shards, tmp_path, schema):
+    """A pathlib.Path reads like its string, for files and directories"""
+    path = tmp_path / "data.csv"
+    data.to_csv(path, index=False)
+    ingestor = LocalFileIngestor(schema=schema)
+    assert isinstance(path, pathlib.Path)
+    pd.testing.assert_frame_equal(
+        ingestor.ingest_data(path), ingestor.ingest_data(str(path))
+    )
+    assert len(ingestor.ingest_data(shards)) == len(data)
+    rows, watermarks, _ = ingestor.ingest_appended(path)
+    assert len(rows) == len(data) and str(path) in watermarks
+
+
+def test_shards_are_concatenated_in_path_order(data, shards):
+    """A directory reads every shard, in path order, with a fresh index"""
+    df = LocalFileIngestor(schema=False).ingest_data(str(shards))
+    pd.testing.assert_frame_equal(df, data)
+
+
+def test_parallel_read_keeps_row_order(data, shards):
+    """Shards parsed in a process pool come back in the same order"""
+    ingestor = LocalFileIngestor(schema=False)
+    parallel = ingestor.ingest_data(str(shards), n_jobs=2)
+    pd.testing.assert_frame_equal(parallel, ingestor.ingest_data(str(shards), n_jobs=1))
+    pd.testing.assert_frame_equal(parallel, data)
+
+
+def test_glob_reads_matching_shards(data, shards):
+    """A glob pattern reads only the files it matches"""
+    df = LocalFileIngestor(schema=False).ingest_data(
+        str(shards / "year=2024" / "*" / "*.csv")
+    )
+    pd.testing.assert_frame_equal(df, data.iloc[60:].reset_index(drop=True))
+
+
+def test_filters_prune_partitions(data, shards):
+    """Filters take a value, a list of values or a predicate per partition key"""
+    ingestor = LocalFileIngestor(schema=False)
+    assert len(ingestor.ingest_data(str(shards), filters={"year": "2023"})) == 60
+    assert len(ingestor.ingest_data(str(shards), filters={"month": ["2"]})) == 60
+    df = ingestor.ingest_data(
+        str(shards), filters={"year": lambda year: year > "2023", "month": "1"}
+    )
+    pd.testing.assert_frame_equal(df, data.iloc[60:90].reset_index(drop=True))
+    with pytest.raises(ValueError, match="No CSV shards matched"):
+        ingestor.ingest_data(str(shards), filters={"year": "1999"})
+
+
+def test_partition_columns(shards):
+    """partition_columns adds each shard's keys as string columns"""
+    df = LocalFileIngestor(schema=False).ingest_data(
+        str(shards), partition_columns=True
+    )
+    assert list(df.columns[-2:]) == ["year", "month"]
+    assert df["year"].tolist() == ["2023"] * 60 + ["2024"] * 60
+    assert df["month"].tolist() == (["1"] * 30 + ["2"] * 30) * 2
+    assert partition_keys(str(shards / "year=2023" / "month=2" / "part-0.csv")) == {
+        "year": "2023",
+        "month": "2",
+    }
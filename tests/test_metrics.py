@@ -0,0 +1,74 @@
+import numpy as np
+import pytest
+from sklearn.metrics import (
+    mean_absolute_error,
+    mean_absolute_percentage_error,
+    mean_pinball_loss,
+    mean_squared_error,
+    r2_score,
+)
+
+from nicefitbro.models.evaluate.metrics import MetricsEngine
+
+
+@pytest.fixture(scope="module")
+def predictions():
+    rng = np.random.default_rng(0)
+    y = rng.normal(10, 3, size=5_000)
+    return y, {
+        "good": y + rng.normal(0, 1, size=len(y)),
+        "biased": y + 2 + rng.normal(0, 1, size=len(y)),
+        "poor": y + rng.normal(0, 4, size=len(y)),
+    }
+
+
+def test_metrics_match_sklearn(predictions):
+    """Every metric equals its scikit-learn counterpart"""
+    y, preds = predictions
+    metrics = MetricsEngine(y, preds).metrics()
+    for name, pred in preds.items():
+        expected = {
+            "R2": r2_score(y, pred),
+            "RMSE": np.sqrt(mean_squared_error(y, pred)),
+            "MAE": mean_absolute_error(y, pred),
+            "MAPE": mean_absolute_percentage_error(y, pred),
+            **{
+                f"pinball_{q:g}": mean_pinball_loss(y, pred, alpha=q)
+                for q in (0.1, 0.5, 0.9)
+            },
+        }
+        for metric, value in expected.items():
+            assert metrics[name][metric] == pytest.approx(value, rel=1e-9), metric
+
+
+def test_intervals_contain_the_point_estimate(predictions):
+    """Bootstrap intervals bracket each metric, and best_share picks the best model"""
+    y, preds = predictions
+    engine = MetricsEngine(y, preds)
+    metrics = engine.metrics()
+    intervals = engine.bootstrap(n_resamples=300)
+    for name in preds:
+        for metric in engine.metric_names:
+            low, high = intervals[name][metric]
+            assert low <= metrics[name][metric] <= high, (name, metric)
+    assert intervals["good"]["best_share"] == pytest.approx(1.0)
+    assert sum(interval["best_share"] for interval in intervals.values()) == 1.0
+
+
+def test_bootstrap_is_paired_and_seeded(predictions):
+    """The same random_state gives the same intervals"""
+    y, preds = predictions
+    engine = MetricsEngine(y, preds)
+    assert engine.bootstrap(100, random_state=1) == engine.bootstrap(
+        100, random_state=1
+    )
+
+
+def test_undefined_r2_has_no_best_model():
+    """A constant target predicted exactly has no R2 and no best model, without failing"""
+    y = np.full(50, 5.0)
+    engine = MetricsEngine(y, {"a": y.copy(), "b": y.copy()})
+    assert np.isnan(engine.metrics()["a"]["R2"])
+    intervals = engine.bootstrap(n_resamples=50)
+    assert intervals["a"]["best_share"] == intervals["b"]["best_share"] == 0.0
+    assert intervals["a"]["RMSE"] == (0.0, 0.0)
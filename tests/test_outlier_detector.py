@@ -0,0 +1,83 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.preprocess.outlier_detector import OutlierDetector
+from nicefitbro.preprocess.sketches import (
+    ColumnSketch,
+    QuantileSketch,
+    normalized_rank_error,
+)
+
+
+def _shards():
+    data = make_regression_frame(4_000, 3, missing_frac=0).drop(columns=["target"])
+    return data, [data.iloc[:1_500], data.iloc[1_500:]]
+
+
+def test_merged_shards_match_one_pass():
+    """Moments merged across shards equal those of one pass over all rows"""
+    data, shards = _shards()
+    merged = OutlierDetector(method="zscore")
+    for shard in shards:
+        merged.merge(OutlierDetector(method="zscore").partial_fit(shard))
+    np.testing.assert_allclose(merged.sketch.mean, data.mean().to_numpy())
+    np.testing.assert_allclose(merged.sketch.std(), data.std(ddof=0).to_numpy())
+
+
+def test_merge_with_an_unfitted_detector():
+    """Merging a detector that has no sketch leaves the sketch unchanged"""
+    _, shards = _shards()
+    detector = OutlierDetector(method="iqr").partial_fit(shards[0])
+    before = detector.sketch.to_dict()
+    assert detector.merge(OutlierDetector(method="iqr")) is detector
+    assert detector.sketch.to_dict() == before
+    assert OutlierDetector().merge(OutlierDetector()).sketch is None
+
+
+def _rank_errors(values, sketch, qs):
+    estimates = sketch.quantile(qs)
+    ranks = np.searchsorted(np.sort(values), estimates, side="right") / len(values)
+    return np.abs(ranks - qs)
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_quantiles_within_the_rank_error(seed):
+    """Sketched quantiles are off by at most normalized_rank_error in rank"""
+    values = np.random.default_rng(seed).lognormal(size=100_000)
+    qs = np.linspace(0.01, 0.99, 99)
+    # half in one sketch, half merged from another
+    sketch = QuantileSketch(k=200, seed=seed).update(values[:50_000])
+    sketch.merge(QuantileSketch(k=200, seed=seed + 100).update(values[50_000:]))
+    assert sketch.count == len(values)
+    assert sum(map(len, sketch.levels)) < 1_000
+    assert _rank_errors(values, sketch, qs).max() <= normalized_rank_error(200)
+
+
+def test_small_sketches_are_exact():
+    """Up to k values, quantiles equal pandas' interpolated ones"""
+    values = np.random.default_rng(0).standard_normal(150)
+    sketch = QuantileSketch(k=200).update(values)
+    qs = [0.1, 0.25, 0.5, 0.75, 0.9]
+    np.testing.assert_allclose(sketch.quantile(qs), pd.Series(values).quantile(qs))
+
+
+def test_sketched_iqr_bounds_match_pandas():
+    """Sketch-backed IQR bounds lie within the rank error of the pandas bounds"""
+    data = make_regression_frame(50_000, 3, missing_frac=0).drop(columns=["target"])
+    detector = OutlierDetector(method="iqr", sketch=ColumnSketch(data.columns, seed=0))
+    for start in range(0, len(data), 10_000):
+        detector.partial_fit(data.iloc[start : start + 10_000])
+    eps = normalized_rank_error(200, pair=True)
+    Q1, Q3 = detector.sketch.quantile(0.25), detector.sketch.quantile(0.75)
+    # each quartile lies between the exact quantiles eps below and above it
+    assert (Q1 >= data.quantile(0.25 - eps)).all()
+    assert (Q1 <= data.quantile(0.25 + eps)).all()
+    assert (Q3 >= data.quantile(0.75 - eps)).all()
+    assert (Q3 <= data.quantile(0.75 + eps)).all()
+
+    kept = detector.preprocess_data(data)
+    expected = OutlierDetector(method="iqr").preprocess_data(data)
+    # only rows near a bound can be kept by one and dropped by the other
+    assert abs(len(kept) - len(expected)) <= eps * len(data)
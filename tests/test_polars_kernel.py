@@ -0,0 +1,93 @@
+import pytest
+
+pytest.importorskip("polars")
+
+from nicefitbro.benchmarks.bench_polars_backend import _compare  # noqa: E402
+from nicefitbro.benchmarks.synthetic import make_regression_frame  # noqa: E402
+from nicefitbro.feature_engineering.feature_scaling import FeatureScaler  # noqa: E402
+from nicefitbro.feature_engineering.feature_selection import (  # noqa: E402
+    FeatureSelection,
+)
+from nicefitbro.feature_engineering.feature_transformations import (  # noqa: E402
+    FeatureTransformer,
+)
+from nicefitbro.pipeliners.polars_kernel import (  # noqa: E402
+    LAZY_METHODS,
+    PolarsKernel,
+)
+from nicefitbro.preprocess.missing_value_processor import (  # noqa: E402
+    MissingValuePreprocessor,
+)
+from nicefitbro.preprocess.outlier_detector import OutlierDetector  # noqa: E402
+
+FEATURES = [f"x{i}" for i in range(5)]
+
+
+@pytest.fixture(scope="module")
+def frames():
+    data = make_regression_frame(2000, 12, missing_frac=0.02)
+    # outlier filters, transforms and selection get complete data, as they do after imputation
+    complete = data.fillna(data.mean())
+    return {"missing": data, "complete": complete, "positive": complete.abs() + 1}
+
+
+def _step(step_type, method):
+    if step_type is FeatureTransformer:
+        return "engineer", FeatureTransformer(FEATURES, method=method)
+    if step_type is FeatureSelection:
+        return "engineer", FeatureSelection(k=6)
+    kind = "engineer" if step_type is FeatureScaler else "preprocess"
+    return kind, step_type(method=method)
+
+
+def _frame(frames, step_type):
+    if step_type in (MissingValuePreprocessor, FeatureScaler):
+        return frames["missing"]
+    if step_type is FeatureTransformer:
+        return frames["positive"]
+    return frames["complete"]
+
+
+def _check(report):
+    assert report["same_shape"]
+    assert report["max_abs_diff"] < 1e-8
+    assert report["params_match"]
+
+
+@pytest.mark.parametrize(
+    "step_type, method",
+    [
+        (step_type, method)
+        for step_type, methods in LAZY_METHODS.items()
+        for method in methods
+    ],
+)
+def test_step_matches_pandas(frames, step_type, method):
+    """Every step with a Polars form gives the pandas values, shape and fitted parameters"""
+    _check(_compare(_frame(frames, step_type), [_step(step_type, method)]))
+
+
+def test_chain_matches_pandas(frames):
+    """The impute -> outliers -> scale chain runs lazily and matches pandas"""
+    chain = [
+        ("preprocess", MissingValuePreprocessor(method="mean")),
+        ("preprocess", OutlierDetector(method="zscore")),
+        ("engineer", FeatureScaler(method="standard")),
+    ]
+    report = _compare(frames["missing"], chain)
+    _check(report)
+    # one aggregate per fitted step, and the output
+    assert report["collects"] == 4
+
+
+def test_step_without_polars_form_runs_on_pandas(frames):
+    """A step Polars cannot express falls back to pandas in the same run"""
+    chain = [
+        ("preprocess", MissingValuePreprocessor(method="mean")),
+        ("preprocess", OutlierDetector(method="mahalanobis")),
+        ("engineer", FeatureScaler(method="minmax")),
+    ]
+    _check(_compare(frames["missing"], chain))
+    kernel = PolarsKernel(chain)
+    kernel.run(frames["missing"].copy(), "target")
+    assert kernel.plan == ["lazy", "pandas", "lazy"]
@@ -0,0 +1,106 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.config.run_config import RunConfig
+from nicefitbro.ingestors.local_ingestor import LocalFileIngestor
+from nicefitbro.models.factory.data_factory import DataFactory
+from nicefitbro.nicefitbro import NiceFitBro
+from nicefitbro.pipeliners.fused_kernel import run_steps
+from nicefitbro.precision import FLOAT32_EXACT_INT, PrecisionPolicy
+
+
+class Widening:
+    """Step that hands back float64 whatever it is given"""
+
+    def engineer_features(self, data, target):
+        return data.astype("float64")
+
+
+@pytest.fixture(scope="module")
+def file_path(tmp_path_factory):
+    path = tmp_path_factory.mktemp("data") / "data.csv"
+    make_regression_frame(400, 4, missing_frac=0.05).to_csv(path, index=False)
+    return str(path)
+
+
+def _run_config(file_path, **fields):
+    return RunConfig(
+        target="target",
+        file_path=file_path,
+        missing_value_method="mean",
+        outlier_detector_method="iqr",
+        feature_scaler_method="standard",
+        precision="float32",
+        **fields,
+    )
+
+
+def test_cast_leaves_large_integers_and_other_columns():
+    """Only floats and exactly representable integers are cast down"""
+    data = pd.DataFrame(
+        {
+            "x": np.arange(3, dtype=np.float64),
+            "small": [1, 2, 3],
+            "large": [0, 1, FLOAT32_EXACT_INT + 1],
+            "flag": [True, False, True],
+            "name": ["a", "b", "c"],
+        }
+    )
+    cast = PrecisionPolicy("float32").cast(data)
+    assert cast.dtypes.to_dict() == {
+        "x": np.float32,
+        "small": np.float32,
+        "large": np.int64,
+        "flag": bool,
+        "name": object,
+    }
+    assert PrecisionPolicy("float64").cast(data) is data
+
+
+def test_float32_is_read_from_the_file(file_path):
+    """A float32 ingest parses floats straight into single precision"""
+    ingestor = LocalFileIngestor(float_dtype="float32")
+    ingestor.ingest_data(file_path)
+    # the schema is saved by the first read and used by the second
+    data = ingestor.ingest_data(file_path)
+    assert set(data.dtypes) == {np.dtype("float32")}
+
+
+def test_float32_carries_through_steps_and_data_factory(file_path):
+    """Prepared data, the training block and the target all stay float32"""
+    nice_fit_bro = NiceFitBro(_run_config(file_path, model_types=["ridge"]))
+    data = nice_fit_bro.prepare_data()
+    assert set(data.dtypes) == {np.dtype("float32")}
+    assert nice_fit_bro.precision_report["steps"] == []
+
+    data_factory = DataFactory(data, "target", precision="float32")
+    assert data_factory.block.dtype == np.float32
+    assert set(data_factory.X_train.dtypes) == {np.dtype("float32")}
+    assert data_factory.y_train.dtype == np.float32
+
+
+def test_upcasting_step_is_reported_and_cast_back():
+    """A step widening float32 columns is recorded and its output cast down again"""
+    policy = PrecisionPolicy("float32")
+    data = policy.cast(make_regression_frame(50, 3, missing_frac=0))
+    data = run_steps(data, [("engineer", Widening())], "target", policy=policy)
+    assert set(data.dtypes) == {np.dtype("float32")}
+    assert policy.upcasts == [
+        {"step": "Widening", "columns": ["x0", "x1", "x2", "target"]}
+    ]
+
+
+def test_upcast_models_are_reported(file_path):
+    """Models without a float32 path are listed in precision_report"""
+    nice_fit_bro = NiceFitBro(_run_config(file_path, model_types=["ridge", "sgd"]))
+    trained_models, _ = nice_fit_bro.sendit()
+    assert nice_fit_bro.precision_report["models"] == ["sgd"]
+    assert trained_models["ridge"].coef_.dtype == np.float32
+
+
+def test_invalid_precision_is_rejected():
+    """Only float64 and float32 are accepted"""
+    with pytest.raises(ValueError, match="Invalid precision"):
+        PrecisionPolicy("float16")
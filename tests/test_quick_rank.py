@@ -0,0 +1,22 @@
+import numpy as np
+import pytest
+
+from nicefitbro.models.tune.quick_rank import stratified_sample
+
+
+@pytest.mark.parametrize("size", [5, 12, 500, 990, 995, 999, 1000, 5000])
+def test_stratified_sample_size(size):
+    """Any size up to every row gives that many distinct, sorted positions"""
+    y = np.random.default_rng(0).normal(size=1000)
+    positions = stratified_sample(y, size)
+    assert len(positions) == min(size, len(y))
+    assert len(np.unique(positions)) == len(positions)
+    assert np.all(np.diff(positions) > 0)
+
+
+def test_stratified_sample_covers_the_target_range():
+    """Every decile of the target is in a 10% sample"""
+    y = np.random.default_rng(0).exponential(size=2000)
+    positions = stratified_sample(y, 200)
+    deciles = np.digitize(y[positions], np.quantile(y, np.linspace(0.1, 0.9, 9)))
+    assert set(deciles) == set(range(10))
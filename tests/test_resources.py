@@ -0,0 +1,56 @@
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+from sklearn.linear_model import Ridge
+from xgboost import XGBRegressor
+
+from nicefitbro.resources import ResourceBudget
+
+
+@pytest.mark.parametrize("cores", [1, 2, 3, 4, 6, 8, 12, 16])
+@pytest.mark.parametrize("outer", [1, 2, 3, 5])
+@pytest.mark.parametrize("cv", [1, 3, 5, 10])
+def test_allocation_fits_the_cores(cores, outer, cv):
+    """The outer units, cv workers and threads never ask for more than the cores"""
+    budget = ResourceBudget(cores, outer=outer, cv=cv)
+    assert min(budget.outer, budget.cv_jobs, budget.threads) >= 1
+    assert budget.cv_jobs <= cv
+    assert budget.outer * budget.cv_jobs * budget.threads <= cores
+    assert budget.report["used"] == budget.outer * budget.cv_jobs * budget.threads
+
+
+def test_cv_workers_come_before_threads():
+    """Eight cores and five folds give four workers of two threads rather than five of one"""
+    budget = ResourceBudget(8, cv=5)
+    assert (budget.cv_jobs, budget.threads) == (4, 2)
+    assert budget.report == {
+        "cores": 8,
+        "outer": 1,
+        "cv_jobs": 4,
+        "threads": 2,
+        "used": 8,
+    }
+
+
+def test_outer_units_share_the_cores():
+    """Each outer unit gets an equal share, and more units than cores are capped"""
+    assert ResourceBudget(8, outer=2, cv=5).report["used"] == 8
+    assert ResourceBudget(8, outer=2, cv=5).share() == 4
+    assert ResourceBudget(2, outer=4).outer == 2
+
+
+def test_configure_sets_thread_params():
+    """Models with their own thread pool get the budget's threads, others are left alone"""
+    budget = ResourceBudget(8, cv=2)
+    assert budget.threads == 4
+    assert budget.configure(RandomForestRegressor()).get_params()["n_jobs"] == 4
+    assert budget.configure(XGBRegressor()).get_params()["n_jobs"] == 4
+    assert budget.configure(XGBRegressor(nthread=1)).get_params()["nthread"] == 4
+    ridge = Ridge()
+    assert budget.configure(ridge).get_params() == Ridge().get_params()
+
+
+@pytest.mark.parametrize("n_cores", [0, -2])
+def test_invalid_cores(n_cores):
+    """A budget of no cores is rejected"""
+    with pytest.raises(ValueError, match="Invalid n_cores"):
+        ResourceBudget(n_cores)
@@ -0,0 +1,63 @@
+import pytest
+
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.models.factory.data_factory import DataFactory
+from nicefitbro.models.factory.model_factory import ModelFactory
+from nicefitbro.models.tune.scheduler import BudgetScheduler
+
+
+@pytest.fixture(scope="module")
+def data_factory():
+    return DataFactory(make_regression_frame(2000, 4, missing_frac=0), "target")
+
+
+def _schedule(data_factory, model_types, time_budget):
+    scheduler = BudgetScheduler(data_factory, ModelFactory(model_types), time_budget)
+    return scheduler, scheduler.tune_hyperparameters()
+
+
+def test_time_accounting_of_finished_models(data_factory):
+    """Every model records its candidates, best parameters, status and time"""
+    scheduler, tuned = _schedule(data_factory, ["ridge", "lr"], 60)
+    assert set(tuned) == {"lr", "ridge"}
+    ridge = scheduler.time_accounting["ridge"]
+    assert ridge["status"] == "complete"
+    assert ridge["candidates_scored"] == ridge["candidates_total"] == 3
+    assert ridge["best_params"]["alpha"] in (0.1, 1.0, 10.0)
+    assert 0 < ridge["seconds"] <= ridge["budget"]
+    lr = scheduler.time_accounting["lr"]
+    assert lr["candidates_total"] == 1 and lr["best_params"] == {}
+
+
+def test_unused_budget_rolls_over(data_factory):
+    """Models get an even share of what is left, so cheap ones pass time on"""
+    scheduler, _ = _schedule(data_factory, ["ridge", "lr"], 60)
+    # cheapest first: lr and ridge cost the same, and keep their order
+    first, second = scheduler.time_accounting.values()
+    assert first["budget"] == pytest.approx(30, abs=0.5)
+    assert second["budget"] == pytest.approx(60 - first["seconds"], abs=0.5)
+    assert second["budget"] > first["budget"]
+
+
+def test_search_is_cancelled_at_the_deadline(data_factory):
+    """A search running past its share is cancelled, keeping the run close to its budget"""
+    model_factory = ModelFactory(["rfr"])
+    model_factory.hyperparameters["rfr"] = {"n_estimators": [500, 600, 700]}
+    scheduler = BudgetScheduler(data_factory, model_factory, 0.5)
+    tuned = scheduler.tune_hyperparameters()
+    accounting = scheduler.time_accounting["rfr"]
+    assert accounting["status"] == "timed_out"
+    assert accounting["candidates_scored"] == 0
+    assert "rfr" not in tuned
+    assert accounting["seconds"] < 0.5 + 2
+
+
+def test_single_candidate_refit_keeps_to_the_budget(data_factory):
+    """A model with one candidate is still refit within the budget, or timed out"""
+    scheduler, tuned = _schedule(data_factory, ["gpr"], 0.05)
+    accounting = scheduler.time_accounting["gpr"]
+    assert accounting["status"] == "timed_out"
+    assert accounting["candidates_total"] == 1
+    assert "gpr" not in tuned
+    # gpr's cubic fit takes far longer than this on 1,340 rows
+    assert accounting["seconds"] < 0.05 + 2
@@ -0,0 +1,110 @@
+import os
+
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestRegressor
+
+from nicefitbro.artifact import load_artifact, save_artifact
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.feature_engineering.feature_scaling import FeatureScaler
+from nicefitbro.ingestors.column_store_ingestor import (
+    ColumnStoreIngestor,
+    is_column_store,
+)
+from nicefitbro.ingestors.local_ingestor import LocalFileIngestor
+from nicefitbro.preprocess.missing_value_processor import MissingValuePreprocessor
+from nicefitbro.scoring import BatchScorer, score_file
+
+
+@pytest.fixture(scope="module")
+def artifact_path(tmp_path_factory):
+    data = make_regression_frame(500, 4, missing_frac=0.05)
+    X, y = data.drop(columns=["target"]), data["target"]
+    steps = [MissingValuePreprocessor(method="mean"), FeatureScaler(method="standard")]
+    X = steps[1].engineer_features(steps[0].preprocess_data(X))
+    model = RandomForestRegressor(n_estimators=10, random_state=0).fit(X, y)
+    path = str(tmp_path_factory.mktemp("artifact") / "model.nfb")
+    save_artifact(path, steps, list(X.columns), "target", {"rfr": model}, "rfr")
+    return path
+
+
+@pytest.fixture(scope="module")
+def rows():
+    return make_regression_frame(1000, 4, missing_frac=0.05, seed=1).drop(
+        columns=["target"]
+    )
+
+
+def _source(kind, rows, tmp_path):
+    if kind == "csv":
+        path = str(tmp_path / "rows.csv")
+        rows.to_csv(path, index=False)
+    else:
+        path = str(tmp_path / "rows")
+        ColumnStoreIngestor().write(rows, path)
+    return path
+
+
+def _predictions(output):
+    return ColumnStoreIngestor().ingest_data(output)["prediction"].to_numpy()
+
+
+@pytest.mark.parametrize("kind", ["csv", "store"])
+@pytest.mark.parametrize("n_jobs", [1, 2])
+def test_row_order_is_kept_across_chunks(artifact_path, rows, tmp_path, kind, n_jobs):
+    """Chunked scoring writes every prediction in the source's row order"""
+    output = str(tmp_path / "predictions")
+    report = score_file(
+        artifact_path,
+        _source(kind, rows, tmp_path),
+        output,
+        chunk_rows=64,
+        n_jobs=n_jobs,
+    )
+    assert report["rows"] == len(rows)
+    assert report["chunks"] > 10
+    # an explicit n_jobs is used as given
+    assert report["workers_requested"] == n_jobs
+    assert report["workers"] == n_jobs
+    np.testing.assert_allclose(
+        _predictions(output), load_artifact(artifact_path).predict(rows)
+    )
+
+
+def test_csv_chunks_read_with_the_schema(artifact_path, rows, tmp_path):
+    """A CSV with a schema sidecar is parsed with its dtypes, an empty integer cell included"""
+    source = str(tmp_path / "rows.csv")
+    rows.assign(id=np.arange(len(rows))).to_csv(source, index=False)
+    LocalFileIngestor().ingest_data(source)
+    with open(source, "a") as f:
+        f.write(",".join([""] * (rows.shape[1] + 1)) + "\n")
+    scorer = BatchScorer(artifact_path, chunk_rows=64, n_jobs=1)
+    assert scorer._source(source)[1]["id"] == "int64"
+    output = str(tmp_path / "predictions")
+    assert scorer.score(source, output)["rows"] == len(rows) + 1
+    np.testing.assert_allclose(
+        _predictions(output)[:-1], load_artifact(artifact_path).predict(rows)
+    )
+
+
+def _open_files(path):
+    fds = "/proc/self/fd"
+    return [
+        fd
+        for fd in os.listdir(fds)
+        if os.path.realpath(os.path.join(fds, fd)).startswith(os.path.realpath(path))
+    ]
+
+
+@pytest.mark.skipif(not os.path.isdir("/proc/self/fd"), reason="needs /proc")
+def test_failed_chunk_closes_the_output(artifact_path, rows, tmp_path):
+    """A chunk that raises leaves the output closed and incomplete"""
+    source = str(tmp_path / "rows.csv")
+    rows.to_csv(source, index=False)
+    with open(source, "a") as f:
+        f.write(",".join(["not a number"] * rows.shape[1]) + "\n")
+    output = str(tmp_path / "predictions")
+    with pytest.raises((ValueError, TypeError)):
+        score_file(artifact_path, source, output, chunk_rows=64, n_jobs=1)
+    assert not _open_files(output)
+    assert not is_column_store(output)
@@ -0,0 +1,101 @@
+import pickle
+
+import pytest
+from sklearn.linear_model import Ridge
+
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.config.run_config import RunConfig
+from nicefitbro.models.evaluate.evaluator import ModelEvaluator
+from nicefitbro.models.factory.data_factory import DataFactory
+from nicefitbro.models.select.selector import ModelSelector
+from nicefitbro.nicefitbro import NiceFitBro
+
+PERFORMANCE = {
+    "fast": {"R2": 0.80, "RMSE": 2.0, "latency_p99_ms": 0.1, "size_bytes": 1_000},
+    "accurate": {"R2": 0.95, "RMSE": 1.0, "latency_p99_ms": 5.0, "size_bytes": 9_000},
+    "large": {"R2": 0.90, "RMSE": 1.5, "latency_p99_ms": 0.5, "size_bytes": 50_000},
+}
+
+
+def test_most_accurate_without_budgets():
+    """With no budgets the best model on the metric is selected"""
+    assert ModelSelector().select(PERFORMANCE) == "accurate"
+    # error metrics are minimised
+    assert ModelSelector(metric="RMSE").select(PERFORMANCE) == "accurate"
+
+
+def test_models_over_latency_are_rejected():
+    """A model slower than max_latency_ms is passed over for the best within it"""
+    selector = ModelSelector(max_latency_ms=1.0)
+    assert selector.select(PERFORMANCE) == "large"
+    assert selector.rejected == {"accurate": ["latency_p99_ms > 1.0"]}
+
+
+def test_models_over_size_are_rejected():
+    """A model larger than max_size_bytes is passed over for the best within it"""
+    selector = ModelSelector(max_latency_ms=1.0, max_size_bytes=10_000)
+    assert selector.select(PERFORMANCE) == "fast"
+    assert selector.rejected == {
+        "accurate": ["latency_p99_ms > 1.0"],
+        "large": ["size_bytes > 10000"],
+    }
+
+
+def test_none_when_nothing_fits():
+    """No model within the budgets selects None"""
+    selector = ModelSelector(max_latency_ms=0.01)
+    assert selector.select(PERFORMANCE) is None
+    assert set(selector.rejected) == set(PERFORMANCE)
+
+
+def test_measure_model():
+    """Latency percentiles, throughput and pickled size are measured on X_val"""
+    data_factory = DataFactory(make_regression_frame(300, 4, missing_frac=0), "target")
+    model = Ridge().fit(data_factory.X_train, data_factory.y_train)
+    evaluator = ModelEvaluator(
+        data_factory, {"ridge": model}, n_single=20, batch_size=1_000, n_batches=5
+    )
+    measured = evaluator.measure_model(model)
+    assert 0 < measured["latency_p50_ms"] <= measured["latency_p99_ms"]
+    assert 0 < measured["batch_p50_ms"] <= measured["batch_p99_ms"]
+    # the batch is capped at the validation rows
+    assert measured["batch_size"] == len(data_factory.X_val)
+    assert measured["rows_per_second"] > 0
+    assert measured["size_bytes"] == len(
+        pickle.dumps(model, protocol=pickle.HIGHEST_PROTOCOL)
+    )
+
+
+@pytest.fixture(scope="module")
+def over_budget(tmp_path_factory):
+    path = tmp_path_factory.mktemp("data") / "data.csv"
+    make_regression_frame(300, 4, missing_frac=0).to_csv(path, index=False)
+    nice_fit_bro = NiceFitBro(
+        RunConfig(
+            target="target",
+            file_path=str(path),
+            model_types=["ridge", "lr"],
+            max_size_bytes=1,
+        )
+    )
+    nice_fit_bro.sendit()
+    return nice_fit_bro
+
+
+def test_run_with_no_model_in_budget(over_budget):
+    """A run whose models are all over budget trains them but selects none"""
+    assert over_budget.selected_model is None
+    assert set(over_budget.trained_models) == {"ridge", "lr"}
+    assert all(
+        performance["size_bytes"] > 1
+        for performance in over_budget.performance.values()
+    )
+
+
+def test_save_without_a_selected_model(over_budget, tmp_path):
+    """Saving needs all_models=True when no model was selected"""
+    with pytest.raises(ValueError, match="no model was selected"):
+        over_budget.save(str(tmp_path / "model.nfb"))
+    header = over_budget.save(str(tmp_path / "model.nfb"), all_models=True)
+    assert header["selected_model"] is None
+    assert set(header["models"]) == {"ridge", "lr"}
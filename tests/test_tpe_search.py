@@ -0,0 +1,59 @@
+import pytest
+
+from nicefitbro.benchmarks.synthetic import make_regression_frame
+from nicefitbro.models.factory.data_factory import DataFactory
+from nicefitbro.models.factory.model_factory import ModelFactory
+from nicefitbro.models.tune.checkpoint import TuningCheckpoint
+from nicefitbro.models.tune.tpe import TPESearch
+
+
+@pytest.fixture(scope="module")
+def data_factory():
+    return DataFactory(make_regression_frame(300, 4, missing_frac=0), "target")
+
+
+def _search(data_factory, n_trials, checkpoint_dir=None):
+    checkpoint = None
+    if checkpoint_dir:
+        checkpoint = TuningCheckpoint(
+            checkpoint_dir, data_factory.X_train, data_factory.y_train
+        )
+    search = TPESearch(
+        data_factory,
+        ModelFactory(["ridge"]),
+        n_trials=n_trials,
+        n_startup_trials=4,
+        checkpoint=checkpoint,
+    )
+    search.tune_hyperparameters()
+    return search
+
+
+def _params(search):
+    return [trial["params"] for trial in search.trials["ridge"]]
+
+
+def test_rerun_restores_the_tuned_model(data_factory, tmp_path):
+    """The same search run again is restored from the checkpoint"""
+    first = _search(data_factory, 8, tmp_path)
+    rerun = _search(data_factory, 8, tmp_path)
+    assert "ridge" not in rerun.search_report
+    assert rerun.tuned_models["ridge"].alpha == first.tuned_models["ridge"].alpha
+
+
+def test_more_trials_continue_the_search(data_factory, tmp_path):
+    """A rerun with a larger n_trials carries on from the stored trials"""
+    _search(data_factory, 8, tmp_path)
+    continued = _search(data_factory, 12, tmp_path)
+    assert continued.search_report["ridge"]["resumed"] == 8
+    assert continued.search_report["ridge"]["trials"] == 12
+    # the same trials as one uninterrupted search of 12
+    assert _params(continued) == _params(_search(data_factory, 12))
+
+
+def test_fewer_trials_reuse_the_first_ones(data_factory, tmp_path):
+    """A rerun with a smaller n_trials takes the first stored trials"""
+    _search(data_factory, 12, tmp_path)
+    shorter = _search(data_factory, 6, tmp_path)
+    assert shorter.search_report["ridge"]["resumed"] == 6
+    assert _params(shorter) == _params(_search(data_factory, 6))
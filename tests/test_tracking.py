@@ -0,0 +1,71 @@
+import pytest
+
+from nicefitbro.tracking import ExperimentTracker
+
+pytest.importorskip("mlflow")
+# the default SQLite store needs SQLAlchemy, which mlflow-skinny leaves out
+pytest.importorskip("sqlalchemy")
+
+
+@pytest.fixture
+def tracking_uri(tmp_path):
+    return f"sqlite:///{tmp_path}/mlruns.db"
+
+
+def _run_data(tracking_uri, run_id):
+    from mlflow.tracking import MlflowClient
+
+    client = MlflowClient(tracking_uri=tracking_uri)
+    return client.get_run(run_id).data, client.get_metric_history(run_id, "score")
+
+
+def test_events_reach_the_run(tracking_uri):
+    """Metrics, params and tags are all written, and nothing is dropped"""
+    with ExperimentTracker(tracking_uri=tracking_uri) as tracker:
+        tracker.log_params({"model": "ridge", "alpha": 1.0})
+        for step in range(5):
+            tracker.log_metric("score", step / 10, step=step)
+        tracker.set_tag("stage", "tune")
+    report = tracker.close()
+    assert report["run_id"] is not None
+    assert report["dropped"] == 0 and report["error"] is None
+    data, history = _run_data(tracking_uri, report["run_id"])
+    assert data.params == {"model": "ridge", "alpha": "1.0"}
+    assert data.tags["stage"] == "tune"
+    assert [metric.step for metric in history] == list(range(5))
+
+
+def test_repeated_param_in_one_batch_keeps_the_metrics(tracking_uri):
+    """A param key repeated within a batch is sent once, with its last value"""
+    tracker = ExperimentTracker(tracking_uri=tracking_uri)
+    tracker.log_param("alpha", 1.0)
+    tracker.log_metric("score", 0.5)
+    tracker.log_param("alpha", 2.0)
+    report = tracker.close()
+    assert report["dropped"] == 0 and report["error"] is None
+    data, history = _run_data(tracking_uri, report["run_id"])
+    assert data.params == {"alpha": "2.0"}
+    assert [metric.value for metric in history] == [0.5]
+
+
+def test_rejected_param_only_drops_itself(tracking_uri):
+    """A param MLflow rejects is counted as dropped without losing later metrics"""
+    tracker = ExperimentTracker(tracking_uri=tracking_uri, batch_size=1)
+    tracker.log_param("alpha", 1.0)
+    # MLflow does not allow a logged param to change
+    tracker.log_param("alpha", 2.0)
+    tracker.log_metric("score", 0.5)
+    report = tracker.close()
+    assert report["dropped"] == 1
+    assert report["error"] is not None
+    data, history = _run_data(tracking_uri, report["run_id"])
+    assert data.params == {"alpha": "1.0"}
+    assert [metric.value for metric in history] == [0.5]
+
+
+def test_unusable_tracking_uri_raises():
+    """A URI MLflow cannot open fails when the tracker is created"""
+    from mlflow.exceptions import MlflowException
+
+    with pytest.raises(MlflowException):
+        ExperimentTracker(tracking_uri="unknown-scheme://nowhere")